@@ -479,7 +479,7 @@ def dataframe_to_scene(data):
         bpy.types.Scene: Blender scene.
     '''
     delete_all_scenes()
-    for i_id in data.i_id.unique().tolist():
-        item = data[data.i_id == i_id]
+    # a single grouping pass, rather than a scan of data per item
+    for _, item in data.groupby('i_id', sort=False):
         dataframe_to_mesh(item)
     return bpy.context.scene
@@ -1,5 +1,10 @@
+import shot_glass.hifive.component_index
+import shot_glass.hifive.component_tables
+import shot_glass.hifive.dataset
 import shot_glass.hifive.hifive
 import shot_glass.hifive.hifive_tools
+import shot_glass.hifive.lazy
 import shot_glass.hifive.operators
+import shot_glass.hifive.spatial_index
 import shot_glass.hifive.type_base
 import shot_glass.hifive.validators # noqa F401
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+# ------------------------------------------------------------------------------
+
+'''
+The component index module contains the ComponentIndex class, which HiFive uses
+to group its rows by component id without rehashing its id columns each time.
+'''
+
+
+class ComponentIndex():
+    '''
+    A factorized, sorted CSR (compressed sparse row) index of the rows of a
+    HiFive id column.
+
+    Attributes:
+
+        * ids - Sorted unique non-null ids.
+        * codes - Position of each row's id within ids (-1 for null ids).
+        * permutation - Row positions sorted by code, null ids excluded.
+        * offsets - Start of each component's rows within permutation.
+        * counts - Number of rows per component.
+
+    So, the row positions of the component with the id ids[i] are
+    permutation[offsets[i]:offsets[i + 1]].
+    '''
+    def __init__(self, series):
+        '''
+        Args:
+            series (Series): Id column to be indexed.
+        '''
+        codes, ids = pd.factorize(series, sort=True)
+        self.ids = np.asarray(ids)
+        self.codes = codes
+
+        # null ids have code -1, so they sort to the front and are sliced off
+        nulls = np.count_nonzero(codes < 0)
+        self.permutation = np.argsort(codes, kind='stable')[nulls:]
+
+        self.counts = np.bincount(codes[codes >= 0], minlength=self.ids.size)
+        self.offsets = np.zeros(self.ids.size + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self.offsets[1:])
+
+    @property
+    def size(self):
+        '''
+        Returns:
+            int: Number of components.
+        '''
+        return self.ids.size
+
+    def get_rows(self, ids):
+        '''
+        Finds the row positions of the components with given ids, via a
+        binary search of ids, so only the rows of those components are
+        visited.
+
+        Args:
+            ids (array-like): Component ids. Ids not in index are ignored.
+
+        Returns:
+            numpy.ndarray: Sorted row positions.
+        '''
+        ids = np.unique(np.asarray(ids))
+        codes = np.searchsorted(self.ids, ids)
+        found = codes < self.size
+        found[found] = self.ids[codes[found]] == ids[found]
+        codes = codes[found]
+
+        # the rows of code c are permutation[offsets[c] + j], j < counts[c]
+        counts = self.counts[codes]
+        starts = self.offsets[codes] - np.cumsum(counts) + counts
+        positions = np.repeat(starts, counts) + np.arange(counts.sum())
+        return np.sort(self.permutation[positions])
+
+    def first(self, series):
+        '''
+        Finds the first non-null value of a given Series per component, like
+        groupby().first() does.
+
+        Args:
+            series (Series): Series with the same length as indexed column.
+
+        Returns:
+            array: Array of first non-null values, one per component.
+        '''
+        values = series.values
+        if self.size == 0:
+            return values[:0]
+
+        sorted_ = take(values, self.permutation)
+        mask = pd.notnull(sorted_)
+        positions = np.where(mask, np.arange(mask.size), mask.size)
+        first = np.minimum.reduceat(positions, self.offsets[:-1])
+
+        # components without a non-null value get a null
+        first[first >= self.offsets[1:]] = -1
+        return take(sorted_, first, allow_fill=True)
+
+    def nunique(self, codes):
+        '''
+        Counts the unique non-null values of another factorized column per
+        component.
+
+        Args:
+            codes (numpy.ndarray): Codes of other column (-1 for null).
+
+        Returns:
+            numpy.ndarray: Count of unique values per component.
+        '''
+        mask = (self.codes >= 0) & (codes >= 0)
+        width = np.int64(codes.max(initial=0)) + 1
+        pairs = self.codes[mask].astype(np.int64) * width + codes[mask]
+        pairs = np.unique(pairs)
+        return np.bincount(pairs // width, minlength=self.size)
@@ -0,0 +1,70 @@
+import unittest
+
+from pandas import DataFrame, Series
+import numpy as np
+import pandas as pd
+
+from shot_glass.hifive.component_index import ComponentIndex
+# ------------------------------------------------------------------------------
+
+
+class ComponentIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.ids = Series([3, 1, 3, np.nan, 1, 2])
+
+    def test_init(self):
+        index = ComponentIndex(self.ids)
+        self.assertEqual(index.ids.tolist(), [1, 2, 3])
+        self.assertEqual(index.codes.tolist(), [2, 0, 2, -1, 0, 1])
+        self.assertEqual(index.permutation.tolist(), [1, 4, 5, 0, 2])
+        self.assertEqual(index.offsets.tolist(), [0, 2, 3, 5])
+        self.assertEqual(index.counts.tolist(), [2, 1, 2])
+        self.assertEqual(index.size, 3)
+
+        for i, id_ in enumerate(index.ids):
+            rows = index.permutation[index.offsets[i]:index.offsets[i + 1]]
+            expected = np.flatnonzero(self.ids == id_).tolist()
+            self.assertEqual(rows.tolist(), expected)
+
+    def test_get_rows(self):
+        index = ComponentIndex(self.ids)
+        self.assertEqual(index.get_rows([3]).tolist(), [0, 2])
+        self.assertEqual(index.get_rows([3, 1, 9]).tolist(), [0, 1, 2, 4])
+        self.assertEqual(index.get_rows([2, 2]).tolist(), [5])
+        self.assertEqual(index.get_rows([]).tolist(), [])
+        self.assertEqual(index.get_rows([0, 9]).tolist(), [])
+
+    def test_init_empty(self):
+        index = ComponentIndex(Series([], dtype=float))
+        self.assertEqual(index.size, 0)
+        self.assertEqual(index.offsets.tolist(), [0])
+        self.assertEqual(index.first(Series([], dtype=float)).tolist(), [])
+
+    def test_first(self):
+        index = ComponentIndex(self.ids)
+        values = [
+            Series([np.nan, 5, 6, 7, 8, np.nan]),
+            Series([1, 2, 3, 4, 5, 6]),
+            Series(['a', None, 'c', 'd', None, None]),
+            Series([1, None, 3, 4, 5, None], dtype='Int64'),
+        ]
+        for series in values:
+            data = DataFrame(dict(id=self.ids, value=series))
+            expected = data.groupby('id').value.first()
+
+            result = Series(index.first(series))
+            self.assertEqual(result.dtype, expected.dtype)
+            self.assertEqual(result.isnull().tolist(), expected.isnull().tolist())
+            self.assertEqual(
+                result.dropna().tolist(), expected.dropna().tolist()
+            )
+
+    def test_nunique(self):
+        index = ComponentIndex(self.ids)
+        codes, _ = pd.factorize(Series([1, 1, 2, 5, np.nan, 1]))
+        result = index.nunique(codes)
+        self.assertEqual(result.tolist(), [1, 1, 2])
+
+        codes, _ = pd.factorize(Series([np.nan] * 6))
+        result = index.nunique(codes)
+        self.assertEqual(result.tolist(), [0, 0, 0])
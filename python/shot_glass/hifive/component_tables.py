@@ -0,0 +1,401 @@
+import numpy as np
+from pandas import DataFrame, Index, Series
+from pandas.api.extensions import take
+
+from shot_glass.hifive.component_index import ComponentIndex
+import shot_glass.hifive.hifive_tools as hft
+# ------------------------------------------------------------------------------
+
+'''
+The component tables module contains the ComponentTables class, a normalized
+storage engine for HiFive data.
+'''
+
+
+class ComponentTables():
+    '''
+    Normalized storage of a HiFive DataFrame.
+
+    A HiFive DataFrame repeats every item, face, edge and vertex attribute on
+    each of the rows of its component. ComponentTables stores each such column
+    once per component instead, in a table per component type, and keeps the
+    id columns and any column which is not constant per component in a
+    relation of rows. The long DataFrame is only materialized on demand.
+
+    Columns which are added to, removed from or replaced within the
+    materialized DataFrame are written back, by normalizing it anew on the
+    next call to any method. In-place edits of its values are not written
+    back.
+
+    Attributes:
+
+        * relation - Dict of row level columns, including id columns.
+        * tables - Dict of component type indicator to dict of columns with \
+            one value per component.
+        * indexes - Dict of component type indicator to ComponentIndex of \
+            its id column. Component values are stored in order of its ids.
+
+    So, the values of the column f_f_area on each row are
+    take(tables['f']['f_f_area'], indexes['f'].codes, allow_fill=True).
+    '''
+    def __init__(self, data):
+        '''
+        Normalizes a given HiFive DataFrame. A column is stored per component
+        if it can be restored exactly from one value per component, including
+        its dtype.
+
+        Args:
+            data (DataFrame): HiFive DataFrame.
+        '''
+        self.__load(data)
+
+    def __load(self, data):
+        '''
+        Normalizes a given HiFive DataFrame into this instance.
+
+        Args:
+            data (DataFrame): HiFive DataFrame.
+        '''
+        self._index = data.index
+        self._columns = data.columns.tolist()
+        self._data = None
+        self._tokens = {}
+
+        self.relation = {x: data[x] for x in self._columns}
+        self.tables = {}
+        self.indexes = {}
+        for ctype in 'ifev':
+            self.__normalize(ctype)
+
+        # columns of data are views of its blocks, which would otherwise be
+        # kept alive by the remaining row level columns
+        self.relation = {k: v.copy() for k, v in self.relation.items()}
+
+    @property
+    def columns(self):
+        '''
+        Returns:
+            list: Column names, in order.
+        '''
+        self.__sync()
+        return list(self._columns)
+
+    @property
+    def size(self):
+        '''
+        Returns:
+            int: Number of rows.
+        '''
+        self.__sync()
+        return len(self._index)
+
+    @property
+    def data(self):
+        '''
+        Materializes the denormalized HiFive DataFrame. The result is cached
+        until any column is set.
+
+        Returns:
+            DataFrame: HiFive DataFrame.
+        '''
+        self.__sync()
+        if self._data is None:
+            data = {x: self.get_column(x).values for x in self._columns}
+            self.__set_data(
+                DataFrame(data, index=self._index, columns=self._columns)
+            )
+        return self._data
+
+    def __set_data(self, data):
+        '''
+        Caches a given materialized DataFrame along with the tokens of its
+        columns, so that columns replaced within it can be detected.
+
+        Args:
+            data (DataFrame): HiFive DataFrame.
+        '''
+        self._data = data
+        self._tokens = {
+            x: hft.get_series_token(data[x]) for x in data.columns
+        }
+
+    def __sync(self):
+        '''
+        Normalizes the materialized DataFrame anew if any of its columns have
+        been added, removed or replaced since it was materialized.
+        '''
+        data = self._data
+        if data is None:
+            return
+
+        columns = data.columns.tolist()
+        if columns == self._columns:
+            tokens = [hft.get_series_token(data[x]) for x in columns]
+            old = [self._tokens[x] for x in columns]
+            if all(map(hft.is_same_token, old, tokens)):
+                return
+
+        # the DataFrame still equals the data it is normalized from
+        self.__load(data)
+        self.__set_data(data)
+
+    def get_column(self, column, rows=None):
+        '''
+        Gets the row level values of a given column.
+
+        Args:
+            column (str): Column name.
+            rows (slice or array, optional): Row positions. Only these rows \
+                are materialized. Default: None (all rows).
+
+        Raises:
+            KeyError: If column is not found.
+
+        Returns:
+            Series: Column.
+        '''
+        self.__sync()
+        if column in self.relation:
+            if rows is None:
+                return self.relation[column]
+            return self.relation[column].iloc[rows]
+
+        if rows is None:
+            rows = slice(None)
+
+        ctype = self.__get_ctype(column)
+        if ctype is None or column not in self.tables.get(ctype, {}):
+            raise KeyError(column)
+
+        values = self.tables[ctype][column]
+        codes = self.indexes[ctype].codes[rows]
+        values = take(values, codes, allow_fill=True)
+        return Series(values, index=self._index[rows], name=column)
+
+    def get_component_values(self, column):
+        '''
+        Gets the values of a given column per component, if it is stored per
+        component.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            array: Values in order of the ids of the column's component \
+                index or None if column is stored per row.
+        '''
+        self.__sync()
+        ctype = self.__get_ctype(column)
+        return self.tables.get(ctype, {}).get(column)
+
+    def get_index(self, ctype):
+        '''
+        Gets the ComponentIndex of the id column of a given component type.
+
+        Args:
+            ctype (str): Component type indicator.
+
+        Returns:
+            ComponentIndex: Index or None if there is no such id column.
+        '''
+        self.__sync()
+        return self.indexes.get(ctype)
+
+    def get_token(self, column):
+        '''
+        Generates a token of the stored data of a given column (see
+        hifive_tools.get_series_token). Tokens of columns stored per component
+        refer to their component values, so they do not change when the
+        column is materialized.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            tuple: Token.
+        '''
+        self.__sync()
+        values = self.get_component_values(column)
+        if values is None:
+            return hft.get_series_token(self.get_column(column))
+        return hft.get_series_token(Series(values, copy=False))
+
+    def get_checksum(self, column):
+        '''
+        Generates a checksum of the stored data of a given column (see
+        hifive_tools.get_series_checksum), without materializing columns
+        stored per component.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            tuple: Checksum.
+        '''
+        self.__sync()
+        values = self.get_component_values(column)
+        if values is None:
+            return hft.get_series_checksum(self.get_column(column))
+        return hft.get_series_checksum(Series(values, copy=False))
+
+    def set_column(self, column, values):
+        '''
+        Sets the row level values of a given column. Setting an id column
+        renormalizes the columns of its component type. Other columns of a
+        component type are stored in its table if they are constant per
+        component, as on normalization.
+
+        Args:
+            column (str): Column name.
+            values (array-like): Values, one per row.
+        '''
+        self.__sync()
+        if isinstance(values, Series):
+            values = values.values
+
+        ctype = self.__get_ctype(column)
+        is_id = column == f'{ctype}_id'
+        if is_id:
+            self.__denormalize(ctype)
+        elif ctype in self.tables:
+            self.tables[ctype].pop(column, None)
+
+        self.relation[column] = Series(values, index=self._index, name=column)
+        if column not in self._columns:
+            self._columns.append(column)
+        if is_id:
+            self.__normalize(ctype)
+        elif ctype in self.indexes:
+            self.__normalize_column(ctype, column)
+        self._data = None
+
+    def set_component_column(self, column, ids, values):
+        '''
+        Sets the values of a given column per component of its component type.
+
+        Args:
+            column (str): Column name.
+            ids (array-like): Component ids.
+            values (array-like): Values, one per id.
+
+        Raises:
+            KeyError: If column's component type has no id column.
+        '''
+        self.__sync()
+        ctype = self.__get_ctype(column)
+        index = self.indexes.get(ctype)
+        if index is None:
+            raise KeyError(f'{ctype}_id')
+
+        # values must be in the order of the stored ids
+        if not np.array_equal(np.asarray(ids), index.ids):
+            positions = Index(ids).get_indexer(index.ids)
+            values = take(values, positions, allow_fill=True)
+
+        self.relation.pop(column, None)
+        self.tables.setdefault(ctype, {})[column] = values
+        if column not in self._columns:
+            self._columns.append(column)
+        self._data = None
+
+    def copy(self):
+        '''
+        Copies stored data to a new ComponentTables instance. Stored Series
+        and arrays are never modified in place, only replaced, so they are
+        shared with the new instance rather than copied.
+
+        Returns:
+            ComponentTables: New instance.
+        '''
+        self.__sync()
+        output = ComponentTables.__new__(ComponentTables)
+        output._index = self._index
+        output._columns = list(self._columns)
+        output._data = None
+        output._tokens = {}
+        output.relation = dict(self.relation)
+        output.tables = {k: dict(v) for k, v in self.tables.items()}
+        output.indexes = dict(self.indexes)
+        return output
+
+    def memory_usage(self):
+        '''
+        Returns:
+            int: Bytes of stored values, excluding the materialized DataFrame \
+                and those referenced by object arrays.
+        '''
+        self.__sync()
+        total = sum(x.values.nbytes for x in self.relation.values())
+        for table in self.tables.values():
+            total += sum(x.nbytes for x in table.values())
+        return int(total)
+
+    def __get_ctype(self, column):
+        '''
+        Gets the component type indicator of a given column.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            str: Component type indicator or None if column has none.
+        '''
+        ctype = column.split('_')[0]
+        if ctype in ['i', 'f', 'e', 'v']:
+            return ctype
+        return None
+
+    def __normalize(self, ctype):
+        '''
+        Moves the row level columns of a given component type, which are
+        constant per component, into its table.
+
+        Args:
+            ctype (str): Component type indicator.
+        '''
+        id_col = f'{ctype}_id'
+        if id_col not in self.relation:
+            return
+
+        self.indexes[ctype] = ComponentIndex(self.relation[id_col])
+        self.tables.setdefault(ctype, {})
+
+        columns = [
+            x for x in self._columns if x in self.relation and x != id_col
+        ]
+        columns = [x for x in columns if self.__get_ctype(x) == ctype]
+        for column in columns:
+            self.__normalize_column(ctype, column)
+
+    def __normalize_column(self, ctype, column):
+        '''
+        Moves a given row level column into the table of a given component
+        type, if it can be restored exactly from one value per component.
+
+        Args:
+            ctype (str): Component type indicator.
+            column (str): Column name.
+        '''
+        index = self.indexes[ctype]
+        series = self.relation[column]
+        values = index.first(series)
+        restored = take(values, index.codes, allow_fill=True)
+        try:
+            same = series.reset_index(drop=True).equals(Series(restored))
+        except (TypeError, ValueError):
+            same = False
+        if same:
+            self.tables.setdefault(ctype, {})[column] = values
+            del self.relation[column]
+
+    def __denormalize(self, ctype):
+        '''
+        Moves all columns of a given component type back into the relation.
+
+        Args:
+            ctype (str): Component type indicator.
+        '''
+        for column in list(self.tables.get(ctype, {}).keys()):
+            self.relation[column] = self.get_column(column)
+        self.tables.pop(ctype, None)
+        self.indexes.pop(ctype, None)
@@ -0,0 +1,167 @@
+import unittest
+
+from pandas import DataFrame
+import numpy as np
+
+from shot_glass.hifive.component_tables import ComponentTables
+import shot_glass.hifive.hifive_tools as hft
+# ------------------------------------------------------------------------------
+
+
+class ComponentTablesTests(unittest.TestCase):
+    def get_data(self):
+        return DataFrame(dict(
+            f_id=[0, 0, 0, 1, 1, 1],
+            v_id=[0, 1, 2, 2, 1, 3],
+            v_x=[0.0, 1.0, 2.0, 2.0, 1.0, 3.0],
+            v_f_weight=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+            f_s_name=['a', 'a', 'a', 'b', 'b', 'b'],
+            e_id=[np.nan] * 6,
+            e_i_foo=[1, 2, 3, 4, 5, 6],
+        ), index=[5, 4, 3, 2, 1, 0])
+
+    def test_init(self):
+        data = self.get_data()
+        tables = ComponentTables(data)
+        self.assertEqual(tables.columns, data.columns.tolist())
+        self.assertEqual(
+            sorted(tables.relation.keys()),
+            ['e_i_foo', 'e_id', 'f_id', 'v_f_weight', 'v_id']
+        )
+        self.assertEqual(tables.tables['v']['v_x'].tolist(), [0, 1, 2, 3])
+        self.assertEqual(tables.tables['f']['f_s_name'].tolist(), ['a', 'b'])
+        self.assertEqual(tables.get_index('v').ids.tolist(), [0, 1, 2, 3])
+        self.assertIsNone(tables.get_index('i'))
+
+    def test_data(self):
+        data = self.get_data()
+        tables = ComponentTables(data)
+        result = tables.data
+        self.assertTrue(result.equals(data))
+        self.assertEqual(result.index.tolist(), data.index.tolist())
+        self.assertIs(tables.data, result)
+
+    def test_data_write_back(self):
+        tables = ComponentTables(self.get_data())
+        tables.data['f_s_note'] = 'x'
+        self.assertEqual(tables.columns[-1], 'f_s_note')
+        self.assertEqual(tables.tables['f']['f_s_note'].tolist(), ['x', 'x'])
+
+        data = tables.data
+        data['v_x'] = data.v_x + 1
+        self.assertEqual(tables.get_column('v_x').tolist(), [1, 2, 3, 3, 2, 4])
+        self.assertIs(tables.data, data)
+
+        del tables.data['v_x']
+        self.assertNotIn('v_x', tables.columns)
+        self.assertNotIn('v_x', tables.tables['v'])
+
+    def test_nulls(self):
+        data = self.get_data()
+        data['v_id'] = [0, 1, np.nan, np.nan, 1, 3]
+        data['v_x'] = [0.0, 1.0, np.nan, np.nan, 1.0, 3.0]
+        data['v_i_foo'] = [0, 1, 2, 2, 1, 3]
+        tables = ComponentTables(data)
+        self.assertIn('v_x', tables.tables['v'])
+        self.assertIn('v_i_foo', tables.relation)
+        self.assertTrue(tables.data.equals(data))
+
+    def test_set_column(self):
+        tables = ComponentTables(self.get_data())
+        result = tables.data
+        tables.set_column('v_x', [9.0, 8.0, 7.0, 6.0, 5.0, 4.0])
+        self.assertIsNot(tables.data, result)
+        self.assertNotIn('v_x', tables.tables['v'])
+        self.assertEqual(
+            tables.get_column('v_x').tolist(), [9.0, 8.0, 7.0, 6.0, 5.0, 4.0]
+        )
+        self.assertEqual(tables.get_column('v_x').index.tolist(), [5, 4, 3, 2, 1, 0])
+
+        # values constant per component are stored in its table again
+        tables.set_column('v_x', np.array([0, 1, 2, 2, 1, 3], dtype='float32'))
+        self.assertNotIn('v_x', tables.relation)
+        self.assertEqual(tables.tables['v']['v_x'].dtype, np.float32)
+        self.assertEqual(tables.get_column('v_x').tolist(), [0, 1, 2, 2, 1, 3])
+
+        tables.set_column('f_s_name', ['c'] * 6)
+        self.assertEqual(tables.tables['f']['f_s_name'].tolist(), ['c', 'c'])
+        tables.set_column('x_foo', [1] * 6)
+        self.assertIn('x_foo', tables.relation)
+
+    def test_set_column_id(self):
+        tables = ComponentTables(self.get_data())
+        tables.set_column('v_id', [3, 2, 1, 1, 2, 0])
+        self.assertEqual(tables.get_index('v').ids.tolist(), [0, 1, 2, 3])
+        self.assertEqual(
+            tables.get_column('v_x').tolist(), [0, 1, 2, 2, 1, 3]
+        )
+        self.assertEqual(tables.tables['v']['v_x'].tolist(), [3, 2, 1, 0])
+
+        tables.set_column('v_id', [0, 0, 1, 1, 2, 3])
+        self.assertNotIn('v_x', tables.tables['v'])
+        self.assertEqual(
+            tables.get_column('v_x').tolist(), [0, 1, 2, 2, 1, 3]
+        )
+
+    def test_set_component_column(self):
+        tables = ComponentTables(self.get_data())
+        tables.set_component_column('f_f_area', [0, 1], np.array([1.5, 2.5]))
+        self.assertEqual(tables.columns[-1], 'f_f_area')
+        self.assertEqual(
+            tables.get_column('f_f_area').tolist(), [1.5] * 3 + [2.5] * 3
+        )
+
+        tables.set_component_column('f_f_area', [1, 0], np.array([1.5, 2.5]))
+        self.assertEqual(
+            tables.get_column('f_f_area').tolist(), [2.5] * 3 + [1.5] * 3
+        )
+        self.assertEqual(tables.data.f_f_area.tolist(), [2.5] * 3 + [1.5] * 3)
+
+        with self.assertRaises(KeyError):
+            tables.set_component_column('i_f_foo', [0], np.array([1.0]))
+
+    def test_get_token(self):
+        tables = ComponentTables(self.get_data())
+        for col in ['v_x', 'v_id']:
+            a = tables.get_token(col)
+            b = tables.get_token(col)
+            self.assertTrue(hft.is_same_token(a, b))
+
+        a = tables.get_token('v_x')
+        tables.set_column('v_x', [9.0] * 6)
+        b = tables.get_token('v_x')
+        self.assertFalse(hft.is_same_token(a, b))
+
+    def test_get_checksum(self):
+        data = self.get_data()
+        tables = ComponentTables(data)
+        for col in ['v_x', 'v_id']:
+            result = tables.get_checksum(col)
+            expected = hft.get_series_checksum(tables.get_column(col))
+            self.assertEqual(result[1:] == expected[1:], col == 'v_id')
+
+        a = tables.get_checksum('v_id')
+        tables.get_column('v_id').values[0] = 9
+        self.assertNotEqual(tables.get_checksum('v_id'), a)
+
+    def test_copy(self):
+        tables = ComponentTables(self.get_data())
+        result = tables.copy()
+        result.set_column('v_x', [9.0] * 6)
+        self.assertTrue(tables.data.equals(self.get_data()))
+        self.assertEqual(result.data.v_x.tolist(), [9.0] * 6)
+
+    def test_memory_usage(self):
+        data = self.get_data()
+        data = data.loc[data.index.repeat(100)].reset_index(drop=True)
+        tables = ComponentTables(data)
+        expected = sum(data[x].values.nbytes for x in data.columns)
+        self.assertLess(tables.memory_usage(), expected)
+
+    def test_get_column_rows(self):
+        data = self.get_data()
+        tables = ComponentTables(data)
+        self.assertEqual(tables.size, 6)
+        for col in ['v_x', 'v_id', 'f_s_name']:
+            result = tables.get_column(col, rows=slice(2, 4))
+            self.assertTrue(result.equals(data[col].iloc[2:4]))
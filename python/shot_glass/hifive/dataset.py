@@ -0,0 +1,338 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from shot_glass.hifive.hifive import HIFIVE_FILE_EXTENSION, HiFive
+from shot_glass.core.tools import ValidationError
+import shot_glass.hifive.hifive_tools as hft
+# ------------------------------------------------------------------------------
+
+'''
+The dataset module contains the HiFiveDataset class, a collection of HiFive
+shards on disk.
+'''
+
+
+class HiFiveDataset():
+    '''
+    A directory of hi5 shards, one per added HiFive instance, described by a
+    manifest.json file.
+
+    The manifest holds the column schema of the dataset and per shard its
+    file name, row count, columns, id range per id column and bounding box.
+    So, a dataset is opened by reading its manifest alone, and shards can be
+    selected, such as by bounding box, before any of them are read.
+
+    Manifest:
+
+        * columns - Dict of column name to dtype, in order of first \
+            occurrence.
+        * shards - List of dicts with these keys:
+
+            * name - File name of shard.
+            * rows - Number of rows.
+            * columns - Column names.
+            * ids - Dict of id column to [min, max] (null if all null).
+            * bounds - [[min x, min y, min z], [max x, max y, max z]].
+    '''
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, fullpath):
+        '''
+        Opens a dataset directory. The directory and its manifest are created
+        when the first shard is added.
+
+        Args:
+            fullpath (str): Full path to dataset directory.
+
+        Raises:
+            ValidationError: If fullpath exists and is not a directory.
+        '''
+        if os.path.exists(fullpath) and not os.path.isdir(fullpath):
+            msg = f'{fullpath} is not a directory.'
+            raise ValidationError(msg)
+
+        self.fullpath = fullpath
+        self.manifest = dict(columns={}, shards=[])
+
+        manifest = os.path.join(fullpath, self.MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                self.manifest = json.load(f)
+
+    @property
+    def columns(self):
+        '''
+        Returns:
+            dict: Column name to dtype of all shards.
+        '''
+        return dict(self.manifest['columns'])
+
+    @property
+    def shards(self):
+        '''
+        Summary of shards, as recorded in manifest.
+
+        Returns:
+            DataFrame: Table with one row per shard and name, rows, \
+                [id column]_min, [id column]_max, bounds_min and bounds_max \
+                columns.
+        '''
+        rows = []
+        for shard in self.manifest['shards']:
+            row = dict(name=shard['name'], rows=shard['rows'])
+            for col, range_ in shard['ids'].items():
+                row[f'{col}_min'], row[f'{col}_max'] = range_ or [None, None]
+            row['bounds_min'], row['bounds_max'] = shard['bounds']
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def add(self, hifive, format='fixed'):
+        '''
+        Writes a given HiFive instance as a new shard and updates manifest.
+
+        Args:
+            hifive (HiFive): HiFive instance.
+            format (str, optional): HDF format of shard, see \
+                HiFive.write_hi5. Default: fixed.
+
+        Returns:
+            HiFiveDataset: self.
+        '''
+        os.makedirs(self.fullpath, exist_ok=True)
+        index = len(self.manifest['shards'])
+        name = f'{index:06d}.{HIFIVE_FILE_EXTENSION}'
+        hifive.write_hi5(os.path.join(self.fullpath, name), format=format)
+
+        data = hifive.data
+        columns = self.manifest['columns']
+        for col, dtype in data.dtypes.items():
+            columns.setdefault(col, str(dtype))
+
+        ids = {}
+        for col in [f'{x}_id' for x in 'ifev']:
+            if col in data.columns:
+                ids[col] = self.__get_range(data[col])
+
+        bounds = [[None] * 3, [None] * 3]
+        for i, col in enumerate(['v_x', 'v_y', 'v_z']):
+            range_ = None
+            if col in data.columns:
+                range_ = self.__get_range(data[col])
+            if range_ is not None:
+                bounds[0][i], bounds[1][i] = range_
+
+        self.manifest['shards'].append(dict(
+            name=name,
+            rows=len(data),
+            columns=data.columns.tolist(),
+            ids=ids,
+            bounds=bounds,
+        ))
+        self.__write_manifest()
+        return self
+
+    def get_shards_in_bounds(self, minimum, maximum):
+        '''
+        Finds shards whose bounding box intersects a given box. Shards without
+        coordinates are excluded.
+
+        Args:
+            minimum (list): Minimum x, y and z coordinates of box.
+            maximum (list): Maximum x, y and z coordinates of box.
+
+        Returns:
+            list: Shard names.
+        '''
+        output = []
+        for shard in self.manifest['shards']:
+            lower, upper = shard['bounds']
+            if None in lower or None in upper:
+                continue
+            if np.all(np.less_equal(lower, maximum)) and \
+                    np.all(np.less_equal(minimum, upper)):
+                output.append(shard['name'])
+        return output
+
+    def read(self, shards=None, columns=None, workers=None, rebase=True):
+        '''
+        Reads given shards in parallel into a single HiFive instance.
+
+        Shards are read by a pool of processes, since HDF5 is not thread safe
+        and holds the GIL, and are concatenated in the order they were added.
+        Reading shards in this process instead, with workers=1, avoids the
+        cost of starting processes and of sending shards between them, which
+        pays off for few or small shards.
+
+        Rebasing adds an offset to the id columns of each shard, derived from
+        the id ranges of the preceding shards in the manifest, so that
+        components of different shards never share an id. Ids are upcast
+        before rebasing and compacted again afterwards if they were compact.
+
+        Columns missing from a shard are filled with nulls of a nullable
+        dtype, so that integer columns stay integer.
+
+        Args:
+            shards (list, optional): Shard names. Default: None (all).
+            columns (list, optional): Columns to be read. Default: None (all).
+            workers (int, optional): Number of processes which read shards, \
+                or 1 to read them sequentially in this process. \
+                Default: None (number of CPUs, so sequentially on a single \
+                CPU).
+            rebase (bool, optional): Rebase ids. Default: True.
+
+        Raises:
+            ValidationError: If a given shard is not in dataset.
+            TypeError: If column values of data are invalid.
+
+        Returns:
+            HiFive: HiFive instance.
+        '''
+        records = self.manifest['shards']
+        names = [x['name'] for x in records]
+        if shards is None:
+            shards = names
+
+        missing = sorted(set(shards).difference(names))
+        if missing != []:
+            msg = f'Shards not found in dataset: {missing}.'
+            raise ValidationError(msg)
+
+        if columns is None:
+            columns = list(self.manifest['columns'].keys())
+        columns = list(columns)
+
+        shards = set(shards)
+        jobs = [
+            (x, y) for x, y in zip(records, self.__get_id_offsets())
+            if x['name'] in shards
+        ]
+        paths = [os.path.join(self.fullpath, x['name']) for x, _ in jobs]
+        cols = [[y for y in columns if y in x['columns']] for x, _ in jobs]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1 or len(jobs) < 2:
+            frames = list(map(_read_shard, paths, cols))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                frames = list(executor.map(_read_shard, paths, cols))
+
+        data = []
+        compact = set()
+        for shard, (_, offset) in zip(frames, jobs):
+            shard = self.__fill_columns(shard, columns)
+            for col in [f'{x}_id' for x in 'ifev']:
+                if col not in shard.columns:
+                    continue
+                if shard[col].dtype.kind == 'u':
+                    compact.add(col)
+                if rebase and offset.get(col, 0) != 0:
+                    shard[col] = hft.to_wide_integer(shard[col]) + offset[col]
+            data.append(shard)
+
+        output = HiFive()
+        if data == []:
+            output.data = output.data.reindex(columns=columns)
+            return output
+
+        data = pd.concat(data, ignore_index=True)
+        for col in sorted(compact):
+            data[col] = hft.to_compact_integer(data[col])
+        output.data = data
+        output.validate()
+        return output
+
+    def __fill_columns(self, data, columns):
+        '''
+        Fills given columns missing from the data of a shard with nulls.
+
+        Args:
+            data (DataFrame): Data of shard.
+            columns (list): Columns to be read.
+
+        Returns:
+            DataFrame: Data of shard with given columns, in order.
+        '''
+        for col in columns:
+            if col not in data.columns:
+                dtype = self.manifest['columns'].get(col, 'object')
+                dtype = self.__get_null_dtype(dtype)
+                data[col] = pd.Series(index=data.index, dtype=dtype)
+        return data[columns]
+
+    def __get_null_dtype(self, dtype):
+        '''
+        Gets a dtype which holds nulls as well as the values of a given dtype.
+
+        Args:
+            dtype (str): Name of dtype, such as uint8.
+
+        Returns:
+            str: Name of nullable dtype, such as UInt8.
+        '''
+        kind = pd.api.types.pandas_dtype(dtype).kind
+        if kind in 'iu':
+            return dtype.capitalize().replace('Uint', 'UInt')
+        if kind == 'b':
+            return 'boolean'
+        return dtype
+
+    def __get_id_offsets(self):
+        '''
+        Computes the id offset of each shard. The offset of an id column is
+        the sum of the number of ids up to the maximum id of each preceding
+        shard.
+
+        Returns:
+            list: Dict of id column to offset, per shard.
+        '''
+        output = []
+        totals = {}
+        for shard in self.manifest['shards']:
+            output.append(dict(totals))
+            for col, range_ in shard['ids'].items():
+                if range_ is not None:
+                    totals[col] = totals.get(col, 0) + int(range_[1]) + 1
+        return output
+
+    def __get_range(self, series):
+        '''
+        Args:
+            series (Series): Series of numbers.
+
+        Returns:
+            list: Minimum and maximum value or None if all values are null.
+        '''
+        series = series.dropna()
+        if series.empty:
+            return None
+        return series.agg(['min', 'max']).tolist()
+
+    def __write_manifest(self):
+        '''
+        Writes manifest to a temporary file which then replaces manifest, so
+        readers never see a partially written manifest.
+        '''
+        fullpath = os.path.join(self.fullpath, self.MANIFEST)
+        temp = fullpath + '.temp'
+        with open(temp, 'w') as f:
+            json.dump(self.manifest, f, indent=4)
+        os.replace(temp, fullpath)
+
+
+def _read_shard(fullpath, columns):
+    '''
+    Reads given columns of a given shard. Defined at module level, so that it
+    can be sent to worker processes.
+
+    Args:
+        fullpath (str): Full path to shard.
+        columns (list): Columns to be read.
+
+    Returns:
+        DataFrame: Data of shard.
+    '''
+    return HiFive().read_hi5(fullpath, columns=columns).data
@@ -0,0 +1,140 @@
+from tempfile import TemporaryDirectory
+import os
+
+import pandas as pd
+import pytest
+
+from shot_glass.core.tools import ValidationError
+from shot_glass.hifive.dataset import HiFiveDataset
+from shot_glass.hifive.hifive import HiFive
+from shot_glass.hifive.test_base import HiFiveTestBase
+# ------------------------------------------------------------------------------
+
+
+class HiFiveDatasetTests(HiFiveTestBase):
+    def get_dataset(self, root):
+        dataset = HiFiveDataset(os.path.join(root, 'foo'))
+        for data in [self.get_quadrilateral_data(), self.get_triangle_data()]:
+            hi = HiFive()
+            hi.data = data
+            dataset.add(hi)
+
+        hi = HiFive()
+        hi.data = self.get_triangle_data()
+        hi.data['v_x'] = hi.data.v_x + 10
+        hi.data['f_s_name'] = 'far'
+        dataset.add(hi)
+        return dataset
+
+    def test_init(self):
+        with TemporaryDirectory() as root:
+            self.get_dataset(root)
+            dataset = HiFiveDataset(os.path.join(root, 'foo'))
+            self.assertEqual(len(dataset.manifest['shards']), 3)
+            self.assertEqual(
+                list(dataset.columns.keys()),
+                HiFive._HiFive__DEFAULT_COLUMNS + ['f_s_name']
+            )
+            self.assertEqual(dataset.columns['v_x'], 'float64')
+
+            target = os.path.join(root, 'bar')
+            with open(target, 'w') as f:
+                f.write('bar')
+            with pytest.raises(ValidationError) as e:
+                HiFiveDataset(target)
+            self.assertEqual(str(e.value), f'{target} is not a directory.')
+
+    def test_shards(self):
+        with TemporaryDirectory() as root:
+            result = self.get_dataset(root).shards
+            self.assertEqual(
+                result.name.tolist(),
+                ['000000.hi5', '000001.hi5', '000002.hi5']
+            )
+            self.assertEqual(result.rows.tolist(), [8, 6, 6])
+            self.assertEqual(result.e_id_max.tolist(), [3, 2, 2])
+            self.assertEqual(result.bounds_min[2], [10.0, 0.0, 0.0])
+            self.assertEqual(result.bounds_max[2], [12.0, 2.0, 2.0])
+
+    def test_get_shards_in_bounds(self):
+        with TemporaryDirectory() as root:
+            dataset = self.get_dataset(root)
+            result = dataset.get_shards_in_bounds([9, 0, 0], [20, 1, 1])
+            self.assertEqual(result, ['000002.hi5'])
+
+            result = dataset.get_shards_in_bounds([2, 2, 2], [2, 2, 2])
+            self.assertEqual(result, ['000000.hi5', '000001.hi5'])
+
+    def test_read(self):
+        with TemporaryDirectory() as root:
+            dataset = self.get_dataset(root)
+            expected = dataset.read(workers=1).data
+            for workers in [None, 1, 2]:
+                result = dataset.read(workers=workers).data
+                self.assertTrue(result.equals(expected))
+                self.assertEqual(len(result), 20)
+                self.assertEqual(result.f_id.unique().tolist(), [0, 1, 2])
+                self.assertEqual(result.e_id.nunique(), 10)
+                self.assertEqual(result.v_id.nunique(), 10)
+                self.assertEqual(result.f_s_name.tolist()[-1], 'far')
+                self.assertTrue(result.f_s_name.head(14).isnull().all())
+
+            result = dataset.read(rebase=False).data
+            self.assertEqual(result.f_id.unique().tolist(), [0])
+
+    def test_read_compact(self):
+        with TemporaryDirectory() as root:
+            dataset = HiFiveDataset(os.path.join(root, 'foo'))
+            for _ in range(2):
+                data = self.get_triangle_data()
+                data = pd.concat([data] * 200, ignore_index=True)
+                data['f_id'] = data.index // 6
+                data['e_id'] = data.index // 2
+                data['v_id'] = data.index
+                hi = HiFive(compact=True)
+                hi.data = data
+                self.assertEqual(hi.data.f_id.dtype.name, 'uint8')
+                dataset.add(hi)
+
+            result = dataset.read().data
+            self.assertEqual(result.f_id.nunique(), 400)
+            self.assertEqual(result.f_id.max(), 399)
+            self.assertEqual(result.f_id.dtype.name, 'uint16')
+            self.assertEqual(result.v_id.nunique(), 2400)
+
+    def test_read_missing_columns(self):
+        with TemporaryDirectory() as root:
+            dataset = self.get_dataset(root)
+            hi = HiFive()
+            hi.data = self.get_triangle_data()
+            hi.data['f_i_foo'] = 7
+            dataset.add(hi)
+
+            result = dataset.read().data
+            self.assertEqual(result.f_i_foo.dtype.name, 'Int64')
+            self.assertTrue(result.f_i_foo.head(20).isnull().all())
+            self.assertEqual(result.f_i_foo.tail(6).tolist(), [7] * 6)
+
+            hi = HiFive()
+            hi.data = self.get_triangle_data()
+            hi.data['f_i_bar'] = 0.5
+            dataset.add(hi)
+            with pytest.raises(TypeError):
+                dataset.read()
+
+    def test_read_shards(self):
+        with TemporaryDirectory() as root:
+            dataset = self.get_dataset(root)
+            result = dataset.read(
+                shards=['000002.hi5'], columns=['f_id', 'v_x']
+            ).data
+            self.assertEqual(result.columns.tolist(), ['f_id', 'v_x'])
+            self.assertEqual(result.f_id.unique().tolist(), [2])
+
+            result = dataset.read(shards=[]).data
+            self.assertEqual(len(result), 0)
+
+            with pytest.raises(ValidationError) as e:
+                dataset.read(shards=['foo.hi5'])
+            expected = "Shards not found in dataset: ['foo.hi5']."
+            self.assertEqual(str(e.value), expected)
@@ -1,8 +1,22 @@
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+import hashlib
+import json
+import os
 import re
 
+import numpy as np
 import pandas as pd
-from pandas import DataFrame
-
+from pandas import DataFrame, Series
+from pandas.api.extensions import take
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from shot_glass.hifive.component_index import ComponentIndex
+from shot_glass.hifive.component_tables import ComponentTables
+from shot_glass.hifive.lazy import LazyHiFive
+from shot_glass.hifive.spatial_index import SpatialIndex
 from shot_glass.hifive.type_base import HiFiveTypeBase
 from shot_glass.core.tools import ValidationError
 import shot_glass.hifive.hifive_tools as hft
@@ -12,17 +26,27 @@ LOGGER = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------
 
 HIFIVE_FILE_EXTENSION = 'hi5'
+PARQUET_FILE_EXTENSION = 'parquet'
+FEATHER_FILE_EXTENSION = 'feather'
+MMAP_FILE_EXTENSION = 'hi5m'
 
 
 class HiFiveDataType(HiFiveTypeBase):
     '''
     Legal data types for HiFive columns.
     '''
-    FLOAT = ('float', 'f', float, hft.is_float, None)
-    INTEGER = ('integer', 'i', int, hft.is_integer, None)
-    JSON = ('json', 'j', str, hft.is_json, None)
-    OPTIONAL = ('optional', 'x', object, lambda x: True, None)
-    STRING = ('string', 's', str, hft.is_string, None)
+    FLOAT = (
+        'float', 'f', float, hft.is_float, None, hft.get_first_invalid_float
+    )
+    INTEGER = (
+        'integer', 'i', int, hft.is_integer, None,
+        hft.get_first_invalid_integer
+    )
+    JSON = ('json', 'j', str, hft.is_json, None, hft.get_first_invalid_json)
+    OPTIONAL = ('optional', 'x', object, lambda x: True, None, lambda x: None)
+    STRING = (
+        'string', 's', str, hft.is_string, None, hft.get_first_invalid_string
+    )
 
 
 class HiFiveComponentType(HiFiveTypeBase):
@@ -35,6 +59,23 @@ class HiFiveComponentType(HiFiveTypeBase):
     VERTICES = ('vertex', 'v', None, None, 3)
 
 
+ColumnSchema = namedtuple(
+    'ColumnSchema', ['name', 'descriptor', 'ctype', 'dtype', 'validator']
+)
+ColumnSchema.__doc__ = '''
+Immutable description of a HiFive column name.
+
+Attributes:
+
+    * name - Full name of column
+    * descriptor - Descriptor of column (comes after ctype and dtype)
+    * ctype - HiFiveComponentType of column
+    * dtype - HiFiveDataType of column
+    * validator - Series validator of dtype, which returns (index, value) of \
+        the first invalid element or None
+'''
+
+
 class HiFive():
     '''
     HIFIVE stands for Homomorphically Indexed Faces Items Vertices and Edges
@@ -109,49 +150,901 @@ class HiFive():
     '''
     __DEFAULT_COLUMNS = ['i_id', 'f_id', 'e_id', 'v_id', 'v_x', 'v_y', 'v_z']
 
-    def __init__(self):
+    def __init__(
+        self, compact=False, compact_coordinates=False, normalized=False
+    ):
         '''
         Creates an empty HiFive instance with the default columns.
+
+        In compact mode, data is compacted (see compact) whenever it is
+        assigned to the instance. Compact id columns overflow under
+        arithmetic, see compact.
+
+        In normalized mode, data is stored in ComponentTables, which store each
+        column that is constant per component once per component, rather than
+        once per row. The data property then materializes the long DataFrame
+        on demand and caches it until data is next modified. Columns added to,
+        removed from or replaced within this DataFrame are written back, but
+        in-place edits of its values, such as via loc, are not.
+
+        Args:
+            compact (bool, optional): Compact id columns of assigned data. \
+                Default: False.
+            compact_coordinates (bool, optional): Also compact coordinate \
+                columns of assigned data. Default: False.
+            normalized (bool, optional): Store data normalized. \
+                Default: False.
         '''
+        self._compact = compact
+        self._compact_coordinates = compact_coordinates
+        self._normalized = normalized
+        self._tables = None
+
+        # column name to token of the data it was last validated against
+        self._validated = {}
+
+        # column name to checksum and ComponentIndex of column
+        self._indexes = {}
+
+        # number of modifications of data, and memoized views of data
+        self._version = 0
+        self._views = {}
+
+        # number of times data has been exposed to in-place edits, and column
+        # name to token, exposure and checksum of column
+        self._exposure = 0
+        self._checksums = {}
+
+        # checksums of vertex columns and SpatialIndex of vertices
+        self._spatial_index = None
+
         self.data = DataFrame(columns=self.__DEFAULT_COLUMNS)
+
+    @property
+    def data(self):
+        '''
+        Internal data. As it may be edited in place, memoized views are
+        recomputed and cached indexes verify the columns they depend on after
+        each access, see _get_column_checksum. In-place edits via a reference
+        to data held across calls to HiFive methods are not detected.
+
+        Returns:
+            DataFrame: Internal data.
+        '''
+        self._exposure += 1
+        if self._tables is not None:
+            return self._tables.data
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        '''
+        Sets internal data, compacting it in compact mode and normalizing it in
+        normalized mode.
+
+        Args:
+            value (DataFrame): Data.
+        '''
+        self._data = value
+        self._tables = None
+        self._version += 1
+        self._exposure += 1
+        self._checksums = {}
+        if self._compact:
+            self.compact(coordinates=self._compact_coordinates)
+        if self._normalized:
+            self._tables = ComponentTables(self._data)
+            self._data = None
+
+    def _get_columns(self):
+        '''
+        Gets column names without materializing normalized data.
+
+        Returns:
+            list: Column names.
+        '''
+        if self._tables is not None:
+            return self._tables.columns
+        return self._data.columns.tolist()
+
+    def _get_column(self, column):
+        '''
+        Gets a given column without materializing normalized data.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            Series: Column.
+        '''
+        if self._tables is not None:
+            return self._tables.get_column(column)
+        return self._data[column]
+
+    def _set_column(self, column, values):
+        '''
+        Sets a given column, one value per row.
+
+        Args:
+            column (str): Column name.
+            values (array-like): Column values.
+        '''
+        if self._tables is not None:
+            self._tables.set_column(column, values)
+        else:
+            self._data[column] = values
+        self._version += 1
+
+    @property
+    def version(self):
+        '''
+        Number of modifications of data through assignment to data and HiFive
+        methods. In-place edits of the data DataFrame are not counted.
+
+        Returns:
+            int: Version.
+        '''
+        return self._version
+
+    def __get_view(self, name, func, columns):
+        '''
+        Memoizes a view of data, such as item_info. Views are recomputed when
+        data is modified (see version), when any of the columns they are
+        computed from is added, removed or replaced, as detected by their
+        tokens, and after data is accessed, as it may have been edited in
+        place then. Repeated reads of unchanged data are free.
+
+        Memoized views are returned as shallow copies, which share their
+        values with the memo. So, columns may be assigned to them, but their
+        values must not be edited in place.
+
+        Args:
+            name (str): Name of view.
+            func (function): Function which computes view.
+            columns (list): Columns which view is computed from.
+
+        Returns:
+            DataFrame: Shallow copy of view.
+        '''
+        key = (tuple(columns), self._version, self._exposure)
+        tokens = [self._get_column_token(x) for x in columns]
+
+        view = None
+        if name in self._views:
+            old_key, old_tokens, old_view = self._views[name]
+            if old_key == key and \
+                    all(map(hft.is_same_token, old_tokens, tokens)):
+                view = old_view
+        if view is None:
+            view = func()
+            self._views[name] = (key, tokens, view)
+        return view.copy(deep=False)
+
+    def __get_view_columns(self, ctype=None):
+        '''
+        Gets the columns which a view of a given component type is computed
+        from.
+
+        Args:
+            ctype (str, optional): Component type indicator. \
+                Default: None (all columns).
+
+        Returns:
+            list: Column names.
+        '''
+        columns = self._get_columns()
+        if ctype is None:
+            return columns
+        return [x for x in columns if x.startswith(f'{ctype}_')]
+
+    def _get_column_token(self, column):
+        '''
+        Generates a token of the data of a given column, see
+        hifive_tools.get_series_token.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            tuple: Token.
+        '''
+        if self._tables is not None:
+            return self._tables.get_token(column)
+        return hft.get_series_token(self._data[column])
+
+    def _get_column_checksum(self, column):
+        '''
+        Generates a checksum of the data of a given column, see
+        hifive_tools.get_series_checksum.
+
+        Checksums are memoized and only recomputed once the column has been
+        replaced or data has been accessed, and so possibly edited in place,
+        since. So, repeated calls on unchanged data are O(1).
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            tuple: Checksum.
+        '''
+        token = self._get_column_token(column)
+        if column in self._checksums:
+            old_token, exposure, checksum = self._checksums[column]
+            if exposure == self._exposure and \
+                    hft.is_same_token(old_token, token):
+                return checksum
+
+        if self._tables is not None:
+            checksum = self._tables.get_checksum(column)
+        else:
+            checksum = hft.get_series_checksum(self._data[column])
+        self._checksums[column] = (token, self._exposure, checksum)
+        return checksum
+
+    def compact(self, coordinates=False):
+        '''
+        Reduces the memory footprint of the internal data.
+
+        Id columns are stored as the smallest unsigned integer dtype which fits
+        them, which is nullable if they contain nulls. Float or object id
+        columns, such as those produced by NaNs in read_json or concat, are
+        converted as long as their values are integral. Coordinate columns may
+        optionally be stored as 32 bit floats.
+
+        Compact id columns overflow silently under arithmetic, for instance
+        a uint8 f_id + 255 wraps around to 254 or less. Upcast them with
+        hifive_tools.to_wide_integer before doing arithmetic on their values.
+        HiFive methods never do arithmetic on id values, only on their codes.
+
+        Args:
+            coordinates (bool, optional): Store v_x, v_y and v_z as 32 bit \
+                floats. Default: False.
+
+        Returns:
+            HiFive: self.
+        '''
+        cols = self._get_columns()
+        funcs = {x: hft.to_compact_integer for x in ['i_id', 'f_id', 'e_id']}
+        funcs['v_id'] = hft.to_compact_integer
+        if coordinates:
+            for col in ['v_x', 'v_y', 'v_z']:
+                funcs[col] = hft.to_compact_float
+
+        for col, func in funcs.items():
+            if col in cols:
+                series = self._get_column(col)
+                result = func(series)
+
+                # already compact columns are left untouched, so that their
+                # buffers are not reallocated
+                if result is not series:
+                    self._set_column(col, result)
+        return self
     # --------------------------------------------------------------------------
 
-    def read_hi5(self, fullpath):
+    def read_hi5(self, fullpath, columns=None, where=None):
         '''
-        Reads a given hi5 file from disk.
+        Reads a given hi5 file from disk. Only loaded columns are validated.
+
+        Columns and where are pushed down to files written in table format
+        (see write_hi5), so that only the selected rows and columns are read
+        from disk. Files in fixed format are read in their entirety.
 
         Args:
             fuillpath (str): Full path to hi5 file.
+            columns (list, optional): Columns to be read. Default: None (all).
+            where (str, optional): Row selection on id columns, such as \
+                'i_id in [0, 1]'. Requires table format. Default: None.
 
         Raises:
             ValidationError: If file does not end in 'hi5' extension.
+            ValidationError: If where is given for a file in fixed format.
             TypeError: If column names or values of data are invalid.
 
         Returns:
             HiFive: self.
         '''
         hft.validate_file_extension(fullpath, HIFIVE_FILE_EXTENSION)
-        self.data = pd.read_hdf(fullpath, 'data')
+        self.__validate_column_names(columns)
+        with pd.HDFStore(fullpath, mode='r') as store:
+            if store.get_storer('data').is_table:
+                data = store.select('data', where=where, columns=columns)
+            else:
+                if where is not None:
+                    msg = 'Where requires a hi5 file written in table format.'
+                    raise ValidationError(msg)
+                data = store.select('data')
+                if columns is not None:
+                    data = data[list(columns)]
+        self.data = data
         self.validate()
         return self
 
-    def write_hi5(self, fullpath):
+    def write_hi5(self, fullpath, format='fixed', append=False):
         '''
         Writes data to given hi5 filepath.
 
+        In table format, id columns are written as indexed data columns, so
+        that read_hi5 can select rows by id. Table format does not support
+        columns of arbitrary objects, such as lists.
+
+        Appending writes data after the rows already in the file, so that
+        large files can be written in chunks, such as those of iter_items.
+        Appended data must have the same columns and dtypes and string values
+        no longer than those of the first chunk.
+
         Args:
             fullpath (str): Full path to hi5 file.
+            format (str, optional): HDF format, fixed or table. \
+                Default: fixed.
+            append (bool, optional): Append data to file. Requires table \
+                format. Default: False.
 
         Raises:
             ValidationError: If file does not end in 'hi5' extension.
+            ValidationError: If format is not fixed or table.
+            ValidationError: If append is True and format is not table.
 
         Returns:
             HiFive: self.
         '''
         hft.validate_file_extension(fullpath, HIFIVE_FILE_EXTENSION)
-        self.data.to_hdf(fullpath, 'data')
+        if format not in ['fixed', 'table']:
+            msg = f'Format must be fixed or table, found: {format}.'
+            raise ValidationError(msg)
+        if append and format != 'table':
+            raise ValidationError('Append requires table format.')
+
+        if format == 'fixed':
+            self.data.to_hdf(fullpath, 'data')
+        else:
+            cols = [f'{x}_id' for x in 'ifev']
+            cols = [x for x in cols if x in self._get_columns()]
+            self.data.to_hdf(
+                fullpath,
+                'data',
+                format='table',
+                data_columns=cols,
+                append=append,
+            )
+        LOGGER.info(f'HiFive data written to {fullpath}')
+        return self
+
+    @classmethod
+    def iter_items(cls, fullpath, batch_items=1, columns=None):
+        '''
+        Iterates over the items of a given file, in batches of items, without
+        reading the whole file into memory. Items are yielded in order of
+        their ids. Rows without an item id are yielded last, as one batch.
+
+        Supported files are hi5 files in table format (see write_hi5),
+        parquet files and hi5m directories. Each needs an i_id column.
+
+        Args:
+            fullpath (str): Full path to file.
+            batch_items (int, optional): Number of items per batch. \
+                Default: 1.
+            columns (list, optional): Columns to be read. Default: None (all).
+
+        Raises:
+            ValidationError: If batch_items is less than 1.
+            ValidationError: If file type is not supported.
+            ValidationError: If hi5 file is not in table format.
+            TypeError: If column names or values of data are invalid.
+
+        Yields:
+            HiFive: HiFive instance per batch.
+        '''
+        if batch_items < 1:
+            msg = f'Batch items must be 1 or greater, found: {batch_items}.'
+            raise ValidationError(msg)
+
+        ext = os.path.splitext(fullpath)[1][1:]
+        readers = {
+            HIFIVE_FILE_EXTENSION: cls.__iter_hi5_items,
+            PARQUET_FILE_EXTENSION: cls.__iter_parquet_items,
+            MMAP_FILE_EXTENSION: cls.__iter_mmap_items,
+        }
+        if ext not in readers:
+            msg = f'Expected extension: {sorted(readers)}, found: {ext}.'
+            raise ValidationError(msg)
+
+        cls().__validate_column_names(columns)
+        for data in readers[ext](fullpath, batch_items, columns):
+            hifive = cls()
+            hifive.data = data
+            hifive.validate()
+            yield hifive
+
+    @staticmethod
+    def __iter_item_batches(item_ids, batch_items):
+        '''
+        Batches given item ids.
+
+        Args:
+            item_ids (Series): Item id column.
+            batch_items (int): Number of items per batch.
+
+        Yields:
+            tuple: Item ids and sorted row positions of each batch. Item ids \
+                of the batch of rows without an item id are None.
+        '''
+        index = ComponentIndex(item_ids)
+        for i in range(0, index.size, batch_items):
+            j = min(i + batch_items, index.size)
+            rows = index.permutation[index.offsets[i]:index.offsets[j]]
+            yield index.ids[i:j], np.sort(rows)
+
+        nulls = np.flatnonzero(index.codes < 0)
+        if nulls.size > 0:
+            yield None, nulls
+
+    @classmethod
+    def __iter_hi5_items(cls, fullpath, batch_items, columns):
+        '''
+        Iterates over batches of items of a hi5 file in table format, by row
+        positions read from its i_id column.
+
+        Args:
+            fullpath (str): Full path to file.
+            batch_items (int): Number of items per batch.
+            columns (list): Columns to be read or None.
+
+        Yields:
+            DataFrame: Data of each batch.
+        '''
+        with pd.HDFStore(fullpath, mode='r') as store:
+            if not store.get_storer('data').is_table:
+                msg = 'Iteration requires a hi5 file written in table format.'
+                raise ValidationError(msg)
+            item_ids = store.select_column('data', 'i_id')
+            for _, rows in cls.__iter_item_batches(item_ids, batch_items):
+                yield store.select('data', where=rows, columns=columns)
+
+    @classmethod
+    def __iter_parquet_items(cls, fullpath, batch_items, columns):
+        '''
+        Iterates over batches of items of a parquet file, by row positions
+        read from its i_id column. Only the row groups which hold the rows of
+        a batch are read and row groups shared by consecutive batches are
+        read once. So, files written by write_parquet, whose row groups hold
+        whole items, are read one row group at a time.
+
+        Args:
+            fullpath (str): Full path to file.
+            batch_items (int): Number of items per batch.
+            columns (list): Columns to be read or None.
+
+        Yields:
+            DataFrame: Data of each batch.
+        '''
+        file_ = pq.ParquetFile(fullpath)
+        meta = file_.metadata
+        sizes = [meta.row_group(i).num_rows for i in range(meta.num_row_groups)]
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        item_ids = file_.read(columns=['i_id']).column('i_id').to_pandas()
+        tables = {}
+        for _, rows in cls.__iter_item_batches(item_ids, batch_items):
+            row_groups = np.searchsorted(offsets, rows, side='right') - 1
+            groups = np.unique(row_groups)
+            tables = {
+                x: tables[x] if x in tables else file_.read_row_group(
+                    x, columns=columns, use_pandas_metadata=True
+                )
+                for x in groups.tolist()
+            }
+            table = pa.concat_tables([tables[x] for x in groups.tolist()])
+
+            # position of each row within the concatenated row groups
+            starts = np.cumsum(offsets[groups + 1] - offsets[groups])
+            starts -= offsets[groups + 1] - offsets[groups]
+            positions = rows - offsets[row_groups]
+            positions += starts[np.searchsorted(groups, row_groups)]
+            yield table.take(positions).to_pandas()
+
+    @classmethod
+    def __iter_mmap_items(cls, fullpath, batch_items, columns):
+        '''
+        Iterates over batches of items of a hi5m directory. Columns are memory
+        mapped, so only the pages of each batch are read.
+
+        Args:
+            fullpath (str): Full path to file.
+            batch_items (int): Number of items per batch.
+            columns (list): Columns to be read or None.
+
+        Yields:
+            DataFrame: Data of each batch.
+        '''
+        cols = columns
+        if cols is not None and 'i_id' not in cols:
+            cols = list(cols) + ['i_id']
+        data = cls().read_mmap(fullpath, columns=cols).data
+
+        batches = cls.__iter_item_batches(data.i_id, batch_items)
+        for _, rows in batches:
+            batch = data.iloc[rows]
+            if cols is not columns:
+                batch = batch[list(columns)]
+            yield batch
+
+    def read_parquet(self, fullpath, columns=None, use_threads=True):
+        '''
+        Reads a given parquet file from disk.
+
+        Args:
+            fullpath (str): Full path to parquet file.
+            columns (list, optional): Columns to be read. Default: None (all).
+            use_threads (bool, optional): Decode columns in parallel. \
+                Default: True.
+
+        Raises:
+            ValidationError: If file does not end in 'parquet' extension.
+            TypeError: If column names or values of data are invalid.
+
+        Returns:
+            HiFive: self.
+        '''
+        hft.validate_file_extension(fullpath, PARQUET_FILE_EXTENSION)
+        self.__validate_column_names(columns)
+        self.data = pd.read_parquet(
+            fullpath, columns=columns, use_threads=use_threads
+        )
+        self.validate()
+        return self
+
+    def write_parquet(
+        self, fullpath, compression='snappy', row_group_size=2 ** 16
+    ):
+        '''
+        Writes data to given parquet filepath.
+
+        Rows are grouped by item, in order of item ids and with rows without
+        an item id last, while rows keep their order within each item. Row
+        groups hold whole items, so that iter_items reads each row group
+        once. The index is written as a column, so it is kept by readers of
+        single row groups.
+
+        Args:
+            fullpath (str): Full path to parquet file.
+            compression (str, optional): Compression codec, such as snappy, \
+                gzip, brotli, lz4 or zstd. Default: snappy.
+            row_group_size (int, optional): Minimum number of rows per row \
+                group, except the last. Default: 65536.
+
+        Raises:
+            ValidationError: If file does not end in 'parquet' extension.
+
+        Returns:
+            HiFive: self.
+        '''
+        hft.validate_file_extension(fullpath, PARQUET_FILE_EXTENSION)
+        data = self.data
+        bounds = np.array([0, len(data)])
+        if 'i_id' in self._get_columns():
+            index = self._get_component_index('i_id')
+            order = np.append(
+                index.permutation, np.flatnonzero(index.codes < 0)
+            )
+            if not np.array_equal(order, np.arange(len(data))):
+                data = data.iloc[order]
+
+            # cut at the first item boundary after every row_group_size rows
+            items = np.append(index.offsets, len(data))
+            cuts = np.arange(row_group_size, len(data), row_group_size)
+            cuts = items[np.minimum(np.searchsorted(items, cuts), items.size - 1)]
+            bounds = np.unique(np.concatenate([[0], cuts, [len(data)]]))
+
+        table = pa.Table.from_pandas(data, preserve_index=True)
+        with pq.ParquetWriter(
+            fullpath, table.schema, compression=compression
+        ) as writer:
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                writer.write_table(
+                    table.slice(start, stop - start),
+                    row_group_size=max(stop - start, 1),
+                )
         LOGGER.info(f'HiFive data written to {fullpath}')
         return self
+
+    def read_feather(self, fullpath, columns=None, use_threads=True):
+        '''
+        Reads a given feather (Arrow IPC) file from disk.
+
+        Args:
+            fullpath (str): Full path to feather file.
+            columns (list, optional): Columns to be read. Default: None (all).
+            use_threads (bool, optional): Decode columns in parallel. \
+                Default: True.
+
+        Raises:
+            ValidationError: If file does not end in 'feather' extension.
+            TypeError: If column names or values of data are invalid.
+
+        Returns:
+            HiFive: self.
+        '''
+        hft.validate_file_extension(fullpath, FEATHER_FILE_EXTENSION)
+        self.__validate_column_names(columns)
+        self.data = pd.read_feather(
+            fullpath, columns=columns, use_threads=use_threads
+        )
+        self.validate()
+        return self
+
+    def write_feather(self, fullpath, compression='lz4'):
+        '''
+        Writes data to given feather (Arrow IPC) filepath. Feather does not
+        store the index of data, so it is written with a fresh RangeIndex.
+
+        Args:
+            fullpath (str): Full path to feather file.
+            compression (str, optional): Compression codec, lz4, zstd or \
+                uncompressed. Default: lz4.
+
+        Raises:
+            ValidationError: If file does not end in 'feather' extension.
+
+        Returns:
+            HiFive: self.
+        '''
+        hft.validate_file_extension(fullpath, FEATHER_FILE_EXTENSION)
+        self.data \
+            .reset_index(drop=True) \
+            .to_feather(fullpath, compression=compression)
+        LOGGER.info(f'HiFive data written to {fullpath}')
+        return self
+
+    def read_mmap(self, fullpath, columns=None):
+        '''
+        Reads a given hi5m directory written by write_mmap from disk.
+
+        Numeric columns are copy-on-write memory maps of their files. So, they
+        are only paged in when accessed, are shared with other processes
+        reading the same files and are only copied when modified.
+
+        Args:
+            fullpath (str): Full path to hi5m directory.
+            columns (list, optional): Columns to be read. Default: None (all).
+
+        Raises:
+            ValidationError: If directory does not end in 'hi5m' extension.
+            TypeError: If column names or values of data are invalid.
+
+        Returns:
+            HiFive: self.
+        '''
+        hft.validate_file_extension(fullpath, MMAP_FILE_EXTENSION)
+        self.__validate_column_names(columns)
+        with open(os.path.join(fullpath, 'schema.json')) as f:
+            schema = json.load(f)
+
+        index = schema['index']
+        if index['kind'] == 'range':
+            index = pd.RangeIndex(index['start'], index['stop'], index['step'])
+        else:
+            index = pd.Index(hft.read_mmap_array(index, fullpath))
+
+        if columns is None:
+            columns = list(schema['columns'].keys())
+        data = {
+            x: hft.read_mmap_array(schema['columns'][x], fullpath)
+            for x in columns
+        }
+        self.data = DataFrame(data, index=index, columns=columns, copy=False)
+        self.validate()
+        return self
+
+    def write_mmap(self, fullpath):
+        '''
+        Writes data to given hi5m directory, as one memory mappable file per
+        column (see hifive_tools.write_mmap_array) and a schema.json file.
+
+        Args:
+            fullpath (str): Full path to hi5m directory.
+
+        Raises:
+            ValidationError: If directory does not end in 'hi5m' extension.
+
+        Returns:
+            HiFive: self.
+        '''
+        hft.validate_file_extension(fullpath, MMAP_FILE_EXTENSION)
+        os.makedirs(fullpath, exist_ok=True)
+
+        index = self.data.index
+        if isinstance(index, pd.RangeIndex):
+            index = dict(
+                kind='range',
+                start=index.start,
+                stop=index.stop,
+                step=index.step,
+            )
+        else:
+            target = os.path.join(fullpath, 'index')
+            index = hft.write_mmap_array(index.to_numpy(), target)
+
+        columns = {}
+        for col in self._get_columns():
+            target = os.path.join(fullpath, col)
+            values = self._get_column(col).values
+            columns[col] = hft.write_mmap_array(values, target)
+
+        # schema is written to a temporary file which then replaces schema,
+        # last, so readers never see a partially written schema or missing
+        # column files
+        schema = dict(index=index, columns=columns)
+        target = os.path.join(fullpath, 'schema.json')
+        temp = target + '.temp'
+        with open(temp, 'w') as f:
+            json.dump(schema, f, indent=4)
+        os.replace(temp, target)
+
+        LOGGER.info(f'HiFive data written to {fullpath}')
+        return self
+
+    def __validate_column_names(self, columns):
+        '''
+        Validates given column names before they are read from disk.
+
+        Args:
+            columns (list): Column names or None.
+
+        Raises:
+            ValidationError: If columns is not a list or a name is invalid.
+        '''
+        if columns is None:
+            return
+        if not isinstance(columns, (list, tuple)):
+            msg = f'Columns must be a list, found: {columns}.'
+            raise ValidationError(msg)
+        for column in columns:
+            self._validate_column_name(column)
+
+    def from_arrays(self, vertices, face_offsets, face_indices, item_ids=None):
+        '''
+        Sets data from numpy arrays of a polygonal mesh, without looping over
+        faces in Python.
+
+        Faces are given in CSR (compressed sparse row) form, so the vertex
+        indices of face i are face_indices[face_offsets[i]:face_offsets[i + 1]],
+        in draw order. Each face edge gets 2 rows, one per vertex, and edges
+        shared by faces share an edge id. Vertex ids are the row positions of
+        vertices and the position of each vertex within its face is stored in
+        a v_i_draw_order column. For example:
+
+        ::
+
+            # a quadrilateral
+            hi = HiFive().from_arrays(
+                np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]),
+                np.array([0, 4]),
+                np.array([0, 1, 2, 3]),
+            )
+
+        Args:
+            vertices (numpy.ndarray): (N, 3) array of vertex coordinates.
+            face_offsets (numpy.ndarray): Array of F + 1 offsets of faces \
+                into face_indices, starting with 0.
+            face_indices (numpy.ndarray): Vertex indices of all faces.
+            item_ids (numpy.ndarray, optional): Item id per face. \
+                Default: None (item 0).
+
+        Raises:
+            ValidationError: If arrays have invalid shapes or indices.
+
+        Returns:
+            HiFive: self.
+        '''
+        vertices = np.asarray(vertices, dtype=np.float64)
+        offsets = np.asarray(face_offsets, dtype=np.int64)
+        indices = np.asarray(face_indices, dtype=np.int64)
+        if vertices.ndim != 2 or vertices.shape[1] != 3:
+            msg = f'Vertices must be of shape (N, 3). Found: {vertices.shape}.'
+            raise ValidationError(msg)
+
+        if offsets.ndim != 1 or offsets.size < 1 or offsets[0] != 0 \
+                or offsets[-1] != indices.size \
+                or (np.diff(offsets) < 0).any():
+            msg = 'Face offsets must start with 0, never decrease and end '
+            msg += f'with the length of face indices ({indices.size}).'
+            raise ValidationError(msg)
+
+        if indices.size > 0:
+            if indices.min() < 0 or indices.max() >= vertices.shape[0]:
+                msg = 'Face indices must be within the range of vertices.'
+                raise ValidationError(msg)
+
+        sizes = np.diff(offsets)
+        faces = offsets.size - 1
+        if item_ids is None:
+            item_ids = np.zeros(faces, dtype=np.int64)
+        item_ids = np.asarray(item_ids)
+        if item_ids.shape != (faces,):
+            msg = f'Item ids must be of shape ({faces},). '
+            msg += f'Found: {item_ids.shape}.'
+            raise ValidationError(msg)
+
+        # one edge per face corner, from the corner to the next one
+        f_id = np.repeat(np.arange(faces), sizes)
+        start = np.repeat(offsets[:-1], sizes)
+        corner = np.arange(indices.size)
+        order = corner - start
+        next_ = corner + 1
+        last = order == np.repeat(sizes, sizes) - 1
+        next_[last] = start[last]
+
+        a = indices
+        b = indices[next_]
+        pairs = np.minimum(a, b) * vertices.shape[0] + np.maximum(a, b)
+        _, e_id = np.unique(pairs, return_inverse=True)
+
+        v_id = np.column_stack([a, b]).ravel()
+        f_id = np.repeat(f_id, 2)
+        data = DataFrame(dict(
+            i_id=item_ids[f_id],
+            f_id=f_id,
+            e_id=np.repeat(e_id, 2),
+            v_id=v_id,
+            v_x=vertices[v_id, 0],
+            v_y=vertices[v_id, 1],
+            v_z=vertices[v_id, 2],
+            v_i_draw_order=np.column_stack([order, order[next_]]).ravel(),
+        ))
+        self.data = data
+        self.validate()
+        return self
+
+    def to_arrays(self):
+        '''
+        Gets numpy arrays of the polygonal mesh of data, in the form taken by
+        from_arrays.
+
+        Vertices are ordered by v_id and faces by f_id, and vertices are
+        referred to by their position. The vertices of each face are ordered
+        by v_i_draw_order if it exists and by row order otherwise. For example:
+
+        ::
+
+            vertices, offsets, indices, item_ids = hi.to_arrays()
+            for i in range(offsets.size - 1):
+                face = vertices[indices[offsets[i]:offsets[i + 1]]]
+
+        Returns:
+            tuple: (vertices, face_offsets, face_indices, item_ids) arrays.
+        '''
+        v_index = self._get_component_index('v_id')
+        f_index = self._get_component_index('f_id')
+
+        vertices = [
+            np.asarray(v_index.first(self._get_column(x)), dtype=np.float64)
+            for x in ['v_x', 'v_y', 'v_z']
+        ]
+        vertices = np.column_stack(vertices)
+
+        f_codes = f_index.codes
+        v_codes = v_index.codes
+        rows = np.flatnonzero((f_codes >= 0) & (v_codes >= 0))
+
+        # sort rows by face then draw order and keep first face vertex pairs
+        keys = [rows, f_codes[rows]]
+        if 'v_i_draw_order' in self._get_columns():
+            order = self._get_column('v_i_draw_order').to_numpy()
+            keys.insert(1, order[rows])
+        rows = rows[np.lexsort(keys)]
+        pairs = f_codes[rows].astype(np.int64) * v_index.size + v_codes[rows]
+        _, first = np.unique(pairs, return_index=True)
+        rows = rows[np.sort(first)]
+
+        sizes = np.bincount(f_codes[rows], minlength=f_index.size)
+        offsets = np.zeros(f_index.size + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        indices = v_codes[rows].astype(np.int64)
+
+        item_ids = np.asarray(f_index.first(self._get_column('i_id')))
+        return vertices, offsets, indices, item_ids
     # --------------------------------------------------------------------------
 
     def validate_column(self, column):
@@ -168,28 +1061,152 @@ class HiFive():
         Returns:
             HiFive: self.
         '''
-        if column not in self.data.columns.tolist():
+        if column not in self._get_columns():
             msg = f'{column} not found in columns.'
             raise ValidationError(msg)
 
         self._validate_column_name(column)
         self._validate_column_values(column)
+        self._mark_columns_validated([column])
         return self
 
-    def validate(self):
+    def validate(self, force=False):
         '''
         Validate all column names and values.
 
+        Columns are only revalidated if they were added or their data was
+        replaced since they were last validated. Columns whose values are not
+        validated by their dtype alone, such as string and json columns, are
+        always revalidated, as in-place edits of data which keep a column's
+        dtype can only invalidate those.
+
+        Args:
+            force (bool, optional): Revalidate every column. Default: False.
+
         Raises:
             ValidationError: If any column name or set of values are invalid.
 
         Returns:
             HiFive: self.
         '''
-        for column in self.data.columns.tolist():
-            self.validate_column(column)
+        columns = self._get_columns()
+        self._validated = {
+            k: v for k, v in self._validated.items() if k in columns
+        }
+        for column in columns:
+            if force or not self._is_column_validated(column) or \
+                    not self.__is_valid_dtype(column):
+                self.validate_column(column)
         return self
 
+    def __is_valid_dtype(self, column):
+        '''
+        Determines whether the dtype of a given column ensures that its values
+        are valid, so that in-place edits which keep its dtype cannot
+        invalidate it.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            bool: Whether dtype ensures column is valid.
+        '''
+        indicator = self.get_column_schema(column).dtype.indicator
+        if indicator == 'x':
+            return True
+        kinds = dict(f='f', i='iub').get(indicator, '')
+        return self._get_column(column).dtype.kind in kinds
+
+    def _is_column_validated(self, column):
+        '''
+        Determines whether a given column has been validated against its
+        current data.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            bool: Whether column is validated.
+        '''
+        if column not in self._validated:
+            return False
+
+        token = self._get_column_token(column)
+        return hft.is_same_token(self._validated[column], token)
+
+    def _mark_columns_validated(self, columns):
+        '''
+        Records given columns as validated against their current data.
+
+        Args:
+            columns (list): Column names.
+        '''
+        for column in columns:
+            self._validated[column] = self._get_column_token(column)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_column_name(column):
+        '''
+        Splits a given column name into its indicators and descriptor, without
+        validating the indicators. Results are cached per column name.
+
+        Args:
+            column (str): Column name.
+
+        Raises:
+            ValidationError: If column name does not have 3 parts separated by
+                '_'.
+
+        Returns:
+            tuple: (ctype indicator, dtype indicator, descriptor).
+        '''
+        if column in HiFive.__DEFAULT_COLUMNS:
+            ctype_i, desc = column.split('_')
+            if desc == 'id':
+                return ctype_i, 'i', desc
+            return ctype_i, 'f', desc
+
+        parts = re.split('_', column, maxsplit=2)
+        if len(parts) != 3:
+            msg = f'{column} is not a valid column name.'
+            raise ValidationError(msg)
+        return tuple(parts)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_column_schema(column):
+        '''
+        Gets the schema of a given column name, which is cached per column
+        name. Schemas do not depend on data.
+
+        Args:
+            column (str): Column name.
+
+        Raises:
+            ValidationError: If column name does not have 3 parts separated by
+                '_'.
+            ValidationError: If indicated ctype is illegal.
+            ValidationError: If indicated dtype is illegal.
+
+        Returns:
+            ColumnSchema: Schema of column.
+        '''
+        ctype, dtype, desc = HiFive._parse_column_name(column)
+        if not HiFiveComponentType.is_valid_indicator(ctype):
+            msg = f'{ctype} is not a valid ctype indicator.'
+            raise ValidationError(msg)
+
+        if not HiFiveDataType.is_valid_indicator(dtype):
+            msg = f'{dtype} is not a valid dtype indicator.'
+            raise ValidationError(msg)
+
+        ctype = HiFiveComponentType.from_indicator(ctype)
+        dtype = HiFiveDataType.from_indicator(dtype)
+        return ColumnSchema(
+            column, desc, ctype, dtype, dtype.get_first_invalid_value
+        )
+
     def _get_column_attributes(self, column):
         '''
         Generates a dict of attributes describing a given column.
@@ -208,21 +1225,11 @@ class HiFive():
         Returns:
             dict: dict of attributes.
         '''
-        ctype_i = None
-        dtype_i = None
-        desc = None
-        if column in self.__DEFAULT_COLUMNS:
-            ctype_i, desc = column.split('_')
-            if desc == 'id':
-                dtype_i = 'i'
-            else:
-                dtype_i = 'f'
-        else:
-            ctype_i, dtype_i, desc = re.split('_', column, maxsplit=2)
+        ctype_i, dtype_i, desc = self._parse_column_name(column)
 
         hasnans = None
-        if column in self.data.columns.tolist():
-            hasnans = self.data[column].hasnans
+        if column in self._get_columns():
+            hasnans = self._get_column(column).hasnans
 
         return dict(
             name=column,
@@ -249,29 +1256,16 @@ class HiFive():
         Returns:
             HiFive: self.
         '''
-        if column not in self.__DEFAULT_COLUMNS:
-            parts = re.split('_', column, maxsplit=2)
-            if len(parts) != 3:
-                msg = f'{column} is not a valid column name.'
-                raise ValidationError(msg)
-
-        attrs = self._get_column_attributes(column)
-
-        ctype = attrs['ctype_indicator']
-        if not HiFiveComponentType.is_valid_indicator(ctype):
-            msg = f'{ctype} is not a valid ctype indicator.'
-            raise ValidationError(msg)
-
-        dtype = attrs['dtype_indicator']
-        if not HiFiveDataType.is_valid_indicator(dtype):
-            msg = f'{dtype} is not a valid dtype indicator.'
-            raise ValidationError(msg)
+        self.get_column_schema(column)
 
     def _validate_column_values(self, column):
         '''
         Validates that values of a given column are of the type indicated by its
         dtype indicator.
 
+        Validity is decided from the column's numpy dtype kind where possible,
+        and only object columns are checked element by element.
+
         Args:
             column (str): Name of column to be validated.
 
@@ -282,16 +1276,18 @@ class HiFive():
         Returns:
             HiFive: self.
         '''
-        if self.data.shape[0] < 1:
+        series = self._get_column(column)
+        if series.size < 1:
             return
 
-        dtype = self._get_column_attributes(column)['dtype_indicator']
-        dtype = HiFiveDataType.from_indicator(dtype)
-        for item in self.data[column].tolist():
-            if not dtype.is_valid_value(item):
-                msg = 'Non-{} value found in column {}: {}'
-                msg = msg.format(dtype.fullname, column, str(item))
-                raise TypeError(msg)
+        schema = self.get_column_schema(column)
+        dtype = schema.dtype
+        invalid = schema.validator(series)
+        if invalid is not None:
+            index, item = invalid
+            msg = 'Non-{} value found in column {} at index {}: {}'
+            msg = msg.format(dtype.fullname, column, index, str(item))
+            raise TypeError(msg)
     # --------------------------------------------------------------------------
 
     def map(self, source, target, aggregator):
@@ -315,59 +1311,37 @@ class HiFive():
         integers. Thus, said mean value is coerced into an integer inside the
         aggregator.
 
+        Aggregators may also be given as the name of a reducer (count, first,
+        max, mean, min, nunique, prod, sum) or as a numpy reduction, such as
+        np.add or np.mean. These run through pandas' compiled groupby rather
+        than calling a Python function per component, and are much faster:
+
+        ::
+
+            hi.map('v_x', 'f_f_x_mean', 'mean')
+            hi.map('v_x', 'f_f_x_max', np.maximum)
+
         Args:
             source (str): Source column from which data should be mapped.
             target (str): Name of new column to be created.
-            aggregator (function): Function responsible for mapping/modifying \
-                values of the source column into the target column. Expects a \
-                pandas Series object as input.
+            aggregator (function or str): Function responsible for \
+                mapping/modifying values of the source column into the target \
+                column. Expects a pandas Series object as input. May also be \
+                a reducer name or numpy reduction.
 
         Raises:
             ValidationError: If target column ctype is illegal.
             ValidationError: If target column dtype is illegal.
+            ValidationError: If aggregator is an unknown reducer name.
             ValidationError: If source column contains null values.
             TypeError: If target column values are illegal.
 
         Returns:
             HiFive: self with new target column.
         '''
-        self._validate_column_name(source)
-        self._validate_column_name(target)
-
-        # Mappings must always be 1 to many or 1 to 1, because aggregators take
-        # one or many components and return one. So, establishing the
-        # relationship between source and target component is necessary here.
-
-        # component hierarchy
-        # items contain faces contain edges contain vertices
-        source_attrs = self._get_column_attributes(source)
-        target_attrs = self._get_column_attributes(target)
-        a = HiFiveComponentType.from_indicator(source_attrs['ctype_indicator'])
-        b = HiFiveComponentType.from_indicator(target_attrs['ctype_indicator'])
-
-        # assume target component contains source component
-        attrs = target_attrs
-
-        # if source component contains target component
-        if a.order < b.order:
-            attrs = source_attrs
-
-        ctype_i = attrs['ctype_indicator']
-        id_col = ctype_i + '_id'
-
-        dtype = HiFiveDataType.from_indicator(target_attrs['dtype_indicator'])
-
-        if self.data[id_col].hasnans:
-            ctype = HiFiveComponentType.from_indicator(ctype_i).fullname
-            msg = f'Cannot map to column of {ctype} component type because'
-            msg += f' {id_col} column contains null values.'
-            raise TypeError(msg)
-
-        temp_column = False
-        if id_col == source:
-            temp_column = True
-            source = '__temp'
-            self.data[source] = self.data[id_col]
+        reducer = hft.get_reducer_name(aggregator)
+        id_col = self.__get_map_id_column(source, target)
+        dtype = self.get_column_schema(target).dtype
 
         # Build a lookup table with the id of largest component in the mapping
         # as the keys and the aggregation of the source column values per key as
@@ -384,8 +1358,8 @@ class HiFive():
         # hi.map('v_s_foo', 'f_s_bar', lambda x: '-'.join(x.tolist()))
         # will produce this lut:
         # {
-        #   0: [a, b]
-        #   1: [c, d]
+        #   0: a-b
+        #   1: c-d
         # }
 
         # and this new column to the table:
@@ -399,56 +1373,292 @@ class HiFive():
         # The homomorphic aspect of HiFive is to do with the homogenous mapping
         # of information across rows per component id.
 
-        # For example, the face with face id of 0 must have the same properties
-        # for its f_s_bar columns across all its rows. Thus 'a-b', and only
-        # 'a-b', must be mapped to this column of each of them.
+        # For example, the face with face id of 0 must have the same properties
+        # for its f_s_bar columns across all its rows. Thus 'a-b', and only
+        # 'a-b', must be mapped to this column of each of them.
+
+        # Ids are factorized into codes once and cached, so that the lut can be
+        # computed with a groupby over integer codes and broadcast back to every
+        # row by taking from it with those same codes.
+        codes = self._get_component_index(id_col).codes
+        grouped = self._get_column(source).groupby(codes)
+        if reducer is None:
+            lut = grouped.agg(lambda x: aggregator(x))
+        else:
+            lut = grouped.agg(reducer)
+        lut = self.__cast_map_lut(lut, dtype)
+
+        self.__set_map_lut(target, id_col, lut)
+        self.validate_column(target)
+
+        return self
+
+    def map_many(self, mapping):
+        '''
+        Maps many target columns at once, following the same rules as map.
+
+        Targets are grouped by the id column their mapping is done over, so
+        that the data is only grouped once per id column, and all named and
+        numpy reducers of that id column are computed in a single groupby pass.
+        All target columns are then added to the data in a single concat.
+        For example:
+
+        ::
+
+            hi.map_many({
+                'f_f_x_mean': ('v_x', 'mean'),
+                'f_f_x_max': ('v_x', np.maximum),
+                'f_i_count': ('v_id', 'nunique'),
+                'i_s_names': ('f_s_name', lambda x: ','.join(x.unique())),
+            })
+
+        Args:
+            mapping (dict): Dict of target columns and (source, aggregator) \
+                tuples.
+
+        Raises:
+            ValidationError: If any target column ctype is illegal.
+            ValidationError: If any target column dtype is illegal.
+            ValidationError: If any aggregator is an unknown reducer name.
+            ValidationError: If any source column contains null values.
+            TypeError: If any target column values are illegal.
+
+        Returns:
+            HiFive: self with new target columns.
+        '''
+        # validate all mappings before computing any of them
+        specs = {}
+        for target, (source, aggregator) in mapping.items():
+            reducer = hft.get_reducer_name(aggregator)
+            id_col = self.__get_map_id_column(source, target)
+            dtype = self.get_column_schema(target).dtype
+            spec = (target, source, aggregator, reducer, dtype)
+            specs.setdefault(id_col, []).append(spec)
+
+        luts = {}
+        for id_col, items in specs.items():
+            codes = self._get_component_index(id_col).codes
+            sources = list(dict.fromkeys([x[1] for x in items]))
+            grouped = DataFrame({x: self._get_column(x) for x in sources})
+            grouped = grouped.groupby(codes)
+
+            # named aggregation computes all reducers in one pass
+            named = {
+                x[0]: pd.NamedAgg(column=x[1], aggfunc=x[3])
+                for x in items if x[3] is not None
+            }
+            reduced = DataFrame()
+            if len(named) > 0:
+                reduced = grouped.agg(**named)
+
+            for target, source, aggregator, reducer, dtype in items:
+                if reducer is None:
+                    lut = grouped[source].agg(lambda x: aggregator(x))
+                else:
+                    lut = reduced[target]
+                lut = self.__cast_map_lut(lut, dtype)
+                luts[target] = (id_col, lut)
+
+        # normalized data stores each column separately, so there is nothing
+        # to be gained from concatenating
+        if self._tables is not None:
+            for target in mapping.keys():
+                id_col, lut = luts[target]
+                self.__set_map_lut(target, id_col, lut)
+                self.validate_column(target)
+            return self
+
+        validated = self.data.columns.tolist()
+        validated = list(filter(self._is_column_validated, validated))
+
+        columns = {}
+        for target in mapping.keys():
+            id_col, lut = luts[target]
+            codes = self._get_component_index(id_col).codes
+            columns[target] = lut.take(codes).values
+        cols = self.data.columns.tolist()
+        cols += [x for x in columns.keys() if x not in cols]
+        existing = [x for x in columns.keys() if x in self.data.columns]
+        data = self.data.drop(columns=existing)
+        data = pd.concat(
+            [data, DataFrame(columns, index=data.index)], axis=1, copy=False
+        )
+        if len(existing) > 0:
+            data = data[cols]
+        self.data = data
+
+        # concatenation may move untouched columns without changing them
+        validated = [x for x in validated if x not in columns]
+        self._mark_columns_validated(validated)
+        for target in columns.keys():
+            self.validate_column(target)
+
+        return self
+
+    def __get_map_id_column(self, source, target):
+        '''
+        Validates given source and target columns of a mapping and determines
+        the id column of the larger of their two components, which the mapping
+        is done over.
+
+        Args:
+            source (str): Source column.
+            target (str): Target column.
+
+        Raises:
+            ValidationError: If source or target column names are invalid.
+            TypeError: If id column contains null values.
+
+        Returns:
+            str: Id column.
+        '''
+        # Mappings must always be 1 to many or 1 to 1, because aggregators take
+        # one or many components and return one. So, establishing the
+        # relationship between source and target component is necessary here.
+
+        # component hierarchy
+        # items contain faces contain edges contain vertices
+        a = self.get_column_schema(source).ctype
+        b = self.get_column_schema(target).ctype
+
+        # assume target component contains source component
+        ctype = b
+
+        # if source component contains target component
+        if a.order < b.order:
+            ctype = a
+
+        id_col = ctype.indicator + '_id'
+
+        if self._get_column(id_col).hasnans:
+            ctype = ctype.fullname
+            msg = f'Cannot map to column of {ctype} component type because'
+            msg += f' {id_col} column contains null values.'
+            raise TypeError(msg)
+
+        return id_col
 
-        lut = self.data[[id_col, source]] \
-            .groupby(id_col, as_index=False)[source] \
-            .agg(lambda x: aggregator(x))
-        if dtype != 'optional':
-            lut[source] = lut[source].astype(dtype.type_)
+    def __cast_map_lut(self, lut, dtype):
+        '''
+        Casts a given lut of aggregated values to the type of given dtype.
 
-        ids = lut[id_col].tolist()
-        values = lut[source].tolist()
-        lut = dict(zip(ids, values))
+        Args:
+            lut (Series): Aggregated values.
+            dtype (HiFiveDataType): Data type of target column.
 
-        if temp_column:
-            del self.data[source]
+        Returns:
+            Series: Cast lut.
+        '''
+        if dtype != HiFiveDataType.OPTIONAL:
+            lut = lut.astype(dtype.type_)
+        return lut
 
-        self.data[target] = self.data[id_col].apply(lambda x: lut[x])
-        self.validate_column(target)
+    def __set_map_lut(self, target, id_col, lut):
+        '''
+        Sets a target column from a given lut of aggregated values. In
+        normalized mode, targets of the component type of the id column are
+        stored once per component, rather than broadcast to every row.
 
-        return self
+        Args:
+            target (str): Target column.
+            id_col (str): Id column lut was aggregated over.
+            lut (Series): Aggregated values, one per code of id column.
+        '''
+        index = self._get_component_index(id_col)
+        if self._tables is not None and target[0] == id_col[0]:
+            self._tables.set_component_column(target, index.ids, lut.values)
+            self._version += 1
+        else:
+            self._set_column(target, lut.take(index.codes).values)
     # --------------------------------------------------------------------------
 
-    def __expand_row(self, row, source, target, expander):
+    def __expand_data(self, data, source, target, id_, expander):
         '''
-        Transform the contents of a given row into many rows via a given
-        expander.
+        Transforms the contents of each row of a given DataFrame into many rows
+        via a given expander.
+
+        The expander is called once per row to get the lengths of the expanded
+        rows, from which the output is allocated in one take.
 
         Args:
-            row (Series): Series to be expanded.
-            source (str): Index element of row to be expanded.
-            target (str): Name of new row index to be created.
+            data (DataFrame): DataFrame to be expanded.
+            source (str): Column to be expanded.
+            target (str): Name of column of expanded elements.
+            id_ (str): Name of column of index labels of the expanded rows.
             expander (function): Function that receives an element and \
                 produces a list of new elements.
 
         Returns:
             DataFrame: DataFrame of new rows.
         '''
-        output = DataFrame()
-        output[target] = expander(row[source])
-        cols = row.index.tolist()
-        cols = list(filter(lambda x: x != source, cols))
-        for col in cols:
-            output[col] = row[col]
-        return output
+        values = [expander(x) for x in data[source].tolist()]
+        lengths = np.fromiter(map(len, values), dtype=np.int64)
+        rows = np.repeat(np.arange(len(data)), lengths)
 
-    def expand(self, source, target, id_, expander):
+        cols = data.columns.tolist()
+        if id_ not in cols:
+            cols.append(id_)
+        cols = [target if x == source else x for x in cols]
+
+        drop = [x for x in [source, target, id_] if x in data.columns]
+        output = data \
+            .drop(columns=drop) \
+            .take(rows) \
+            .reset_index(drop=True)
+        output[id_] = data.index.values[rows]
+        output[target] = Series(list(chain.from_iterable(values)))
+        return output[cols]
+
+    def __iter_expand(self, source, target, id_, expander, chunksize):
+        '''
+        Generates HiFive instances of expanded chunks of rows.
+
+        Args:
+            source (str): Source column to be expanded.
+            target (str): Name of new column to be created.
+            id_ (str): Name of id column to be created.
+            expander (function): Function which converts a row element in to a \
+                list of elements.
+            chunksize (int): Number of source rows per chunk.
+
+        Yields:
+            HiFive: HiFive instance of expanded chunk.
+        '''
+        validated = self._get_columns()
+        validated = list(filter(self._is_column_validated, validated))
+        validated = [x for x in validated if x not in [source, target, id_]]
+
+        for i in range(0, self.data.shape[0], chunksize):
+            data = self.data.iloc[i:i + chunksize]
+            output = HiFive(
+                compact=self._compact,
+                compact_coordinates=self._compact_coordinates,
+                normalized=self._normalized,
+            )
+            output.data = self.__expand_data(
+                data, source, target, id_, expander
+            )
+            output._mark_columns_validated(validated)
+            yield output.validate()
+
+    def expand(self, source, target, id_, expander, chunksize=None):
         '''
         Expands elements within each row of a source column into multiple rows.
 
+        If chunksize is given, the data is expanded chunksize source rows at a
+        time and a generator of HiFive instances of expanded chunks is returned
+        instead, leaving this instance untouched. This bounds the memory needed
+        to expand large datasets to that of a single chunk. For example:
+
+        ::
+
+            chunks = hi.expand(
+                'v_s_fullpath', 'v_x_pixel', 'v_i_pixel_id', read_pixels,
+                chunksize=100
+            )
+            for i, chunk in enumerate(chunks):
+                chunk.write_hi5(f'/tmp/chunk_{i:04d}.hi5')
+
         Args:
             source (str): Source column to be expanded.
             target (str): Name of new column to be created.
@@ -456,6 +1666,8 @@ class HiFive():
                 on source. Must be of integer dtype.
             expander (function): Function which converts a row element in to a \
                 list of elements.
+            chunksize (int, optional): Number of source rows to expand at a \
+                time. Default: None.
 
         Raises:
             TypeError: If id is not of integer dtype.
@@ -463,64 +1675,437 @@ class HiFive():
             TypeError: If source, target or id values are invalid.
 
         Returns:
-            HiFive: self with expanded rows.
+            HiFive or generator: self with expanded rows or generator of \
+                HiFive instances.
         '''
         self._validate_column_name(source)
         self._validate_column_name(target)
-        self._validate_column_name(id_)
-
-        id_attrs = self._get_column_attributes(id_)
-        dtype = HiFiveDataType.from_indicator(id_attrs['dtype_indicator'])
+        dtype = self.get_column_schema(id_).dtype
         if dtype != HiFiveDataType.INTEGER:
             msg = 'Id column must be of dtype INTEGER. '
             msg += f'Provided dtype: {dtype.name}.'
             raise TypeError(msg)
 
-        self.data[id_] = self.data.index
-
-        # create a list of expanded DataFrames
-        data = self.data.apply(
-            lambda x: self.__expand_row(x, source, target, expander),
-            axis=1)\
-            .tolist()
+        if chunksize is not None:
+            return self.__iter_expand(source, target, id_, expander, chunksize)
 
-        # concatenate that list into a single DataFrame
-        data = pd.concat(data, ignore_index=True)
+        validated = self._get_columns()
+        validated = list(filter(self._is_column_validated, validated))
+        validated = [x for x in validated if x not in [source, target, id_]]
 
-        cols = self.data.columns.tolist()
-        cols = [target if x == source else x for x in cols]
-        data = data[cols]
+        self.data = self.__expand_data(self.data, source, target, id_, expander)
 
-        self.data = data
+        # untouched columns are repeats of already validated values
+        self._mark_columns_validated(validated)
         self.validate()
         return self
+
+    def lazy(self):
+        '''
+        Creates a plan of map, map_many, expand, select and filter operations,
+        which is optimized and executed on a new HiFive instance when its
+        collect method is called (see LazyHiFive). For example:
+
+        ::
+
+            hi = hi.lazy() \\
+                .map('v_x', 'f_f_x_mean', 'mean') \\
+                .map('v_y', 'f_f_y_mean', 'mean') \\
+                .select(['i_id', 'f_id', 'f_f_x_mean', 'f_f_y_mean']) \\
+                .collect()
+
+        Returns:
+            LazyHiFive: Plan.
+        '''
+        return LazyHiFive(self)
     # --------------------------------------------------------------------------
 
-    def copy(self):
+    def copy(self, deep=None):
         '''
         Copy HiFive instance to new HiFive instance.
 
+        When pandas copy on write is enabled, copies are shallow by default.
+        They then share column buffers with this instance until either of them
+        modifies a column, at which point only that column is copied. This makes
+        copies cheap enough to be used as snapshots. For example:
+
+        ::
+
+            pd.options.mode.copy_on_write = True
+            snapshot = hi.copy()
+            hi.map('v_x', 'f_f_x_mean', 'mean')
+
+        Without copy on write, a shallow copy shares buffers with this instance
+        and sees its in-place modifications. Normalized data is never
+        modified in place, so it is always copied shallowly.
+
+        Validated columns and cached component indexes are carried over to the
+        copy, as far as their buffers are shared.
+
+        Args:
+            deep (bool, optional): Copy column buffers. Default: None, which \
+                copies unless pandas copy on write is enabled.
+
         Returns:
             HiFive: new HiFive instance.
         '''
-        output = HiFive()
-        output.data = self.data.copy()
+        if deep is None:
+            deep = not pd.options.mode.copy_on_write
+
+        columns = self._get_columns()
+        columns = list(filter(self._is_column_validated, columns))
+
+        output = HiFive(
+            compact=self._compact,
+            compact_coordinates=self._compact_coordinates,
+            normalized=self._normalized,
+        )
+        if self._tables is not None:
+            output._data = None
+            output._tables = self._tables.copy()
+        else:
+            output.data = self.data.copy(deep=deep)
+        output._mark_columns_validated(columns)
+        output._indexes = dict(self._indexes)
+        return output
+
+    def select(
+        self, items=None, faces=None, edges=None, vertices=None, copy=True
+    ):
+        '''
+        Selects the rows of given components. Rows are found by a binary
+        search of the cached ComponentIndex of each given id column (see
+        ComponentIndex.get_rows), so only the rows of the selected components
+        are visited, rather than the whole of data. Selections of different
+        component types are intersected. For example:
+
+        ::
+
+            hi.select(items=[0, 1], faces=[3])
+
+        Args:
+            items (list, optional): Item ids. Default: None.
+            faces (list, optional): Face ids. Default: None.
+            edges (list, optional): Edge ids. Default: None.
+            vertices (list, optional): Vertex ids. Default: None.
+            copy (bool, optional): Copy selected rows. If False and selected \
+                rows are contiguous, such as the rows of one item of data \
+                sorted by item, the data of the result is a view of data. \
+                Default: True.
+
+        Raises:
+            ValidationError: If id column of a given component is not found.
+
+        Returns:
+            HiFive: New HiFive instance of selected rows.
+        '''
+        rows = None
+        selection = dict(i_id=items, f_id=faces, e_id=edges, v_id=vertices)
+        for column, ids in selection.items():
+            if ids is None:
+                continue
+            if column not in self._get_columns():
+                msg = f'{column} not found in columns.'
+                raise ValidationError(msg)
+            if np.isscalar(ids):
+                ids = [ids]
+
+            temp = self._get_component_index(column).get_rows(ids)
+            if rows is not None:
+                temp = np.intersect1d(rows, temp, assume_unique=True)
+            rows = temp
+
+        if rows is None:
+            rows = slice(None)
+        elif rows.size > 0 and rows[-1] - rows[0] + 1 == rows.size:
+            rows = slice(rows[0], rows[-1] + 1)
+
+        validated = self._get_columns()
+        validated = list(filter(self._is_column_validated, validated))
+
+        output = HiFive(
+            compact=self._compact,
+            compact_coordinates=self._compact_coordinates,
+            normalized=self._normalized,
+        )
+        if self._tables is not None:
+            cols = self._get_columns()
+            data = {x: self._tables.get_column(x, rows=rows) for x in cols}
+            data = DataFrame(data, columns=cols, copy=False)
+        elif isinstance(rows, slice):
+            data = self._data.iloc[rows]
+            if copy:
+                data = data.copy()
+        else:
+            # take always copies, so the rows are copied only once
+            data = self._data.take(rows)
+        output.data = data
+        output._mark_columns_validated(validated)
         return output
 
+    def query_box(self, minimum, maximum, rows=False):
+        '''
+        Finds the vertices within a given axis aligned box, boundary included,
+        via a cached SpatialIndex of vertices.
+
+        Args:
+            minimum (array-like): Minimum x, y and z of box or (N, 3) array \
+                of minima of boxes.
+            maximum (array-like): Maximum x, y and z of box or (N, 3) array \
+                of maxima of boxes.
+            rows (bool, optional): Return the rows of found vertices, see \
+                select. Default: False.
+
+        Raises:
+            ValidationError: If v_id, v_x, v_y or v_z column is not found.
+
+        Returns:
+            numpy.ndarray or HiFive: Sorted vertex ids or HiFive of rows, or \
+                a list of either per box, if arrays of boxes are given.
+        '''
+        output = self._get_spatial_index().query_box(minimum, maximum)
+        if not rows:
+            return output
+        if np.ndim(minimum) == 1:
+            return self.select(vertices=output)
+        return [self.select(vertices=x) for x in output]
+
+    def query_radius(self, points, radius, rows=False):
+        '''
+        Finds the vertices within a given distance of each given point, via a
+        cached SpatialIndex of vertices.
+
+        Args:
+            points (array-like): x, y and z of a point or (N, 3) array of \
+                points.
+            radius (float or array-like): Distance or distance per point.
+            rows (bool, optional): Return the rows of found vertices, see \
+                select. Default: False.
+
+        Raises:
+            ValidationError: If v_id, v_x, v_y or v_z column is not found.
+
+        Returns:
+            numpy.ndarray or HiFive: Sorted vertex ids or HiFive of rows, or \
+                a list of either per point, if an array of points is given.
+        '''
+        output = self._get_spatial_index().query_radius(points, radius)
+        if not rows:
+            return output
+        if np.ndim(points) == 1:
+            return self.select(vertices=output)
+        return [self.select(vertices=x) for x in output]
+
+    def query_knn(self, points, k=1):
+        '''
+        Finds the k nearest vertices of each given point, via a cached
+        SpatialIndex of vertices.
+
+        Args:
+            points (array-like): x, y and z of a point or (N, 3) array of \
+                points.
+            k (int, optional): Number of vertices, at most all vertices. \
+                Default: 1.
+
+        Raises:
+            ValidationError: If v_id, v_x, v_y or v_z column is not found.
+
+        Returns:
+            tuple: Vertex ids and distances, in order of distance. Each is a \
+                (N, k) array, if an array of points is given.
+        '''
+        return self._get_spatial_index().query_knn(points, k)
+
+    def _get_spatial_index(self):
+        '''
+        Gets the SpatialIndex of the vertices of data, built from the first
+        non-null coordinates of each vertex id. Vertices without coordinates
+        are excluded. The index is cached until any of the v_id, v_x, v_y or
+        v_z columns is replaced or edited in place, as detected by their
+        checksums, see _get_column_checksum.
+
+        Raises:
+            ValidationError: If v_id, v_x, v_y or v_z column is not found.
+
+        Returns:
+            SpatialIndex: Index of vertices.
+        '''
+        columns = ['v_id', 'v_x', 'v_y', 'v_z']
+        missing = [x for x in columns if x not in self._get_columns()]
+        if missing != []:
+            msg = f'Spatial queries require columns: {missing}.'
+            raise ValidationError(msg)
+
+        checksums = [self._get_column_checksum(x) for x in columns]
+        if self._spatial_index is not None:
+            old_checksums, index = self._spatial_index
+            if old_checksums == checksums:
+                return index
+
+        ids, points = self.__get_vertex_points()
+        mask = ~np.isnan(points).any(axis=1)
+        index = SpatialIndex(ids[mask], points[mask])
+        self._spatial_index = (checksums, index)
+        return index
+
+    def __get_vertex_points(self):
+        '''
+        Gets the first non-null coordinates of each vertex id.
+
+        Returns:
+            tuple: Sorted vertex ids and (N, 3) float64 array of their \
+                coordinates, with nans where coordinates are null.
+        '''
+        vertices = self._get_component_index('v_id')
+        points = [
+            Series(vertices.first(self._get_column(x)))
+            .to_numpy(dtype=np.float64, na_value=np.nan)
+            for x in ['v_x', 'v_y', 'v_z']
+        ]
+        return vertices.ids, np.stack(points, axis=1).reshape(-1, 3)
+
+    def __collapse_welded(self, data, codes, changed):
+        '''
+        Removes edges and faces made degenerate by welding, merges edges
+        which join the same pair of vertices and drops rows which have become
+        duplicates.
+
+        Args:
+            data (DataFrame): Welded data.
+            codes (numpy.ndarray): Vertex codes of rows before welding.
+            changed (numpy.ndarray): Whether vertex id of each row changed.
+
+        Returns:
+            DataFrame: Collapsed data.
+        '''
+        welded = pd.factorize(data.v_id)[0]
+        keep = np.ones(len(data), dtype=bool)
+        for col, size in [('e_id', 2), ('f_id', 3)]:
+            if col not in data.columns:
+                continue
+            index = ComponentIndex(data[col])
+            before = index.nunique(np.where(keep, codes, -1))
+            after = index.nunique(np.where(keep, welded, -1))
+            degenerate = (before >= size) & (after < size)
+            rows = index.codes >= 0
+            keep[rows] &= ~degenerate[index.codes[rows]]
+        data = data[keep]
+        changed = changed[keep]
+
+        if 'e_id' in data.columns:
+            index = ComponentIndex(data.e_id)
+            edges = DataFrame(dict(e=index.codes, v=data.v_id.values))
+            edges = edges[(edges.e >= 0) & edges.v.notnull()]
+            edges = edges.groupby('e').v.agg(['min', 'max', 'nunique'])
+            edges = edges[edges['nunique'] == 2].reset_index()
+            lowest = edges.groupby(['min', 'max']).e.transform('min')
+
+            lut = np.arange(index.size)
+            lut[edges.e.values] = lowest.values
+            rows = index.codes >= 0
+            changed[rows] |= lut[index.codes[rows]] != index.codes[rows]
+            values = take(index.ids[lut], index.codes, allow_fill=True)
+            values = Series(values, index=data.index)
+            data = data.assign(e_id=values.astype(data.e_id.dtype))
+
+        # duplicates keep unchanged rows first
+        cols = [f'{x}_id' for x in 'ifev' if f'{x}_id' in data.columns]
+        order = np.argsort(changed, kind='stable')
+        duplicated = np.zeros(len(data), dtype=bool)
+        duplicated[order] = data.iloc[order].duplicated(subset=cols).values
+        return data[~(duplicated & changed)]
+
+    def weld(self, tolerance=1e-6, return_mapping=False):
+        '''
+        Merges vertices which lie within a given distance of each other,
+        transitively (see hifive_tools.get_weld_clusters).
+
+        Each cluster of vertices takes the lowest vertex id and the
+        coordinates of that vertex. Then, edges which are left with a single
+        vertex and faces which are left with fewer than 3 vertices by welding
+        are removed, edges which now join the same pair of vertices take the
+        lowest of their edge ids, and rows which have become duplicates are
+        dropped. Vertices without coordinates are not welded.
+
+        Args:
+            tolerance (float, optional): Distance. Default: 1e-6.
+            return_mapping (bool, optional): Also return mapping of vertex \
+                ids. Default: False.
+
+        Raises:
+            ValidationError: If v_id, v_x, v_y or v_z column is not found.
+
+        Returns:
+            HiFive or tuple: self or self and Series of new vertex id \
+                indexed by old vertex id.
+        '''
+        columns = ['v_id', 'v_x', 'v_y', 'v_z']
+        missing = [x for x in columns if x not in self._get_columns()]
+        if missing != []:
+            msg = f'Weld requires columns: {missing}.'
+            raise ValidationError(msg)
+
+        validated = self._get_columns()
+        validated = list(filter(self._is_column_validated, validated))
+
+        ids, points = self.__get_vertex_points()
+        mask = ~np.isnan(points).any(axis=1)
+        clusters = np.arange(ids.size)
+        clusters[mask] = np.flatnonzero(mask)[
+            hft.get_weld_clusters(points[mask], tolerance)
+        ]
+        mapping = Series(ids[clusters], index=ids)
+
+        # rewrite vertex ids and coordinates of every row
+        data = self.data
+        codes = self._get_component_index('v_id').codes
+        rows = codes >= 0
+        changed = np.zeros(len(data), dtype=bool)
+        changed[rows] = clusters[codes[rows]] != codes[rows]
+
+        columns = {'v_id': take(ids[clusters], codes, allow_fill=True)}
+        for i, col in enumerate(['v_x', 'v_y', 'v_z']):
+            values = take(points[clusters, i], codes, allow_fill=True)
+            values = np.where(rows, values, data[col].to_numpy(np.float64))
+            values = Series(values, index=data.index)
+            columns[col] = values.astype(data[col].dtype)
+        data = data.assign(**columns)
+        data = self.__collapse_welded(data, codes, changed)
+
+        self.data = data
+        self._mark_columns_validated(
+            [x for x in validated if x in self._get_columns()]
+        )
+        if return_mapping:
+            return self, mapping
+        return self
+
     @property
     def info(self):
         '''
+        Memoized until data is modified.
+
         Returns:
             DataFrame: A DataFrame describing the universal attributes of all
             the columns of the internal DataFrame.
         '''
+        return self.__get_view(
+            'info', self.__get_info, self.__get_view_columns()
+        )
+
+    def __get_info(self):
+        '''
+        Computes info.
+
+        Returns:
+            DataFrame: Info.
+        '''
         info = []
-        for item in self.data.columns.tolist():
-            item = self._get_column_attributes(item)
-            item['dtype'] = HiFiveDataType\
-                .from_indicator(item['dtype_indicator']).fullname
-            item['ctype'] = HiFiveComponentType\
-                .from_indicator(item['ctype_indicator']).fullname
+        for column in self._get_columns():
+            schema = self.get_column_schema(column)
+            item = self._get_column_attributes(column)
+            item['dtype'] = schema.dtype.fullname
+            item['ctype'] = schema.ctype.fullname
             info.append(item)
 
         info = DataFrame(info)
@@ -544,8 +2129,11 @@ class HiFive():
             DataFrame: A DataFrame in which all columns are of item component
             type and each row contains a unique item id.
         '''
-        info = self.data.filter(axis=1, regex='^i_')
-        return info.groupby('i_id', as_index=False).first()
+        return self.__get_view(
+            'item_info',
+            lambda: self.__get_component_info('i'),
+            self.__get_view_columns('i'),
+        )
 
     @property
     def face_info(self):
@@ -554,8 +2142,11 @@ class HiFive():
             DataFrame: A DataFrame in which all columns are of face component
             type and each row contains a unique face id.
         '''
-        info = self.data.filter(axis=1, regex='^f_')
-        return info.groupby('f_id', as_index=False).first()
+        return self.__get_view(
+            'face_info',
+            lambda: self.__get_component_info('f'),
+            self.__get_view_columns('f'),
+        )
 
     @property
     def edge_info(self):
@@ -564,8 +2155,11 @@ class HiFive():
             DataFrame:  DataFrame in which all columns are of edge component
             type and each row contains a unique edge id.
         '''
-        info = self.data.filter(axis=1, regex='^e_')
-        return info.groupby('e_id', as_index=False).first()
+        return self.__get_view(
+            'edge_info',
+            lambda: self.__get_component_info('e'),
+            self.__get_view_columns('e'),
+        )
 
     @property
     def vertex_info(self):
@@ -574,12 +2168,39 @@ class HiFive():
             DataFrame: A DataFrame in which all columns are of vertex component
             type and each row contains a unique vertex id.
         '''
-        info = self.data.filter(axis=1, regex='^v_')
-        return info.groupby('v_id', as_index=False).first()
+        return self.__get_view(
+            'vertex_info',
+            lambda: self.__get_component_info('v'),
+            self.__get_view_columns('v'),
+        )
 
     @property
     def geometry_info(self):
         '''
+        Describes basic geometric and topological properties of the internal
+        data, see __get_geometry_info. Memoized until data is modified.
+
+        Returns:
+            DataFrame: A DataFrame that describes basic geometric and
+            topological properties of the internal data.
+        '''
+        columns = [
+            x for x in self._get_columns() if re.search('^[ifev]_id$', x)
+        ]
+        return self.__get_view(
+            'geometry_info', self.__get_geometry_info, columns
+        )
+
+    def __get_geometry_info(self):
+        '''
+        Describes basic geometric and topological properties of the internal
+        data. The topology_of face cell lists the polygon types found and the
+        polygon_sizes_of face cell is a histogram of the number of edges per
+        face, as a dict of edge count to face count.
+
+        Id columns are factorized once, via their cached ComponentIndexes, and
+        every count is computed once from their codes.
+
         Returns:
             DataFrame: A DataFrame that describes basic geometric and
             topological properties of the internal data.
@@ -588,97 +2209,211 @@ class HiFive():
         index = [x + 's_per' for x in cols]
         index.insert(0, 'count_of')
         index[-1] = 'vertices_per'
-        index.append('topology_of')
+        index.extend(['topology_of', 'polygon_sizes_of'])
         output = DataFrame(columns=cols, index=index)
 
-        output.loc['count_of', 'item'] = self.__get_nunique('i_id')
-        output.loc['count_of', 'face'] = self.__get_nunique('f_id')
-        output.loc['count_of', 'edge'] = self.__get_nunique('e_id')
-        output.loc['count_of', 'vertex'] = self.__get_nunique('v_id')
-
-        output.loc['items_per', 'item'] = 1
-        output.loc['faces_per', 'face'] = 1
-        output.loc['edges_per', 'edge'] = 1
-        output.loc['vertices_per', 'vertex'] = 1
-
-        output.loc['faces_per', 'item'] = self\
-            .__get_unique_counts('f_id', 'i_id')
-        output.loc['edges_per', 'item'] = self\
-            .__get_unique_counts('e_id', 'i_id')
-        output.loc['vertices_per', 'item'] = self\
-            .__get_unique_counts('v_id', 'i_id')
-
-        output.loc['edges_per', 'face'] = self\
-            .__get_unique_counts('e_id', 'f_id')
-        output.loc['vertices_per', 'face'] = self\
-            .__get_unique_counts('v_id', 'f_id')
-
-        output.loc['vertices_per', 'edge'] = self\
-            .__get_unique_counts('v_id', 'e_id')
-
-        temp = self.__get_unique_counts('e_id', 'f_id', False)
-        if temp == []:
+        ids = ['i_id', 'f_id', 'e_id', 'v_id']
+        rows = dict(zip(ids, index[1:]))
+        for col, id_ in zip(cols, ids):
+            output.loc['count_of', col] = self.__get_nunique(id_)
+            output.loc[rows[id_], col] = 1
+
+        counts = {}
+        for i, group in enumerate(ids[:-1]):
+            for col in ids[i + 1:]:
+                counts[(col, group)] = self.__get_unique_count_array(col, group)
+
+        for (col, group), values in counts.items():
+            output.loc[rows[col], cols[ids.index(group)]] = self\
+                .__summarize_unique_counts(values)
+
+        # number of edges per face
+        temp = counts[('e_id', 'f_id')]
+        if temp.size == 0:
             return output
 
         polygon_types = []
-        if 1 in temp or 2 in temp:
+        if (temp <= 2).any():
             polygon_types.append('invalid')
-        if 3 in temp:
+        if (temp == 3).any():
             polygon_types.append('triangle')
-        if 4 in temp:
+        if (temp == 4).any():
             polygon_types.append('quadrilateral')
-        if max(temp) >= 5:
+        if (temp >= 5).any():
             polygon_types.append('ngon')
         output.loc['topology_of', 'face'] = sorted(polygon_types)
 
+        sizes, faces = np.unique(temp, return_counts=True)
+        output.at['polygon_sizes_of', 'face'] = dict(
+            zip(sizes.tolist(), faces.tolist())
+        )
         return output
 
     @property
     def display_data(self):
         '''
         Drops _x_ columns from internal data which cause Jupyter Notebook to
-        chug.
+        chug. Other columns are shared with internal data, not copied.
 
         Returns:
             DataFrame: DataFrame with _x_ columns replaced with '...'.
         '''
-        data = DataFrame()
-        cols = self.data.columns.tolist()
-        x_cols = list(filter(lambda x: re.search('^._x_', x), cols))
-        nonx_cols = set(cols).difference(x_cols)
+        data = self.data.copy(deep=False)
+        for col in self.__get_x_columns():
+            data[col] = '...'
+        return data
+
+    def get_display_page(self, page=0, page_size=50):
+        '''
+        Gets a single page of display_data. Only the rows of the given page
+        are materialized and _x_ columns are never read.
+
+        Args:
+            page (int, optional): Page number. Default: 0.
+            page_size (int, optional): Number of rows per page. Default: 50.
+
+        Raises:
+            ValidationError: If page is negative or page_size is less than 1.
+
+        Returns:
+            DataFrame: Rows of page with _x_ columns replaced with '...'.
+        '''
+        if page < 0:
+            raise ValidationError(f'Page must be 0 or greater, found: {page}.')
+        if page_size < 1:
+            msg = f'Page size must be 1 or greater, found: {page_size}.'
+            raise ValidationError(msg)
 
-        for col in nonx_cols:
-            data[col] = self.data[col]
+        start = page * page_size
+        rows = slice(start, start + page_size)
+        cols = self._get_columns()
+        x_cols = self.__get_x_columns()
+        if self._tables is None:
+            positions = [i for i, x in enumerate(cols) if x not in x_cols]
+            output = self._data.iloc[rows, positions].copy()
+        else:
+            data = {
+                x: self._tables.get_column(x, rows=rows)
+                for x in cols if x not in x_cols
+            }
+            output = DataFrame(data)
         for col in x_cols:
-            data[col] = '...'
+            output[col] = '...'
+        return output[cols]
 
-        data = data[cols]
-        return data
+    def _repr_html_(self):
+        '''
+        Renders the first page of display_data in Jupyter Notebook.
+
+        Returns:
+            str: HTML.
+        '''
+        page_size = pd.get_option('display.max_rows') or 50
+        output = self.get_display_page(page_size=page_size).to_html()
+        rows = self.__get_row_count()
+        cols = len(self._get_columns())
+        return output + f'<p>{rows} rows × {cols} columns</p>'
+
+    def __get_row_count(self):
+        '''
+        Returns:
+            int: Number of rows, without materializing normalized data.
+        '''
+        if self._tables is not None:
+            return self._tables.size
+        return len(self._data)
 
-    def __get_unique_counts(self, count_column, group_column, summarize=True):
+    def __get_x_columns(self):
+        '''
+        Returns:
+            list: Names of _x_ columns.
+        '''
+        return [x for x in self._get_columns() if re.search('^._x_', x)]
+
+    def __get_component_info(self, ctype):
+        '''
+        Convenience method for creating a DataFrame of the first non-null values
+        of all columns of a given component type per component id.
+
+        Args:
+            ctype (str): Component type indicator.
+
+        Returns:
+            DataFrame: Component info.
+        '''
+        id_col = f'{ctype}_id'
+        index = self._get_component_index(id_col)
+        cols = [x for x in self._get_columns() if x.startswith(f'{ctype}_')]
+        cols = [id_col] + [x for x in cols if x != id_col]
+
+        data = {id_col: index.ids}
+        for col in cols[1:]:
+            values = None
+            if self._tables is not None:
+                values = self._tables.get_component_values(col)
+            if values is None:
+                values = index.first(self._get_column(col))
+            data[col] = values
+        return DataFrame(data, columns=cols)
+
+    def _get_component_index(self, column):
+        '''
+        Gets the ComponentIndex of a given column. Indexes are built on first
+        use and cached until the column's data is replaced or edited in place,
+        as detected by its checksum, see _get_column_checksum.
+
+        Args:
+            column (str): Column name, usually an id column.
+
+        Returns:
+            ComponentIndex: Index of column.
+        '''
+        checksum = self._get_column_checksum(column)
+        if column in self._indexes:
+            old_checksum, index = self._indexes[column]
+            if old_checksum == checksum:
+                return index
+
+        # normalized data already indexes its id columns
+        index = None
+        if self._tables is not None and column == f'{column[0]}_id':
+            index = self._tables.get_index(column[0])
+        if index is None:
+            index = ComponentIndex(self._get_column(column))
+        self._indexes[column] = (checksum, index)
+        return index
+
+    def __get_unique_count_array(self, count_column, group_column):
         '''
         Convenience method for calculating the unique counts of a count column,
-        per a group column.
+        per a group column, from their cached ComponentIndexes.
 
         Args:
             count_column (str): Column to get unique counts of.
             group_column (str): Column to group x by.
-            summarize (bool, optional): Converts results into list of \
-                [1,2,3,4,n]. Default: True
 
         Returns:
-            list: list of unique counts.
+            numpy.ndarray: Unique counts, per group with any non-null values.
         '''
-        items = hft.get_nunique_a_per_b(
-            self.data, count_column, group_column
-        )
-        items = sorted(list(set(items)))
-        if not summarize:
-            return items
+        codes = self._get_component_index(count_column).codes
+        counts = self._get_component_index(group_column).nunique(codes)
+
+        # components without any non-null count values are ignored
+        return counts[counts > 0]
+
+    def __summarize_unique_counts(self, counts):
+        '''
+        Convenience method for summarizing unique counts, per group, into a
+        sorted list of the distinct counts, with counts >= 5 replaced by 'n'.
 
-        # replace everything >= 5 with 'n'
+        Args:
+            counts (numpy.ndarray): Unique counts per group.
+
+        Returns:
+            list: Summary, such as [1, 2, 3, 4, 'n'].
+        '''
         output = []
-        for i in items:
+        for i in np.unique(counts).tolist():
             if i >= 5:
                 output.append('n')
                 break
@@ -696,13 +2431,52 @@ class HiFive():
         Returns:
             list: list of unique values.
         '''
-        return self.data[column].dropna().nunique()
+        return self._get_component_index(column).size
+
+    def fingerprint(self, ignore_columns=[]):
+        '''
+        Generates a content hash of the internal data which does not depend on
+        the order of its rows or columns. Numeric values are hashed as floats,
+        so 1 and 1.0 hash the same, and values which cannot be hashed
+        faithfully, such as lists in optional columns, are hashed by their
+        repr. For example:
+
+        ::
+
+            if hi.fingerprint() in known_fingerprints:
+                ...
+
+        Args:
+            ignore_columns (list, optional): Columns to exempt from hash.
+
+        Returns:
+            str: Hex digest.
+        '''
+        columns = sorted(self._get_columns())
+        columns = [x for x in columns if x not in ignore_columns]
+
+        data = {}
+        for col in columns:
+            series = self._get_column(col)
+            hashable = hft.to_hashable_series(series)
+            if hashable is None:
+                hashable = series.map(repr).reset_index(drop=True)
+            data[col] = hashable
+        data = DataFrame(data, columns=columns)
+
+        total = hft.get_multiset_hash(data)
+        output = json.dumps([columns, data.shape[0], total])
+        return hashlib.blake2b(output.encode(), digest_size=16).hexdigest()
 
     def is_equivalent(self, hifive, ignore_columns=[]):
         '''
         Determines if this HiFive instance equivalent to a given HiFive
         instance.
 
+        Shapes and columns are compared first, then order insensitive hashes of
+        the rows of both instances (see fingerprint). Only if those match are
+        both instances sorted and compared element by element.
+
         Ignore columns is currently needed for "e_id" because Blender screws up
         the edge ordering.
 
@@ -713,26 +2487,40 @@ class HiFive():
         Returns:
             bool: Equivalence of instances.
         '''
-        a_data = self.data
-        b_data = hifive.data
-
-        a_cols = sorted(a_data.columns.tolist())
-        b_cols = sorted(b_data.columns.tolist())
+        a_cols = sorted(self._get_columns())
+        b_cols = sorted(hifive._get_columns())
 
         # TODO: Remove this once Blender edge ordering is figured out.
         a_cols = list(filter(lambda x: x not in ignore_columns, a_cols))
         b_cols = list(filter(lambda x: x not in ignore_columns, b_cols))
-        a_data = a_data[a_cols]
-        b_data = b_data[b_cols]
 
         # both have the same shape
-        if a_data.shape != b_data.shape:
+        a_rows = len(self._get_column(a_cols[0])) if a_cols else 0
+        b_rows = len(hifive._get_column(b_cols[0])) if b_cols else 0
+        if (a_rows, len(a_cols)) != (b_rows, len(b_cols)):
             return False
 
         # both have the same columns
         if a_cols != b_cols:
             return False
 
+        # equal rows have equal hashes, columns which cannot be hashed
+        # faithfully are left to the full comparison
+        a_hashes = {}
+        b_hashes = {}
+        for col in a_cols:
+            a = hft.to_hashable_series(self._get_column(col))
+            b = hft.to_hashable_series(hifive._get_column(col))
+            if a is not None and b is not None:
+                a_hashes[col] = a
+                b_hashes[col] = b
+        a_hash = hft.get_multiset_hash(DataFrame(a_hashes))
+        b_hash = hft.get_multiset_hash(DataFrame(b_hashes))
+        if a_hash != b_hash:
+            return False
+
+        a_data = self.data[a_cols]
+        b_data = hifive.data[b_cols]
         a_data = a_data.sort_values(a_cols)
         b_data = b_data.sort_values(a_cols)
 
@@ -745,3 +2533,108 @@ class HiFive():
                 return False
 
         return True
+
+    def diff(self, hifive):
+        '''
+        Finds the components which differ between this HiFive instance and a
+        given HiFive instance, such as an edited version of it.
+
+        A component is compared by the set of its distinct rows, restricted to
+        the columns of its own and contained component types. So, a face is
+        modified if any of its face, edge or vertex data is, but not if its
+        item data is. Components are matched by id. For example:
+
+        ::
+
+            diff = before.diff(after)
+            faces = diff.loc['modified', 'face'] + diff.loc['added', 'face']
+
+        Args:
+            hifive (HiFive): HiFive instance to be compared.
+
+        Returns:
+            DataFrame: DataFrame with added, removed and modified rows and \
+                item, face, edge and vertex columns, each cell a sorted list \
+                of ids. Added ids are those only found in given instance.
+        '''
+        ctypes = ['i', 'f', 'e', 'v']
+        cols = [HiFiveComponentType.from_indicator(x).fullname for x in ctypes]
+        output = DataFrame(columns=cols, index=['added', 'removed', 'modified'])
+
+        a_hashes = self.__get_column_hashes()
+        b_hashes = hifive.__get_column_hashes()
+        for ctype, col in zip(ctypes, cols):
+            a_ids, a_sums = self.__get_component_hashes(ctype, a_hashes)
+            b_ids, b_sums = hifive.__get_component_hashes(ctype, b_hashes)
+
+            _, a_pos, b_pos = np.intersect1d(
+                a_ids, b_ids, assume_unique=True, return_indices=True
+            )
+            modified = a_ids[a_pos][a_sums[a_pos] != b_sums[b_pos]]
+            added = b_ids[~np.isin(b_ids, a_ids)]
+            removed = a_ids[~np.isin(a_ids, b_ids)]
+
+            output.at['added', col] = added.tolist()
+            output.at['removed', col] = removed.tolist()
+            output.at['modified', col] = modified.tolist()
+        return output
+
+    def __get_column_hashes(self):
+        '''
+        Convenience method for hashing the elements of each column with a valid
+        component type, salted with the column name.
+
+        Returns:
+            dict: Column names and uint64 hash arrays.
+        '''
+        output = {}
+        for col in self._get_columns():
+            ctype = str(col).split('_')[0]
+            if HiFiveComponentType.is_valid_indicator(ctype):
+                salt = hft.hash_series(Series([col]))[0]
+                output[col] = hft.hash_series(self._get_column(col)) ^ salt
+        return output
+
+    def __get_component_hashes(self, ctype, hashes):
+        '''
+        Convenience method for hashing each component of a given component type
+        by the sum of its distinct row hashes, over the columns of its own and
+        contained component types.
+
+        Args:
+            ctype (str): Component type indicator.
+            hashes (dict): Column hashes, see __get_column_hashes.
+
+        Returns:
+            tuple: Sorted array of component ids and array of their hashes.
+        '''
+        id_col = f'{ctype}_id'
+        if id_col not in hashes:
+            return np.array([]), np.array([], dtype=np.uint64)
+
+        order = HiFiveComponentType.from_indicator(ctype).order
+        rows = np.zeros(len(hashes[id_col]), dtype=np.uint64)
+        for col in sorted(hashes.keys()):
+            other = HiFiveComponentType.from_indicator(col.split('_')[0])
+            if other.order >= order:
+                rows = rows * np.uint64(1000003) ^ hashes[col]
+
+        # sort rows by component and drop repeated rows of a component
+        index = self._get_component_index(id_col)
+        mask = index.codes >= 0
+        codes = index.codes[mask]
+        rows = rows[mask]
+        sort = np.lexsort((rows, codes))
+        codes = codes[sort]
+        rows = rows[sort]
+        keep = np.ones(codes.size, dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes = codes[keep]
+        rows = rows[keep]
+
+        # every component has rows, so starts align with ids
+        sums = np.array([], dtype=np.uint64)
+        if codes.size > 0:
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+            sums = np.add.reduceat(rows, starts)
+        return index.ids, sums
@@ -5,11 +5,15 @@ import re
 
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 import pytest
 
-from shot_glass.hifive.hifive import HiFive, HiFiveDataType
+from shot_glass.hifive.hifive import (
+    HiFive, HiFiveComponentType, HiFiveDataType
+)
 from shot_glass.hifive.test_base import HiFiveTestBase
 from shot_glass.core.tools import ValidationError
+import shot_glass.hifive.hifive_tools as hft
 # ------------------------------------------------------------------------------
 
 
@@ -51,6 +55,185 @@ class HiFiveTest(HiFiveTestBase):
         result = hi.data.shape[0]
         self.assertEqual(result, 0)
 
+    def test_compact(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        hi.data['f_id'] = hi.data.f_id.astype(float)
+        hi.data.loc[0, 'e_id'] = np.nan
+        expected = hi.data.copy()
+
+        hi.compact()
+        result = [str(hi.data[x].dtype) for x in hi.data.columns]
+        expected_dtypes = ['uint8', 'uint8', 'UInt8', 'uint8']
+        expected_dtypes += ['float64'] * 3
+        self.assertEqual(result, expected_dtypes)
+        for col in expected.columns:
+            self.assertEqual(
+                hi.data[col].dropna().tolist(), expected[col].dropna().tolist()
+            )
+        hi.validate()
+
+        hi.compact(coordinates=True)
+        result = [str(hi.data[x].dtype) for x in ['v_x', 'v_y', 'v_z']]
+        self.assertEqual(result, ['float32'] * 3)
+        hi.validate()
+
+        hi.map('v_x', 'f_f_foo', 'mean')
+        hi.map('v_id', 'f_i_foo', 'nunique')
+        self.assertEqual(hi.face_info.f_i_foo.tolist(), [2, 5, 3])
+
+    def test_compact_mode(self):
+        hi = HiFive(compact=True, compact_coordinates=True)
+        hi.data = self.fake_data
+        self.assertEqual(hi.data.v_id.dtype, np.uint8)
+        self.assertEqual(hi.data.v_x.dtype, np.float32)
+
+        hi.data['v_x_foo'] = [[1, 2]] * hi.data.shape[0]
+        hi.expand('v_x_foo', 'v_i_foo', 'v_i_foo_id', lambda x: x)
+        self.assertEqual(hi.data.v_id.dtype, np.uint8)
+
+        result = hi.copy()
+        self.assertEqual(result.data.v_x.dtype, np.float32)
+
+        # ids which cannot be cast are left as they are
+        data = self.fake_data.copy()
+        data['f_id'] = data.f_id.astype(float)
+        data.loc[data.index[0], 'f_id'] = np.inf
+        hi.data = data
+        self.assertEqual(hi.data.f_id.dtype, np.float64)
+        self.assertEqual(hi.data.v_id.dtype, np.uint8)
+
+        hi = HiFive(compact=True)
+        hi.data = self.get_quadrilateral_data()
+        self.assertEqual(hi.data.v_id.dtype, np.uint8)
+        self.assertEqual(hi.data.v_x.dtype, np.float64)
+
+    def test_normalized_mode(self):
+        data = self.get_multi_data()
+        data['v_s_name'] = data.v_id.astype(str)
+        hi = HiFive(normalized=True)
+        hi.data = data
+        self.assertTrue(hi.data.equals(data))
+        self.assertIn('v_x', hi._tables.tables['v'])
+        self.assertIn('v_s_name', hi._tables.tables['v'])
+        hi.validate()
+
+        expected = HiFive()
+        expected.data = data.copy()
+        expected.validate()
+
+        for hifive in [hi, expected]:
+            hifive.map('v_x', 'f_f_x_mean', 'mean')
+            hifive.map('f_f_x_mean', 'v_f_x_mean', 'first')
+            hifive.map_many({
+                'i_i_count': ('v_id', 'nunique'),
+                'e_s_names': ('v_s_name', lambda x: '-'.join(x)),
+            })
+        self.assertIn('f_f_x_mean', hi._tables.tables['f'])
+        self.assertIn('i_i_count', hi._tables.tables['i'])
+        self.assertIn('v_f_x_mean', hi._tables.tables['v'])
+        self.assertTrue(hi.data.equals(expected.data))
+        for attr in ['face_info', 'vertex_info', 'geometry_info', 'info']:
+            self.assertTrue(getattr(hi, attr).equals(getattr(expected, attr)))
+
+        columns = list(hi._validated.keys())
+        self.assertTrue(all(map(hi._is_column_validated, columns)))
+
+        result = hi.copy()
+        self.assertTrue(result._normalized)
+        self.assertTrue(result._is_column_validated('f_f_x_mean'))
+        result.map('v_x', 'f_f_x_mean', 'max')
+        self.assertTrue(hi.data.equals(expected.data))
+
+        for hifive in [hi, expected]:
+            hifive.data = hifive.data.assign(v_f_x=hifive.data.v_x)
+            hifive.expand('v_f_x', 'v_f_x', 'v_i_x_id', lambda x: [x, x])
+        self.assertTrue(hi.data.equals(expected.data))
+
+        # columns set on normalized data are written back
+        for hifive in [hi, expected]:
+            hifive.data['f_s_x'] = 'a'
+            hifive.data['v_x'] = hifive.data.v_x + 1
+            del hifive.data['v_f_x']
+            hifive.map('v_x', 'f_f_x_min', 'min')
+        self.assertIn('f_s_x', hi._get_columns())
+        self.assertNotIn('v_f_x', hi._get_columns())
+        self.assertTrue(hi.data.equals(expected.data))
+
+    def test_normalized_compact_mode(self):
+        hi = HiFive(compact=True, normalized=True)
+        hi.data = self.get_quadrilateral_data()
+        self.assertEqual(hi.data.v_id.dtype, np.uint8)
+        self.assertIn('v_x', hi._tables.tables['v'])
+
+        hi.compact(coordinates=True)
+        self.assertEqual(hi.data.v_x.dtype, np.float32)
+        for col in ['v_x', 'v_y', 'v_z']:
+            self.assertEqual(hi._tables.tables['v'][col].dtype, np.float32)
+            self.assertNotIn(col, hi._tables.relation)
+
+    def test_from_arrays(self):
+        vertices = np.array([
+            [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]
+        ])
+        offsets = np.array([0, 4, 7])
+        indices = np.array([0, 1, 2, 3, 1, 4, 2])
+        hi = HiFive().from_arrays(vertices, offsets, indices, [5, 6])
+        data = hi.data
+
+        self.assertEqual(data.shape[0], 14)
+        self.assertEqual(data.i_id.tolist(), [5] * 8 + [6] * 6)
+        self.assertEqual(data.f_id.tolist(), [0] * 8 + [1] * 6)
+        self.assertEqual(
+            data.v_id.tolist(), [0, 1, 1, 2, 2, 3, 3, 0, 1, 4, 4, 2, 2, 1]
+        )
+        self.assertEqual(
+            data.v_i_draw_order.tolist(),
+            [0, 1, 1, 2, 2, 3, 3, 0, 0, 1, 1, 2, 2, 0]
+        )
+        self.assertEqual(data.v_x.tolist(), vertices[data.v_id, 0].tolist())
+
+        # edge 1-2 is shared by both faces
+        self.assertEqual(hi.geometry_info.loc['count_of', 'edge'], 6)
+        self.assertEqual(data.e_id.iloc[2], data.e_id.iloc[-2])
+        self.assertEqual(
+            hi.geometry_info.loc['topology_of', 'face'],
+            ['quadrilateral', 'triangle']
+        )
+
+    def test_from_arrays_invalid(self):
+        vertices = np.zeros((3, 3))
+        with pytest.raises(ValidationError):
+            HiFive().from_arrays(np.zeros((3, 2)), [0, 3], [0, 1, 2])
+        with pytest.raises(ValidationError):
+            HiFive().from_arrays(vertices, [0, 2], [0, 1, 2])
+        with pytest.raises(ValidationError):
+            HiFive().from_arrays(vertices, [0, 3], [0, 1, 3])
+        with pytest.raises(ValidationError):
+            HiFive().from_arrays(vertices, [0, 3], [0, 1, 2], [0, 1])
+
+    def test_to_arrays(self):
+        vertices = np.random.rand(5, 3)
+        offsets = np.array([0, 3, 7, 10])
+        indices = np.array([2, 0, 1, 1, 4, 3, 0, 4, 2, 3])
+        hi = HiFive().from_arrays(vertices, offsets, indices, [0, 1, 1])
+
+        result = hi.to_arrays()
+        self.assertTrue(np.array_equal(result[0], vertices))
+        self.assertTrue(np.array_equal(result[1], offsets))
+        self.assertTrue(np.array_equal(result[2], indices))
+        self.assertEqual(result[3].tolist(), [0, 1, 1])
+        self.assertTrue(result[0].flags['C_CONTIGUOUS'])
+
+        # without draw order, rows are kept in order
+        data = self.get_quadrilateral_data()
+        hi = HiFive()
+        hi.data = data.iloc[::-1]
+        _, offsets, indices, item_ids = hi.to_arrays()
+        self.assertEqual(offsets.tolist(), [0, 4])
+        self.assertEqual(indices.tolist(), [0, 3, 2, 1])
+        self.assertEqual(item_ids.tolist(), [0])
+
     def test_read_hi5(self):
         with TemporaryDirectory() as temp:
             target = os.path.join(temp, 'foo.hi5')
@@ -86,12 +269,249 @@ class HiFiveTest(HiFiveTestBase):
                 expected = data[col].tolist()
                 self.assertEqual(result, expected)
 
+    def test_write_hi5_table(self):
+        data = self.fake_data
+        hi = HiFive()
+        hi.data = data
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.hi5')
+            hi.write_hi5(target, format='table')
+
+            result = HiFive().read_hi5(target)
+            self.assertTrue(result.data.equals(data))
+
+            cols = ['f_id', 'v_x']
+            result = HiFive().read_hi5(target, columns=cols, where='f_id == 1')
+            expected = data.loc[data.f_id == 1, cols]
+            self.assertTrue(result.data.equals(expected))
+
+            with pytest.raises(ValidationError) as e:
+                hi.write_hi5(target, format='foo')
+            expected = 'Format must be fixed or table, found: foo.'
+            self.assertEqual(str(e.value), expected)
+
+    def test_read_hi5_fixed(self):
+        data = self.fake_data
+        hi = HiFive()
+        hi.data = data
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.hi5')
+            hi.write_hi5(target)
+
+            result = HiFive().read_hi5(target, columns=['v_id', 'v_z'])
+            self.assertTrue(result.data.equals(data[['v_id', 'v_z']]))
+
+            with pytest.raises(ValidationError) as e:
+                HiFive().read_hi5(target, where='f_id == 1')
+            expected = 'Where requires a hi5 file written in table format.'
+            self.assertEqual(str(e.value), expected)
+
+    def test_write_hi5_append(self):
+        data = self.get_multi_data().reset_index(drop=True)
+        hi = HiFive()
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.hi5')
+            for _, chunk in data.groupby('f_id'):
+                hi.data = chunk
+                hi.write_hi5(target, format='table', append=True)
+
+            result = HiFive().read_hi5(target)
+            self.assertTrue(result.data.equals(data))
+
+            with pytest.raises(ValidationError) as e:
+                hi.write_hi5(target, append=True)
+            self.assertEqual(str(e.value), 'Append requires table format.')
+
+    def get_item_data(self):
+        data = self.get_multi_data().reset_index(drop=True)
+        data['i_id'] = data.f_id.astype('Int64')
+        data.loc[19, 'i_id'] = None
+        return data
+
+    def test_iter_items(self):
+        data = self.get_item_data()
+        with TemporaryDirectory() as temp:
+            hi = HiFive()
+            hi.data = data
+            targets = [
+                os.path.join(temp, 'foo.parquet'),
+                os.path.join(temp, 'foo.hi5m'),
+            ]
+            hi.write_parquet(targets[0])
+            hi.write_mmap(targets[1])
+
+            hi.data = data.dropna(subset=['i_id']).astype({'i_id': int})
+            targets.append(os.path.join(temp, 'foo.hi5'))
+            hi.write_hi5(targets[-1], format='table')
+
+            # hi5 data has no row without an item id
+            for target, batches in zip(targets, [4, 4, 3]):
+                result = list(HiFive.iter_items(target))
+                self.assertEqual(len(result), batches)
+                for item in result[:3]:
+                    self.assertIsInstance(item, HiFive)
+                    self.assertEqual(item.data.i_id.nunique(), 1)
+                self.assertEqual(result[1].data.i_id.tolist(), [1] * 10)
+
+                result = list(HiFive.iter_items(
+                    target, batch_items=2, columns=['i_id', 'v_x']
+                ))
+                self.assertEqual(len(result[0].data), 14)
+                self.assertEqual(
+                    result[0].data.columns.tolist(), ['i_id', 'v_x']
+                )
+
+            # batches keep the index of their rows
+            for target in targets[:2]:
+                result = list(HiFive.iter_items(target))
+                self.assertTrue(result[-1].data.equals(data.iloc[[19]]))
+                self.assertEqual(result[0].data.index.tolist(), list(range(4)))
+
+    def test_iter_items_invalid(self):
+        with pytest.raises(ValidationError) as e:
+            next(HiFive.iter_items('foo.hi5', batch_items=0))
+        expected = 'Batch items must be 1 or greater, found: 0.'
+        self.assertEqual(str(e.value), expected)
+
+        with pytest.raises(ValidationError) as e:
+            next(HiFive.iter_items('foo.json'))
+        expected = "Expected extension: ['hi5', 'hi5m', 'parquet'], "
+        expected += 'found: json.'
+        self.assertEqual(str(e.value), expected)
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.hi5')
+            hi = HiFive()
+            hi.data = self.fake_data
+            hi.write_hi5(target)
+            with pytest.raises(ValidationError) as e:
+                next(HiFive.iter_items(target))
+            expected = 'Iteration requires a hi5 file written in table format.'
+            self.assertEqual(str(e.value), expected)
+
     def test_write_hi5_invalid_extension(self):
         with pytest.raises(ValidationError) as e:
             HiFive().write_hi5('foo.bar')
         self.assertEqual(e.type, ValidationError)
         self.assertEqual(str(e.value), 'Expected extension: hi5, found: bar.')
 
+    def test_write_parquet(self):
+        data = self.fake_data
+        hi = HiFive()
+        hi.data = data
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.parquet')
+            hi.write_parquet(target, compression='zstd')
+            result = HiFive().read_parquet(target)
+            self.assertTrue(result.data.equals(data))
+
+            cols = ['v_x', 'v_y', 'v_z', 'f_id']
+            result = HiFive().read_parquet(target, columns=cols)
+            self.assertTrue(result.data.equals(data[cols]))
+
+            with pytest.raises(ValidationError) as e:
+                HiFive().read_parquet(target, columns=['foo'])
+            self.assertEqual(str(e.value), 'foo is not a valid column name.')
+
+    def test_write_parquet_row_groups(self):
+        data = self.get_item_data()
+        data = data.iloc[::-1]
+        hi = HiFive()
+        hi.data = data
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.parquet')
+            hi.write_parquet(target, row_group_size=4)
+
+            # row groups hold whole items, with null items last
+            meta = pq.ParquetFile(target).metadata
+            result = [
+                meta.row_group(i).num_rows
+                for i in range(meta.num_row_groups)
+            ]
+            self.assertEqual(result, [4, 10, 5, 1])
+
+            result = HiFive().read_parquet(target).data
+            self.assertEqual(result.i_id.tolist()[:5], [0] * 4 + [1])
+            self.assertTrue(result.sort_index().equals(data.sort_index()))
+
+            result = list(HiFive.iter_items(target, batch_items=2))
+            self.assertEqual([len(x.data) for x in result], [14, 5, 1])
+            self.assertTrue(result[0].data.equals(data.loc[result[0].data.index]))
+
+    def test_parquet_invalid_extension(self):
+        with pytest.raises(ValidationError) as e:
+            HiFive().read_parquet('foo.bar')
+        expected = 'Expected extension: parquet, found: bar.'
+        self.assertEqual(str(e.value), expected)
+
+        with pytest.raises(ValidationError) as e:
+            HiFive().write_parquet('foo.bar')
+        self.assertEqual(str(e.value), expected)
+
+    def test_write_feather(self):
+        data = self.fake_data
+        hi = HiFive()
+        hi.data = data
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.feather')
+            hi.write_feather(target)
+            result = HiFive().read_feather(target, use_threads=False)
+            expected = data.reset_index(drop=True)
+            self.assertTrue(result.data.equals(expected))
+
+            cols = ['v_x', 'v_y', 'v_z', 'f_id']
+            result = HiFive().read_feather(target, columns=cols)
+            self.assertTrue(result.data.equals(expected[cols]))
+
+            with pytest.raises(ValidationError):
+                HiFive().read_feather(target, columns='v_x')
+
+        with pytest.raises(ValidationError) as e:
+            HiFive().write_feather('foo.bar')
+        expected = 'Expected extension: feather, found: bar.'
+        self.assertEqual(str(e.value), expected)
+
+    def test_write_mmap(self):
+        data = self.fake_data.copy()
+        data['f_s_name'] = 'foo'
+        data['v_f_weight'] = pd.array([0.5] * (len(data) - 1) + [None])
+        hi = HiFive()
+        hi.data = data
+
+        with TemporaryDirectory() as temp:
+            target = os.path.join(temp, 'foo.hi5m')
+            hi.write_mmap(target)
+            self.assertTrue(os.path.exists(os.path.join(target, 'v_x.npy')))
+            self.assertTrue(os.path.exists(os.path.join(target, 'f_s_name.pkl')))
+            self.assertFalse(
+                os.path.exists(os.path.join(target, 'schema.json.temp'))
+            )
+
+            result = HiFive().read_mmap(target)
+            self.assertTrue(result.data.equals(data))
+            self.assertIsInstance(result.data.v_x.values, np.memmap)
+
+            # copy-on-write maps never modify files
+            result.data.loc[result.data.index[0], 'v_x'] = 99.0
+            result = HiFive().read_mmap(target, columns=['v_id', 'v_x'])
+            self.assertTrue(result.data.equals(data[['v_id', 'v_x']]))
+
+            hi.data = data.reset_index(drop=True)
+            hi.write_mmap(target)
+            result = HiFive().read_mmap(target)
+            self.assertIsInstance(result.data.index, pd.RangeIndex)
+            self.assertTrue(result.data.equals(hi.data))
+
+        with pytest.raises(ValidationError) as e:
+            HiFive().write_mmap('foo.bar')
+        self.assertEqual(str(e.value), 'Expected extension: hi5m, found: bar.')
+
     def test_validate_column(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -161,6 +581,57 @@ class HiFiveTest(HiFiveTestBase):
             hi.validate()
             self.assertEqual(e.type, TypeError)
 
+    def test_validate_incremental(self):
+        hi = HiFive()
+        hi.data = self.fake_data
+        hi.data['v_s_foo'] = 'foo'
+        hi.validate()
+        expected = hi.data.columns.tolist()
+        self.assertEqual(sorted(hi._validated.keys()), sorted(expected))
+
+        # in-place edits of columns not validated by dtype are always seen
+        hi.data.loc[1, 'v_s_foo'] = 99
+        with pytest.raises(TypeError) as e:
+            hi.validate()
+        expected = 'Non-string value found in column v_s_foo at index 1: 99'
+        self.assertEqual(str(e.value), expected)
+
+        # replaced columns are always revalidated
+        hi.data['v_s_foo'] = 'foo'
+        hi.validate()
+        hi.data['v_s_foo'] = 99
+        with pytest.raises(TypeError):
+            hi.validate()
+
+        del hi.data['v_s_foo']
+        hi.validate()
+        self.assertNotIn('v_s_foo', hi._validated)
+
+        # integer columns of object dtype are not validated by dtype either
+        hi.data['v_i_foo'] = hi.data.v_id.astype(object)
+        hi.validate()
+        hi.data.loc[1, 'v_i_foo'] = 0.5
+        with pytest.raises(TypeError):
+            hi.validate()
+
+    def test_is_column_validated(self):
+        hi = HiFive()
+        hi.data = self.fake_data
+        self.assertFalse(hi._is_column_validated('v_id'))
+
+        hi.validate_column('v_id')
+        self.assertTrue(hi._is_column_validated('v_id'))
+
+        hi.data['v_id'] = hi.data.v_id + 1
+        self.assertFalse(hi._is_column_validated('v_id'))
+
+        hi._mark_columns_validated(['v_id'])
+        self.assertTrue(hi._is_column_validated('v_id'))
+
+        result = hi.copy()
+        self.assertTrue(result._is_column_validated('v_id'))
+        self.assertFalse(result._is_column_validated('v_x'))
+
     def test_get_column_attributes(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -197,6 +668,29 @@ class HiFiveTest(HiFiveTestBase):
         )
         self.assertEqual(result, expected)
 
+    def test_get_column_schema(self):
+        result = HiFive.get_column_schema('f_s_foo_bar')
+        self.assertEqual(result.name, 'f_s_foo_bar')
+        self.assertEqual(result.descriptor, 'foo_bar')
+        self.assertEqual(result.ctype, HiFiveComponentType.FACES)
+        self.assertEqual(result.dtype, HiFiveDataType.STRING)
+        self.assertEqual(result.validator(pd.Series(['a', 1])), (1, 1))
+        self.assertIs(HiFive().get_column_schema('f_s_foo_bar'), result)
+        with pytest.raises(AttributeError):
+            result.dtype = HiFiveDataType.FLOAT
+
+        result = HiFive.get_column_schema('v_id')
+        self.assertEqual(result.descriptor, 'id')
+        self.assertEqual(result.dtype, HiFiveDataType.INTEGER)
+
+        result = HiFive.get_column_schema('v_x')
+        self.assertEqual(result.ctype, HiFiveComponentType.VERTICES)
+        self.assertEqual(result.dtype, HiFiveDataType.FLOAT)
+
+        with pytest.raises(ValidationError) as e:
+            HiFive.get_column_schema('foo_bar')
+        self.assertEqual(str(e.value), 'foo_bar is not a valid column name.')
+
     def test_validate_column_name(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -238,7 +732,38 @@ class HiFiveTest(HiFiveTestBase):
         hi.data.loc[1, 'v_i_foo'] = 'bar'
         with pytest.raises(TypeError) as e:
             hi._validate_column_values('v_i_foo')
-        expected = 'Non-integer value found in column v_i_foo: bar'
+        expected = 'Non-integer value found in column v_i_foo at index 1: bar'
+        self.assertEqual(str(e.value), expected)
+
+    def test_validate_column_values_dtypes(self):
+        hi = HiFive()
+        hi.data = self.fake_data
+
+        hi.data['v_i_foo'] = pd.array([1, None] * 4, dtype='Int64')
+        hi._validate_column_values('v_i_foo')
+
+        hi.data['v_i_foo'] = hi.data.v_id.astype('uint8')
+        hi._validate_column_values('v_i_foo')
+
+        hi.data['v_f_foo'] = hi.data.v_x.astype('float32')
+        hi._validate_column_values('v_f_foo')
+
+        hi.data['v_f_foo'] = pd.array([1.0, None] * 4, dtype='Float64')
+        hi._validate_column_values('v_f_foo')
+
+        hi.data['v_s_foo'] = pd.array(['a', None] * 4, dtype='string')
+        hi._validate_column_values('v_s_foo')
+
+        hi.data['v_f_foo'] = pd.Series([np.nan] * 7 + [1], dtype=object)
+        with pytest.raises(TypeError) as e:
+            hi._validate_column_values('v_f_foo')
+        expected = 'Non-float value found in column v_f_foo at index 7: 1'
+        self.assertEqual(str(e.value), expected)
+
+        hi.data['v_j_foo'] = ['{"a": 1}'] * 5 + ['{'] * 3
+        with pytest.raises(TypeError) as e:
+            hi._validate_column_values('v_j_foo')
+        expected = 'Non-json value found in column v_j_foo at index 5: {'
         self.assertEqual(str(e.value), expected)
 
     def test_map_has_nans(self):
@@ -301,6 +826,103 @@ class HiFiveTest(HiFiveTestBase):
         result = hi.data['v_f_foo'].tolist()
         self.assertEqual(result, expected)
 
+    def test_map_reducers(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+
+        lut = dict(
+            count=lambda x: float(x.count()),
+            first=lambda x: x.iloc[0],
+            max=lambda x: x.max(),
+            mean=lambda x: x.mean(),
+            min=lambda x: x.min(),
+            nunique=lambda x: float(x.nunique()),
+        )
+        for reducer, func in lut.items():
+            hi.map('v_x', 'f_f_foo', func)
+            expected = hi.data.f_f_foo.tolist()
+            hi.map('v_x', 'f_f_foo', reducer)
+            result = hi.data.f_f_foo.tolist()
+            self.assertEqual(result, expected)
+
+        hi.map('v_x', 'f_f_foo', np.add)
+        expected = hi.data.groupby('f_id').v_x.transform('sum').tolist()
+        self.assertEqual(hi.data.f_f_foo.tolist(), expected)
+
+        hi.map('v_x', 'f_f_foo', np.mean)
+        expected = hi.data.groupby('f_id').v_x.transform('mean').tolist()
+        self.assertEqual(hi.data.f_f_foo.tolist(), expected)
+
+        hi.map('v_id', 'f_i_foo', 'max')
+        expected = hi.data.groupby('f_id').v_id.transform('max').tolist()
+        self.assertEqual(hi.data.f_i_foo.tolist(), expected)
+
+        hi.map('f_id', 'f_i_foo', 'first')
+        self.assertEqual(hi.data.f_i_foo.tolist(), hi.data.f_id.tolist())
+
+        with pytest.raises(ValidationError) as e:
+            hi.map('v_x', 'f_f_foo', 'median')
+        self.assertIn('median is not a legal reducer.', str(e.value))
+
+    def test_map_list_aggregator(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        hi.map('v_id', 'f_x_foo', lambda x: sorted(x.unique().tolist()))
+        result = hi.data.groupby('f_id').f_x_foo.first().tolist()
+        expected = [[0, 1], [2, 3, 4, 5, 6], [7, 8, 9]]
+        self.assertEqual(result, expected)
+
+    def test_map_many(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        hi.data['f_s_foo'] = 'foo'
+        hi.validate()
+        expected = hi.copy()
+        expected.map('v_x', 'f_f_x_mean', 'mean')
+        expected.map('v_x', 'f_f_x_max', np.maximum)
+        expected.map('v_id', 'f_i_count', lambda x: x.nunique())
+        expected.map('f_id', 'i_i_count', 'nunique')
+        expected.map('f_i_count', 'v_i_count', 'max')
+        expected.map('v_x', 'f_s_foo', 'first')
+
+        hi.map_many({
+            'f_f_x_mean': ('v_x', 'mean'),
+            'f_f_x_max': ('v_x', np.maximum),
+            'f_i_count': ('v_id', lambda x: x.nunique()),
+            'i_i_count': ('f_id', 'nunique'),
+            'v_i_count': ('f_id', 'count'),
+            'f_s_foo': ('v_x', 'first'),
+        })
+        hi.map('f_i_count', 'v_i_count', 'max')
+
+        result = hi.data.columns.tolist()
+        self.assertEqual(result, expected.data.columns.tolist())
+        for col in result:
+            self.assertEqual(hi.data[col].tolist(), expected.data[col].tolist())
+
+        for col in result:
+            self.assertTrue(hi._is_column_validated(col))
+
+    def test_map_many_invalid(self):
+        hi = HiFive()
+        hi.data = self.get_quadrilateral_data()
+        cols = hi.data.columns.tolist()
+
+        with pytest.raises(ValidationError):
+            hi.map_many({
+                'f_f_foo': ('v_x', 'mean'),
+                'f_q_bar': ('v_x', 'mean'),
+            })
+        self.assertEqual(hi.data.columns.tolist(), cols)
+
+        hi.data.loc[0, 'f_id'] = np.nan
+        with pytest.raises(TypeError):
+            hi.map_many({
+                'v_f_foo': ('v_x', 'mean'),
+                'f_f_foo': ('v_x', 'mean'),
+            })
+        self.assertEqual(hi.data.columns.tolist(), cols)
+
     def test_copy(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -317,6 +939,112 @@ class HiFiveTest(HiFiveTestBase):
         expected = ['foo']
         self.assertEqual(result, expected)
 
+    def test_copy_on_write(self):
+        with pd.option_context('mode.copy_on_write', True):
+            hi = HiFive()
+            hi.data = self.get_quadrilateral_data()
+            hi.validate()
+            index = hi._get_component_index('f_id')
+
+            result = hi.copy()
+            for col in hi.data.columns:
+                self.assertTrue(np.shares_memory(
+                    result.data[col].values, hi.data[col].values
+                ))
+            self.assertTrue(result._is_column_validated('v_x'))
+            self.assertIs(result._get_component_index('f_id'), index)
+
+            result.data.loc[0, 'v_x'] = 99.0
+            result.map('v_x', 'f_f_x_max', 'max')
+            self.assertEqual(hi.data.loc[0, 'v_x'], 0)
+            self.assertNotIn('f_f_x_max', hi.data.columns)
+            self.assertTrue(hi._is_column_validated('v_x'))
+            self.assertFalse(result._is_column_validated('v_x'))
+
+            result = hi.copy(deep=True)
+            self.assertFalse(np.shares_memory(
+                result.data.v_x.values, hi.data.v_x.values
+            ))
+
+        # without copy on write, copies are deep by default
+        result = hi.copy()
+        self.assertFalse(np.shares_memory(
+            result.data.v_x.values, hi.data.v_x.values
+        ))
+
+    def test_copy_compact(self):
+        hi = HiFive(compact=True, compact_coordinates=True)
+        hi.data = self.get_quadrilateral_data()
+        result = hi.copy(deep=False)
+        for col in ['v_id', 'v_x']:
+            self.assertTrue(np.shares_memory(
+                result.data[col].values, hi.data[col].values
+            ))
+
+    def test_views(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data()
+        version = hi.version
+        views = [
+            'info', 'item_info', 'face_info', 'edge_info', 'vertex_info',
+            'geometry_info'
+        ]
+        for view in views:
+            a = getattr(hi, view)
+            b = getattr(hi, view)
+            self.assertIsNot(a, b)
+            self.assertTrue(a.equals(b))
+
+        # views are memoized and callers get shallow copies
+        a = hi.face_info
+        self.assertTrue(np.shares_memory(a.f_id.values, hi.face_info.f_id.values))
+        a['f_id'] = -1
+        hi._HiFive__get_component_info = None
+        result = hi.face_info
+        self.assertEqual(result.f_id.tolist(), [0, 1, 2])
+        del hi._HiFive__get_component_info
+
+        # repeated reads neither recompute views nor checksum columns
+        hi._HiFive__get_info = None
+        checksum = hft.get_series_checksum
+        hft.get_series_checksum = None
+        try:
+            self.assertTrue(hi.info.equals(hi.info))
+        finally:
+            hft.get_series_checksum = checksum
+        del hi._HiFive__get_info
+
+        # methods and assignment bump the version and refresh views
+        hi.map('v_x', 'f_f_x', 'max')
+        self.assertGreater(hi.version, version)
+        self.assertIn('f_f_x', hi.face_info.columns)
+        self.assertIn('f_f_x', hi.info.loc['name'].tolist())
+
+        hi.data = hi.data.iloc[:4]
+        self.assertEqual(hi.geometry_info.loc['count_of', 'face'], 1)
+
+        # replaced columns refresh views
+        hi.data['f_f_x'] = 9.0
+        self.assertEqual(hi.face_info.f_f_x.tolist(), [9.0])
+
+        # so do in-place edits
+        hi.data.loc[hi.data.index[0], 'f_f_x'] = 8.0
+        self.assertEqual(hi.face_info.f_f_x.tolist(), [8.0])
+        hi.data.loc[hi.data.index[0], 'v_x'] = np.nan
+        info = hi.info.T
+        self.assertTrue(info[info.name == 'v_x'].has_nans.item())
+        hi.data.loc[hi.data.index[0], 'f_id'] = 9
+        self.assertEqual(hi.geometry_info.loc['count_of', 'face'], 2)
+
+        with pd.option_context('mode.copy_on_write', True):
+            hi = HiFive(normalized=True)
+            hi.data = self.get_multi_data()
+            hi.map('v_x', 'f_f_x', 'max')
+            a = hi.face_info
+            self.assertTrue(a.equals(hi.face_info))
+            hi.map('v_x', 'f_f_x', 'min')
+            self.assertFalse(a.equals(hi.face_info))
+
     def test_info(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -514,6 +1242,24 @@ class HiFiveTest(HiFiveTestBase):
         result = info.loc['topology_of', 'face']
         self.assertEqual(result, ['invalid', 'ngon', 'triangle'])
 
+    def test_geometry_info_polygon_sizes(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data()
+        info = hi.geometry_info
+
+        result = info.loc['polygon_sizes_of', 'face']
+        self.assertEqual(result, {2: 1, 3: 1, 5: 1})
+
+        result = info.loc['edges_per', 'face']
+        self.assertEqual(result, [2, 3, 'n'])
+
+        result = info.loc['vertices_per', 'item']
+        self.assertEqual(result, ['n'])
+
+        hi.data['e_id'] = np.nan
+        result = hi.geometry_info.loc['polygon_sizes_of', 'face']
+        self.assertTrue(pd.isnull(result))
+
     def test_geometry_info_no_edges_no_faces(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -553,7 +1299,258 @@ class HiFiveTest(HiFiveTestBase):
         result = hi.display_data.v_x_foo.unique().tolist()
         self.assertEqual(result, ['...'])
 
-    def test_get_unique_counts(self):
+    def test_display_data_shared(self):
+        hi = HiFive()
+        hi.data = self.fake_data
+        hi.data['v_x_foo'] = None
+        result = hi.display_data
+        self.assertEqual(result.columns.tolist(), hi.data.columns.tolist())
+        self.assertEqual(result.v_x_foo.unique().tolist(), ['...'])
+        self.assertTrue(hi.data.v_x_foo.isnull().all())
+        self.assertTrue(np.shares_memory(result.v_id.values, hi.data.v_id.values))
+
+    def test_get_display_page(self):
+        for normalized in [False, True]:
+            hi = HiFive(normalized=normalized)
+            data = self.fake_data.copy()
+            data['v_x_foo'] = [np.zeros(3)] * len(data)
+            hi.data = data
+
+            result = hi.get_display_page(page=1, page_size=4)
+            expected = data.iloc[4:8].drop(columns='v_x_foo')
+            self.assertTrue(result.drop(columns='v_x_foo').equals(expected))
+            self.assertEqual(result.columns.tolist(), data.columns.tolist())
+            self.assertEqual(result.v_x_foo.unique().tolist(), ['...'])
+
+            result = hi.get_display_page(page=100, page_size=4)
+            self.assertEqual(len(result), 0)
+
+        # _x_ columns are never read
+        get_column = hi._tables.get_column
+        hi._tables.get_column = lambda x, rows=None: \
+            None if x == 'v_x_foo' else get_column(x, rows=rows)
+        result = hi.get_display_page(page_size=4)
+        self.assertEqual(result.v_x_foo.tolist(), ['...'] * 4)
+
+        with self.assertRaisesRegex(ValidationError, 'Page must be'):
+            hi.get_display_page(page=-1)
+
+        with self.assertRaisesRegex(ValidationError, 'Page size must be'):
+            hi.get_display_page(page_size=0)
+
+    def test_repr_html(self):
+        hi = HiFive(normalized=True)
+        hi.data = self.fake_data
+        result = hi._repr_html_()
+        rows, cols = self.fake_data.shape
+        self.assertIn('<table', result)
+        self.assertIn(f'{rows} rows × {cols} columns', result)
+        self.assertIsNone(hi._tables._data)
+
+    def test_select(self):
+        for normalized in [False, True]:
+            hi = HiFive(normalized=normalized)
+            data = self.get_multi_data().reset_index(drop=True)
+            data['i_id'] = [0] * 14 + [1] * 6
+            hi.data = data
+            hi.validate()
+
+            result = hi.select(faces=[2, 0])
+            expected = data[data.f_id.isin([0, 2])]
+            self.assertTrue(result.data.equals(expected))
+            self.assertEqual(result._validated.keys(), hi._validated.keys())
+
+            result = hi.select(items=0, vertices=[2, 3, 7]).data
+            self.assertEqual(result.index.tolist(), [4, 5, 6, 13])
+
+            result = hi.select(edges=[99])
+            self.assertEqual(len(result.data), 0)
+
+            result = hi.select()
+            self.assertTrue(result.data.equals(data))
+
+        with pytest.raises(ValidationError) as e:
+            hi.data = data.drop(columns=['e_id'])
+            hi.select(edges=[0])
+        self.assertEqual(str(e.value), 'e_id not found in columns.')
+
+    def test_select_copy(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        result = hi.select(faces=[1], copy=False)
+        self.assertTrue(np.shares_memory(result.data.v_x, hi.data.v_x))
+
+        result = hi.select(faces=[1])
+        self.assertFalse(np.shares_memory(result.data.v_x, hi.data.v_x))
+
+        result = hi.select(faces=[0, 2])
+        self.assertIsNone(result.data._is_copy)
+        self.assertFalse(np.shares_memory(result.data.v_x, hi.data.v_x))
+
+        result = hi.select(faces=[1])
+        self.assertFalse(np.shares_memory(result.data.v_x, hi.data.v_x))
+
+    def test_select_repeated(self):
+        hi = HiFive()
+        data = self.get_multi_data().reset_index(drop=True)
+        data['i_id'] = [0] * 14 + [1] * 6
+        hi.data = data
+        hi.select(items=0)
+
+        # repeated selects neither rebuild nor verify the index of i_id
+        calls = []
+        checksum = hft.get_series_checksum
+        hft.get_series_checksum = lambda x: calls.append(x.name) or checksum(x)
+        try:
+            for i in [0, 1, 0, 1]:
+                hi.select(items=i)
+            self.assertEqual(calls, [])
+
+            hi.data.loc[0, 'i_id'] = 1
+            result = hi.select(items=1).data.index.tolist()
+            self.assertEqual(result, [0] + list(range(14, 20)))
+            self.assertEqual(calls, ['i_id'])
+        finally:
+            hft.get_series_checksum = checksum
+
+    def test_query_box(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        result = hi.query_box([0.5] * 3, [2] * 3)
+        self.assertEqual(result.tolist(), [1, 3, 4, 8, 9])
+
+        result = hi.query_box([3] * 3, [4] * 3, rows=True)
+        self.assertIsInstance(result, HiFive)
+        self.assertEqual(result.data.v_id.unique().tolist(), [5, 6])
+
+        result = hi.query_box([[0.5] * 3, [3] * 3], [[2] * 3, [4] * 3])
+        self.assertEqual([x.tolist() for x in result], [[1, 3, 4, 8, 9], [5, 6]])
+
+        result = hi.query_box([[3] * 3], [[4] * 3], rows=True)
+        self.assertEqual(result[0].data.v_id.unique().tolist(), [5, 6])
+
+        with pytest.raises(ValidationError) as e:
+            hi.data = hi.data.drop(columns=['v_z'])
+            hi.query_box([0] * 3, [1] * 3)
+        expected = "Spatial queries require columns: ['v_z']."
+        self.assertEqual(str(e.value), expected)
+
+    def test_query_radius(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        result = hi.query_radius([0, 0, 0], 0.1)
+        self.assertEqual(result.tolist(), [0, 2, 7])
+
+        result = hi.query_radius([[0, 0, 0], [4, 4, 4]], [0.1, 2])
+        self.assertEqual([x.tolist() for x in result], [[0, 2, 7], [5, 6]])
+
+        result = hi.query_radius([[4, 4, 4]], 2, rows=True)
+        self.assertEqual(result[0].data.f_id.unique().tolist(), [1])
+
+    def test_query_knn(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        ids, distances = hi.query_knn([3.9, 3.9, 3.9], k=2)
+        self.assertEqual(ids.tolist(), [6, 5])
+        self.assertAlmostEqual(distances[0], np.sqrt(0.03))
+
+        ids, distances = hi.query_knn([[0, 0, 0], [4, 4, 4]], k=3)
+        self.assertEqual(ids.shape, (2, 3))
+        self.assertEqual(ids.tolist(), [[0, 2, 7], [6, 5, 4]])
+
+    def test_spatial_index_cache(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        index = hi._get_spatial_index()
+        self.assertIs(hi._get_spatial_index(), index)
+
+        hi.map('v_x', 'f_f_x_mean', 'mean')
+        self.assertIs(hi._get_spatial_index(), index)
+
+        hi.data['v_x'] = hi.data.v_x + 10
+        self.assertIsNot(hi._get_spatial_index(), index)
+        self.assertEqual(hi.query_radius([10, 0, 0], 0.1).tolist(), [0, 2, 7])
+
+        # in-place edits of coordinates refresh the index too
+        hi.data.loc[hi.data.v_id == 3, ['v_x', 'v_y', 'v_z']] = 10.0
+        self.assertEqual(hi.query_radius([11, 1, 1], 0.1).tolist(), [1, 8])
+        self.assertEqual(hi.query_radius([10, 10, 10], 0.1).tolist(), [3])
+        index = hi._get_spatial_index()
+        self.assertIs(hi._get_spatial_index(), index)
+
+    def test_weld(self):
+        vertices = np.array([
+            [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+            [1, 0, 1e-9], [2, 0, 0], [2, 1, 0], [1, 1, 0],
+        ], dtype=float)
+        hi = HiFive().from_arrays(vertices, [0, 4, 8], list(range(8)))
+        result, mapping = hi.weld(return_mapping=True)
+        self.assertIs(result, hi)
+        self.assertEqual(mapping.index.tolist(), list(range(8)))
+        self.assertEqual(mapping.tolist(), [0, 1, 2, 3, 1, 5, 6, 2])
+        self.assertEqual(hi.data.v_id.nunique(), 6)
+        self.assertEqual(hi.data.v_z.tolist(), [0.0] * 16)
+
+        # shared edge of both faces is merged
+        self.assertEqual(hi.data.e_id.nunique(), 7)
+        self.assertEqual(len(hi.data), 16)
+        _, offsets, indices, _ = hi.to_arrays()
+        self.assertEqual(offsets.tolist(), [0, 4, 8])
+        self.assertEqual(indices.tolist(), [0, 1, 2, 3, 1, 4, 5, 2])
+
+    def test_weld_degenerate(self):
+        vertices = np.array([
+            [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+            [5, 5, 5], [5, 5, 5.01], [6, 5, 5],
+        ], dtype=float)
+        hi = HiFive().from_arrays(vertices, [0, 4, 7], list(range(7)))
+        hi.weld(tolerance=0.001)
+        self.assertEqual(hi.data.v_id.nunique(), 7)
+
+        # welding collapses the triangle into a single edge
+        hi.weld(tolerance=0.1)
+        self.assertEqual(hi.data.f_id.unique().tolist(), [0])
+        self.assertEqual(hi.data.v_id.nunique(), 4)
+        self.assertEqual(len(hi.data), 8)
+
+        with pytest.raises(ValidationError) as e:
+            hi.data = hi.data.drop(columns=['v_y'])
+            hi.weld()
+        self.assertEqual(str(e.value), "Weld requires columns: ['v_y'].")
+
+    def test_get_component_index(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+
+        index = hi._get_component_index('f_id')
+        self.assertEqual(index.ids.tolist(), [0, 1, 2])
+        self.assertIs(hi._get_component_index('f_id'), index)
+
+        hi.map('v_id', 'f_i_foo', 'max')
+        self.assertIs(hi._get_component_index('f_id'), index)
+
+        hi.data['f_id'] = hi.data.f_id + 1
+        result = hi._get_component_index('f_id')
+        self.assertIsNot(result, index)
+        self.assertEqual(result.ids.tolist(), [1, 2, 3])
+
+    def test_get_component_index_in_place(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        index = hi._get_component_index('f_id')
+
+        # in-place edits keep the column's buffer, so its token
+        hi.data.loc[0, 'f_id'] = 99
+        result = hi._get_component_index('f_id')
+        self.assertIsNot(result, index)
+        self.assertEqual(result.ids.tolist(), [0, 1, 2, 99])
+
+        hi.map('v_x', 'f_f_x_max', 'max')
+        self.assertEqual(hi.data.f_f_x_max[0], hi.data.v_x[0])
+        self.assertEqual(hi.face_info.f_id.tolist(), [0, 1, 2, 99])
+        self.assertEqual(hi.select(faces=99).data.index.tolist(), [0])
+
+    def test_get_unique_count_array(self):
         hi = HiFive()
         hi.data = self.fake_data
         row = hi.data.tail(1).copy()
@@ -562,8 +1559,15 @@ class HiFiveTest(HiFiveTestBase):
         row.f_id = 1
         hi.data = pd.concat([hi.data, row], ignore_index=True)
 
-        result = hi._HiFive__get_unique_counts('e_id', 'f_id')
-        self.assertEqual(result, [1, 4])
+        def get_counts():
+            result = hi._HiFive__get_unique_count_array('e_id', 'f_id')
+            summary = hi._HiFive__summarize_unique_counts(result)
+            self.assertEqual(
+                hi.geometry_info.loc['edges_per', 'face'], summary
+            )
+            return np.unique(result).tolist(), summary
+
+        self.assertEqual(get_counts()[1], [1, 4])
 
         row.e_id = 5
         hi.data = pd.concat([hi.data, row], ignore_index=True)
@@ -571,16 +1575,11 @@ class HiFiveTest(HiFiveTestBase):
         hi.data = pd.concat([hi.data, row], ignore_index=True)
         row.e_id = 7
         hi.data = pd.concat([hi.data, row], ignore_index=True)
-        result = hi._HiFive__get_unique_counts('e_id', 'f_id')
-        self.assertEqual(result, [4])
+        self.assertEqual(get_counts()[1], [4])
 
         row.e_id = 8
         hi.data = pd.concat([hi.data, row], ignore_index=True)
-        result = hi._HiFive__get_unique_counts('e_id', 'f_id', summarize=False)
-        self.assertEqual(result, [4, 5])
-
-        result = hi._HiFive__get_unique_counts('e_id', 'f_id', summarize=True)
-        self.assertEqual(result, [4, 'n'])
+        self.assertEqual(get_counts(), ([4, 5], [4, 'n']))
 
     def test_get_nunique(self):
         hi = HiFive()
@@ -593,36 +1592,6 @@ class HiFiveTest(HiFiveTestBase):
         result = hi._HiFive__get_nunique('foo')
         self.assertEqual(result, 2)
 
-    def test_expand_row(self):
-        hi = HiFive()
-        hi.data = self.fake_data
-
-        hi.data['v_x_foo'] = None
-        hi.data.v_x_foo = hi.data.v_x_foo.apply(lambda x: [0, 1, 2])
-
-        row = hi.data.loc[0, :]
-
-        result = hi._HiFive__expand_row(row, 'v_x_foo', 'v_i_foo', lambda x: x)
-        self.assertEqual(result.shape[0], 3)
-        self.assertEqual(result.loc[0, 'v_i_foo'], 0)
-        self.assertEqual(result.loc[1, 'v_i_foo'], 1)
-        self.assertEqual(result.loc[2, 'v_i_foo'], 2)
-
-        hi = HiFive()
-        hi.data = self.fake_data
-        hi.data['v_s_foo'] = None
-        hi.data.v_s_foo = hi.data.v_s_foo.apply(lambda x: 'abc')
-
-        row = hi.data.loc[0, :]
-
-        result = hi._HiFive__expand_row(
-            row, 'v_s_foo', 'v_s_foo', lambda x: list(x)
-        )
-        self.assertEqual(result.shape[0], 3)
-        self.assertEqual(result.loc[0, 'v_s_foo'], 'a')
-        self.assertEqual(result.loc[1, 'v_s_foo'], 'b')
-        self.assertEqual(result.loc[2, 'v_s_foo'], 'c')
-
     def test_expand(self):
         hi = HiFive()
         hi.data = self.fake_data
@@ -659,6 +1628,137 @@ class HiFiveTest(HiFiveTestBase):
         self.assertEqual(result.data.loc[i, 'v_s_foo'], 'c')
         self.assertEqual(result.data.loc[i, 'v_i_foo_id'], last_id)
 
+    def test_expand_dtypes(self):
+        hi = HiFive()
+        hi.data = self.fake_data
+        hi.data['v_x_foo'] = [[1, 2]] * 7 + [[]]
+        hi.validate()
+
+        result = hi.expand('v_x_foo', 'v_i_foo', 'v_i_foo_id', lambda x: x)
+        self.assertEqual(result.data.shape[0], 14)
+        self.assertEqual(result.data.v_i_foo.tolist(), [1, 2] * 7)
+        self.assertEqual(result.data.v_i_foo_id.tolist(), sorted(list(range(7)) * 2))
+        self.assertEqual(result.data.index.tolist(), list(range(14)))
+
+        expected = HiFive._HiFive__DEFAULT_COLUMNS + ['v_i_foo', 'v_i_foo_id']
+        self.assertEqual(result.data.columns.tolist(), expected)
+
+        for col in ['i_id', 'f_id', 'e_id', 'v_id', 'v_i_foo', 'v_i_foo_id']:
+            self.assertEqual(result.data[col].dtype.kind, 'i')
+        for col in ['v_x', 'v_y', 'v_z']:
+            self.assertEqual(result.data[col].dtype.kind, 'f')
+            self.assertTrue(result._is_column_validated(col))
+
+    def test_expand_chunksize(self):
+        hi = HiFive()
+        hi.data = self.fake_data
+        hi.data['v_x_foo'] = 'abc'
+        expected = hi.copy().expand(
+            'v_x_foo', 'v_s_foo', 'v_i_foo_id', lambda x: list(x)
+        )
+
+        chunks = hi.expand(
+            'v_x_foo', 'v_s_foo', 'v_i_foo_id', lambda x: list(x), chunksize=3
+        )
+        chunks = list(chunks)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual([x.data.shape[0] for x in chunks], [9, 9, 6])
+        self.assertIn('v_x_foo', hi.data.columns)
+
+        result = pd.concat([x.data for x in chunks], ignore_index=True)
+        for col in expected.data.columns:
+            self.assertEqual(result[col].tolist(), expected.data[col].tolist())
+
+        with pytest.raises(TypeError):
+            hi.expand('v_x_foo', 'v_s_foo', 'v_j_foo', list, chunksize=3)
+
+    def test_fingerprint(self):
+        a = HiFive()
+        a.data = self.get_multi_data()
+        a.data['v_x_foo'] = [[1]] * a.data.shape[0]
+        result = a.fingerprint()
+        self.assertIsInstance(result, str)
+
+        b = HiFive()
+        b.data = a.data.sample(frac=1, random_state=0)
+        b.data = b.data[b.data.columns[::-1]]
+        self.assertEqual(b.fingerprint(), result)
+
+        b.data['v_id'] = b.data.v_id.astype(float)
+        self.assertEqual(b.fingerprint(), result)
+
+        b.data.iloc[0, 0] = 99
+        self.assertNotEqual(b.fingerprint(), result)
+        self.assertEqual(
+            b.fingerprint(ignore_columns=[b.data.columns[0]]),
+            a.fingerprint(ignore_columns=[b.data.columns[0]])
+        )
+
+        b = a.copy()
+        b.data['v_x_foo'] = [[2]] * a.data.shape[0]
+        self.assertNotEqual(b.fingerprint(), result)
+
+        # multisets of rows differ
+        b = HiFive()
+        b.data = a.data.iloc[[0] + list(range(a.data.shape[0] - 1))]
+        self.assertNotEqual(b.fingerprint(), result)
+
+    def test_is_equivalent_hash(self):
+        a = HiFive()
+        a.data = self.fake_data
+        a.data['f_x_foo'] = 1
+
+        b = a.copy()
+        b.data['f_x_foo'] = 1.0
+        b.data['v_z'] = b.data.v_z.astype(int)
+        self.assertTrue(a.is_equivalent(b))
+
+        b.data['f_x_foo'] = 2
+        self.assertFalse(a.is_equivalent(b))
+
+    def test_diff(self):
+        a = HiFive()
+        a.data = self.get_multi_data().reset_index(drop=True)
+        a.data['f_s_name'] = a.data.f_id.astype(str)
+
+        b = a.copy()
+        b.data = b.data.sample(frac=1, random_state=0)
+        result = a.diff(b)
+        self.assertEqual(result.shape, (3, 4))
+        self.assertTrue(all(x == [] for x in result.values.ravel()))
+
+        # move vertex 3 of face 1
+        b = a.copy()
+        b.data.loc[b.data.v_id == 3, 'v_x'] = 9.0
+        result = a.diff(b)
+        self.assertEqual(result.loc['modified', 'vertex'], [3])
+        self.assertEqual(result.loc['modified', 'edge'], [2, 3])
+        self.assertEqual(result.loc['modified', 'face'], [1])
+        self.assertEqual(result.loc['modified', 'item'], [0])
+        self.assertEqual(result.loc['added', 'vertex'], [])
+
+        # face data does not modify vertices or edges
+        b = a.copy()
+        b.data.loc[b.data.f_id == 2, 'f_s_name'] = 'foo'
+        result = a.diff(b)
+        self.assertEqual(result.loc['modified', 'face'], [2])
+        self.assertEqual(result.loc['modified', 'vertex'], [])
+
+        # remove triangle and add a face
+        b = a.copy()
+        b.data = b.data[b.data.f_id != 2]
+        row = b.data.tail(2).copy()
+        row.f_id = 7
+        row.e_id = 70
+        b.data = pd.concat([b.data, row], ignore_index=True)
+        result = a.diff(b)
+        self.assertEqual(result.loc['added', 'face'], [7])
+        self.assertEqual(result.loc['removed', 'face'], [2])
+        self.assertEqual(result.loc['added', 'edge'], [70])
+        self.assertEqual(result.loc['removed', 'edge'], [7, 8, 9])
+        self.assertEqual(result.loc['removed', 'vertex'], [7, 8, 9])
+        self.assertEqual(result.loc['modified', 'vertex'], [])
+
     def test_is_equivalent(self):
         a = HiFive()
         a.data = self.fake_data
@@ -1,8 +1,13 @@
 import json
 import os
+import pickle
 import re
+import weakref
+import zlib
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype
 
 from shot_glass.core.tools import ValidationError
 # ------------------------------------------------------------------------------
@@ -112,6 +117,150 @@ def is_natural_number(value):
     if is_integer(value):
         return value >= 0
     return False
+# ------------------------------------------------------------------------------
+
+
+def get_first_invalid_element(series, validator):
+    '''
+    Finds the first non-null element of a given Series that fails a given
+    validator. This is the per-element fallback of the series validators below.
+
+    Args:
+        series (Series): Series to be tested.
+        validator (function): Function that returns a boolean given an element.
+
+    Returns:
+        tuple: (index, value) of first invalid element or None.
+    '''
+    for index, value in series[series.notnull()].items():
+        if not validator(value):
+            return index, value
+    return None
+
+
+def get_first_invalid_float(series):
+    '''
+    Finds the first non-float element of a given Series. Float dtypes (including
+    nullable Float64) are validated from their dtype kind alone.
+
+    Args:
+        series (Series): Series to be tested.
+
+    Returns:
+        tuple: (index, value) of first invalid element or None.
+    '''
+    kind = series.dtype.kind
+    if kind == 'f':
+        return None
+    if kind == 'O' and infer_dtype(series, skipna=True) in ['floating', 'empty']:
+        return None
+    return get_first_invalid_element(series, is_float)
+
+
+def get_first_invalid_integer(series):
+    '''
+    Finds the first non-integer element of a given Series. Integer, unsigned
+    integer and boolean dtypes (including nullable Int and UInt dtypes) are
+    validated from their dtype kind alone.
+
+    Args:
+        series (Series): Series to be tested.
+
+    Returns:
+        tuple: (index, value) of first invalid element or None.
+    '''
+    kind = series.dtype.kind
+    if kind in 'iub':
+        return None
+    if kind == 'O':
+        inferred = infer_dtype(series, skipna=True)
+        if inferred in ['integer', 'boolean', 'empty']:
+            return None
+    return get_first_invalid_element(series, is_integer)
+
+
+def get_first_invalid_string(series):
+    '''
+    Finds the first non-string element of a given Series. Object and string
+    dtypes are checked with a vectorized type inference before falling back to
+    per-element checks.
+
+    Args:
+        series (Series): Series to be tested.
+
+    Returns:
+        tuple: (index, value) of first invalid element or None.
+    '''
+    if series.dtype.kind == 'O':
+        if infer_dtype(series, skipna=True) in ['string', 'empty']:
+            return None
+    return get_first_invalid_element(series, is_string)
+
+
+def get_first_invalid_json(series):
+    '''
+    Finds the first non-JSON element of a given Series. Each distinct string is
+    only parsed once.
+
+    Args:
+        series (Series): Series to be tested.
+
+    Returns:
+        tuple: (index, value) of first invalid element or None.
+    '''
+    if series.dtype.kind == 'O':
+        if infer_dtype(series, skipna=True) in ['string', 'empty']:
+            # drop_duplicates keeps first occurrences, so the first invalid
+            # unique value is also the first invalid value
+            series = series.drop_duplicates()
+    return get_first_invalid_element(series, is_json)
+
+
+REDUCERS = ['count', 'first', 'max', 'mean', 'min', 'nunique', 'prod', 'sum']
+
+# numpy reductions and the pandas groupby reducers they are equivalent to
+NUMPY_REDUCERS = {
+    np.add: 'sum',
+    np.multiply: 'prod',
+    np.maximum: 'max',
+    np.minimum: 'min',
+    np.fmax: 'max',
+    np.fmin: 'min',
+    np.sum: 'sum',
+    np.prod: 'prod',
+    np.mean: 'mean',
+    np.max: 'max',
+    np.min: 'min',
+    np.amax: 'max',
+    np.amin: 'min',
+}
+
+
+def get_reducer_name(aggregator):
+    '''
+    Gets the name of the pandas groupby reducer equivalent to a given
+    aggregator.
+
+    Args:
+        aggregator (object): Reducer name, numpy reduction or function.
+
+    Raises:
+        ValidationError: If aggregator is a string but not a legal reducer.
+
+    Returns:
+        str: Reducer name or None if aggregator is an arbitrary function.
+    '''
+    if isinstance(aggregator, str):
+        if aggregator not in REDUCERS:
+            msg = f'{aggregator} is not a legal reducer. '
+            msg += f'Legal reducers: {REDUCERS}.'
+            raise ValidationError(msg)
+        return aggregator
+
+    try:
+        return NUMPY_REDUCERS.get(aggregator)
+    except TypeError:
+        return None
 
 
 def get_nunique_a_per_b(data, a, b):
@@ -129,10 +278,424 @@ def get_nunique_a_per_b(data, a, b):
     return data[[a, b]] \
         .dropna() \
         .groupby(b)[a] \
-        .agg(lambda x: x.nunique()) \
+        .nunique() \
         .tolist()
 
 
+def to_compact_integer(series):
+    '''
+    Downcasts a given Series of integers to the smallest integer dtype that
+    fits its values. Unsigned dtypes are used unless values are negative and
+    nullable dtypes are used if the Series contains nulls. Float and object
+    Series are converted if all their non-null values are integral, so not if
+    they contain infinities.
+
+    Args:
+        series (Series): Series to be downcast.
+
+    Returns:
+        Series: Downcast Series or given Series if it cannot be downcast.
+    '''
+    if series.size == 0:
+        return series
+
+    values = series
+    if values.dtype.kind == 'O':
+        try:
+            values = pd.to_numeric(values)
+        except (TypeError, ValueError):
+            return series
+
+    kind = values.dtype.kind
+    if kind not in 'iuf':
+        return series
+
+    nonnull = values.dropna()
+    if kind == 'f':
+        finite = np.isfinite(nonnull.to_numpy(dtype=np.float64))
+        if not finite.all() or not (nonnull == np.floor(nonnull)).all():
+            return series
+
+    min_ = 0
+    max_ = 0
+    if nonnull.size > 0:
+        min_ = nonnull.min()
+        max_ = nonnull.max()
+
+    dtypes = ['uint8', 'uint16', 'uint32', 'uint64']
+    if min_ < 0:
+        dtypes = ['int8', 'int16', 'int32', 'int64']
+
+    for dtype in dtypes:
+        info = np.iinfo(dtype)
+        if info.min <= min_ and max_ <= info.max:
+            break
+    else:
+        return series
+
+    if values.hasnans:
+        dtype = dtype.replace('uint', 'UInt').replace('int', 'Int')
+    if values.dtype == dtype:
+        return values
+    return values.astype(dtype)
+
+
+def to_wide_integer(series):
+    '''
+    Upcasts a given Series of integers to 64 bit signed integers, which is
+    nullable if its dtype is. Arithmetic on compact Series, such as adding an
+    offset to a uint8 id column, silently wraps around, so they must be
+    upcast beforehand.
+
+    Args:
+        series (Series): Series to be upcast.
+
+    Returns:
+        Series: Upcast Series or given Series if it is not of integer dtype \
+            or is already 64 bit signed.
+    '''
+    if series.dtype.kind not in 'iu':
+        return series
+
+    dtype = 'int64'
+    if not isinstance(series.dtype, np.dtype):
+        dtype = 'Int64'
+    if series.dtype == dtype:
+        return series
+    return series.astype(dtype)
+
+
+def to_compact_float(series):
+    '''
+    Downcasts a given Series of floats to 32 bit floats.
+
+    Args:
+        series (Series): Series to be downcast.
+
+    Returns:
+        Series: Downcast Series or given Series if it is not of 64 bit float \
+            dtype.
+    '''
+    if series.dtype.kind != 'f' or series.dtype.itemsize <= 4:
+        return series
+    if isinstance(series.dtype, np.dtype):
+        return series.astype('float32')
+    return series.astype('Float32')
+
+
+def get_series_token(series):
+    '''
+    Generates a token identifying the memory backing a given Series.
+
+    Tokens are cheap to compute and only match while the Series is backed by
+    the very same, still living, array. So, they can be used to detect that a
+    column has been replaced or reallocated since it was last seen. In-place
+    edits which neither reallocate nor change the dtype of the array are not
+    detected.
+
+    Args:
+        series (Series): Series to be tokenized.
+
+    Returns:
+        tuple: (weakref to backing array, address, dtype, length) or None if \
+            backing array cannot be weakly referenced.
+    '''
+    values = series.values
+    root = values
+    while isinstance(getattr(root, 'base', None), np.ndarray):
+        root = root.base
+
+    address = None
+    if isinstance(values, np.ndarray):
+        address = values.__array_interface__['data'][0]
+
+    try:
+        ref = weakref.ref(root)
+    except TypeError:
+        return None
+    return (ref, address, str(values.dtype), len(values))
+
+
+def get_series_checksum(series):
+    '''
+    Generates a checksum of the values of a given Series.
+
+    Unlike tokens (see get_series_token), checksums change when a Series is
+    edited in place. Elements of object Series are checksummed by their
+    addresses, so replacing an element changes the checksum, while mutating
+    a mutable element, such as a list, does not.
+
+    Args:
+        series (Series): Series to be checksummed.
+
+    Returns:
+        tuple: (dtype, length, CRC-32 of values).
+    '''
+    values = series.values
+    if not isinstance(values, np.ndarray):
+        values = pd.util.hash_pandas_object(series, index=False).values
+    checksum = zlib.crc32(np.ascontiguousarray(values))
+    return (str(series.dtype), len(series), checksum)
+
+
+def is_same_token(a, b):
+    '''
+    Determines whether two tokens generated by get_series_token refer to the
+    same living array.
+
+    Args:
+        a (tuple): Token.
+        b (tuple): Token.
+
+    Returns:
+        bool: Whether tokens match.
+    '''
+    if a is None or b is None:
+        return False
+    root = a[0]()
+    if root is None or root is not b[0]():
+        return False
+    return a[1:] == b[1:]
+
+
+def to_hashable_series(series):
+    '''
+    Converts a given Series into a form whose values hash equally wherever
+    they compare equally. Numbers, including booleans and numbers within
+    object Series, are converted to float64 without signed zeros.
+
+    Args:
+        series (Series): Series to be converted.
+
+    Returns:
+        Series: Converted Series with a RangeIndex or None if values, such as \
+            lists, cannot be hashed faithfully.
+    '''
+    kind = series.dtype.kind
+    if kind == 'O':
+        inferred = infer_dtype(series, skipna=True)
+        if inferred in ['string', 'empty']:
+            return series.reset_index(drop=True)
+
+        numeric = ['integer', 'floating', 'mixed-integer-float', 'boolean']
+        if inferred not in numeric:
+            return None
+        series = series.astype(float)
+        kind = 'f'
+
+    if kind in 'biuf':
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.Series(values + 0.0)
+    return series.reset_index(drop=True)
+
+
+def get_multiset_hash(data):
+    '''
+    Generates an order insensitive hash of the rows of a given DataFrame, by
+    summing the hashes of its rows. Columns must be in a consistent order.
+
+    Args:
+        data (DataFrame): DataFrame to be hashed.
+
+    Returns:
+        int: 64 bit hash.
+    '''
+    if data.shape[1] == 0 or data.shape[0] == 0:
+        return 0
+    hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    return int(hashes.sum(dtype=np.uint64))
+
+
+def hash_series(series):
+    '''
+    Hashes each element of a given Series, after converting it with
+    to_hashable_series. Values which cannot be hashed faithfully are hashed by
+    their repr.
+
+    Args:
+        series (Series): Series to be hashed.
+
+    Returns:
+        numpy.ndarray: uint64 hash per element.
+    '''
+    hashable = to_hashable_series(series)
+    if hashable is None:
+        hashable = series.map(repr)
+    return pd.util.hash_pandas_object(hashable, index=False).to_numpy()
+
+
+# the cell itself and the 13 neighbor cells which follow it, so that each
+# pair of neighboring cells is visited once
+WELD_OFFSETS = np.array([
+    (x, y, z)
+    for x in [-1, 0, 1] for y in [-1, 0, 1] for z in [-1, 0, 1]
+    if (x, y, z) >= (0, 0, 0)
+])
+
+
+def get_cell_hashes(cells):
+    '''
+    Hashes given integer 3D grid cells. Different cells may collide, so
+    hashes only find candidate cells.
+
+    Args:
+        cells (numpy.ndarray): (N, 3) array of integer cell coordinates.
+
+    Returns:
+        numpy.ndarray: int64 hash per cell.
+    '''
+    x, y, z = cells.astype(np.int64).T
+    return (x * 73856093) ^ (y * 19349663) ^ (z * 83492791)
+
+
+def get_weld_clusters(points, tolerance):
+    '''
+    Clusters given 3D points which lie within a given distance of each
+    other, transitively.
+
+    Coincident points are merged first. The remaining points are hashed onto
+    a grid of cells of tolerance size, so that only points in the same or
+    neighboring cells are compared. Clusters are then found by propagating
+    the lowest point position along close pairs.
+
+    Args:
+        points (array-like): (N, 3) array of points.
+        tolerance (float): Distance. If 0, only coincident points are merged.
+
+    Returns:
+        numpy.ndarray: Position of first point of the cluster of each point.
+    '''
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # factorize coordinates by hashing, which is faster than sorting rows
+    inverse = pd.factorize(points[:, 0])[0]
+    for i in [1, 2]:
+        codes, uniques = pd.factorize(points[:, i])
+        inverse = pd.factorize(inverse * len(uniques) + codes)[0]
+    first = pd.Series(inverse).drop_duplicates().index.to_numpy()
+    unique = points[first]
+    labels = np.arange(len(unique))
+
+    if tolerance > 0:
+        cells = np.floor(unique / tolerance).astype(np.int64)
+        hashes = get_cell_hashes(cells)
+        order = np.argsort(hashes, kind='stable')
+        hashes = hashes[order]
+        starts = np.flatnonzero(np.r_[True, hashes[1:] != hashes[:-1]])
+        keys = pd.Index(hashes[starts])
+        counts = np.diff(np.r_[starts, hashes.size])
+
+        lefts = []
+        rights = []
+        for offset in WELD_OFFSETS:
+            codes = keys.get_indexer(get_cell_hashes(cells + offset))
+            found = codes >= 0
+
+            # pair each point with every point of its neighbor cell
+            codes = codes[found]
+            size = counts[codes]
+            left = np.repeat(np.flatnonzero(found), size)
+            positions = starts[codes] - np.cumsum(size) + size
+            positions = np.repeat(positions, size) + np.arange(size.sum())
+            right = order[positions]
+
+            delta = unique[left] - unique[right]
+            close = np.einsum('ij,ij->i', delta, delta) <= tolerance ** 2
+            close &= left != right
+            lefts.append(left[close])
+            rights.append(right[close])
+
+        left = np.concatenate(lefts)
+        right = np.concatenate(rights)
+        while left.size > 0:
+            lowest = np.minimum(labels[left], labels[right])
+            temp = labels.copy()
+            np.minimum.at(temp, left, lowest)
+            np.minimum.at(temp, right, lowest)
+            temp = temp[temp]
+            if np.array_equal(temp, labels):
+                break
+            labels = temp
+
+    # unique points are in order of first occurrence, so the lowest label of
+    # a cluster is also its first point
+    return first[labels][inverse]
+
+
+MASKED_ARRAYS = ['BooleanArray', 'FloatingArray', 'IntegerArray']
+
+
+def write_mmap_array(values, fullpath):
+    '''
+    Writes a given array to a memory mappable file in a given directory.
+
+    Numpy arrays of non-object dtype are written as <name>.npy. Masked arrays
+    of nullable dtypes are written as <name>.npy and <name>.mask.npy. All
+    other arrays are pickled to <name>.pkl and cannot be memory mapped.
+
+    Each file is written to a temporary file which then replaces its target,
+    so processes that have mapped a previous version are not affected.
+
+    Args:
+        values (array): Numpy or pandas extension array.
+        fullpath (str): Full path of file, without extension.
+
+    Returns:
+        dict: Schema of written array, for use with read_mmap_array.
+    '''
+    def save(array, filepath):
+        temp = filepath + '.temp'
+        with open(temp, 'wb') as f:
+            np.save(f, array)
+        os.replace(temp, filepath)
+
+    name = os.path.basename(fullpath)
+    kind = type(values).__name__
+    if isinstance(values, np.ndarray) and values.dtype.kind != 'O':
+        save(values, fullpath + '.npy')
+        return dict(kind='numpy', name=name)
+
+    if kind in MASKED_ARRAYS:
+        save(values._data, fullpath + '.npy')
+        save(values._mask, fullpath + '.mask.npy')
+        return dict(kind=kind, name=name)
+
+    temp = fullpath + '.pkl.temp'
+    with open(temp, 'wb') as f:
+        pickle.dump(values, f)
+    os.replace(temp, fullpath + '.pkl')
+    return dict(kind='pickle', name=name)
+
+
+def read_mmap_array(schema, directory):
+    '''
+    Reads an array written by write_mmap_array. Numpy and masked arrays are
+    copy-on-write memory maps of their files, so they are not read into
+    memory until accessed and share the page cache of other processes.
+
+    Args:
+        schema (dict): Schema returned by write_mmap_array.
+        directory (str): Directory of array files.
+
+    Returns:
+        array: Numpy or pandas extension array.
+    '''
+    fullpath = os.path.join(directory, schema['name'])
+    kind = schema['kind']
+    if kind == 'pickle':
+        with open(fullpath + '.pkl', 'rb') as f:
+            return pickle.load(f)
+
+    values = np.load(fullpath + '.npy', mmap_mode='c')
+    if kind == 'numpy':
+        return values
+
+    mask = np.load(fullpath + '.mask.npy', mmap_mode='c')
+    return getattr(pd.arrays, kind)(values, mask, copy=False)
+
+
 def validate_file_extension(filepath, extension):
     '''
     Validates given file path extension according to given extension.
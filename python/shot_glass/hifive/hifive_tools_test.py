@@ -1,8 +1,11 @@
+from tempfile import TemporaryDirectory
 import json
+import os
 import unittest
 
-from pandas import DataFrame
+from pandas import DataFrame, Series
 import numpy as np
+import pandas as pd
 import pytest
 
 from shot_glass.core.tools import ValidationError
@@ -93,6 +96,86 @@ class HiFiveToolsTests(unittest.TestCase):
         expected = False
         self.assertEqual(result, expected)
 
+    def test_get_first_invalid_element(self):
+        series = Series([np.nan, 1, 'foo', 'bar'])
+        result = hft.get_first_invalid_element(series, hft.is_integer)
+        self.assertEqual(result, (2, 'foo'))
+
+        series = Series([np.nan, 1, 2], dtype=object)
+        result = hft.get_first_invalid_element(series, hft.is_integer)
+        self.assertIsNone(result)
+
+    def test_get_first_invalid_float(self):
+        series = Series([1.0, np.nan])
+        self.assertIsNone(hft.get_first_invalid_float(series))
+
+        series = Series([1.0, np.nan], dtype='Float64')
+        self.assertIsNone(hft.get_first_invalid_float(series))
+
+        series = Series([1.0, None], dtype=object)
+        self.assertIsNone(hft.get_first_invalid_float(series))
+
+        series = Series([np.nan, 1])
+        self.assertIsNone(hft.get_first_invalid_float(series))
+
+        series = Series([1, 2])
+        self.assertEqual(hft.get_first_invalid_float(series), (0, 1))
+
+        series = Series([1.0, 'foo'])
+        self.assertEqual(hft.get_first_invalid_float(series), (1, 'foo'))
+
+    def test_get_first_invalid_integer(self):
+        for dtype in ['int64', 'uint8', 'Int64', 'UInt32', 'bool']:
+            series = Series([1, 0], dtype=dtype)
+            self.assertIsNone(hft.get_first_invalid_integer(series))
+
+        series = Series([1, None], dtype=object)
+        self.assertIsNone(hft.get_first_invalid_integer(series))
+
+        series = Series([np.nan, np.nan])
+        self.assertIsNone(hft.get_first_invalid_integer(series))
+
+        series = Series([np.nan, 1.0])
+        self.assertEqual(hft.get_first_invalid_integer(series), (1, 1.0))
+
+        series = Series([1, 'foo'])
+        self.assertEqual(hft.get_first_invalid_integer(series), (1, 'foo'))
+
+    def test_get_first_invalid_string(self):
+        series = Series(['foo', None])
+        self.assertIsNone(hft.get_first_invalid_string(series))
+
+        series = Series(['foo', None], dtype='string')
+        self.assertIsNone(hft.get_first_invalid_string(series))
+
+        series = Series(['foo', 'bar', 1])
+        self.assertEqual(hft.get_first_invalid_string(series), (2, 1))
+
+        series = Series([1.0, 2.0])
+        self.assertEqual(hft.get_first_invalid_string(series), (0, 1.0))
+
+    def test_get_first_invalid_json(self):
+        valid = json.dumps({'foo': 'bar'})
+        series = Series([valid, valid, None])
+        self.assertIsNone(hft.get_first_invalid_json(series))
+
+        series = Series([valid, 'foo', valid, 'foo'])
+        self.assertEqual(hft.get_first_invalid_json(series), (1, 'foo'))
+
+        series = Series([valid, 1])
+        self.assertEqual(hft.get_first_invalid_json(series), (1, 1))
+
+    def test_get_reducer_name(self):
+        self.assertEqual(hft.get_reducer_name('mean'), 'mean')
+        self.assertEqual(hft.get_reducer_name(np.add), 'sum')
+        self.assertEqual(hft.get_reducer_name(np.maximum), 'max')
+        self.assertEqual(hft.get_reducer_name(np.mean), 'mean')
+        self.assertIsNone(hft.get_reducer_name(lambda x: x.mean()))
+
+        expected = 'foo is not a legal reducer.'
+        with self.assertRaisesRegex(ValidationError, expected):
+            hft.get_reducer_name('foo')
+
     def test_get_nunique_a_per_b(self):
         data = DataFrame()
         data['a'] = ['q', 'q', 'x', 'y']
@@ -101,6 +184,187 @@ class HiFiveToolsTests(unittest.TestCase):
         result = hft.get_nunique_a_per_b(data, 'a', 'b')
         self.assertEqual(result, [1, 2])
 
+    def test_to_compact_integer(self):
+        data = [
+            ([0, 1, 255], 'int64', 'uint8'),
+            ([0, 1, 256], 'int64', 'uint16'),
+            ([0, 2 ** 40], 'int64', 'uint64'),
+            ([-1, 1], 'int64', 'int8'),
+            ([-1, 40000], 'int64', 'int32'),
+            ([0.0, np.nan, 2.0], 'float64', 'UInt8'),
+            ([-1.0, np.nan, 2.0], 'float64', 'Int8'),
+            ([1, None], 'Int64', 'UInt8'),
+            (['1', '2'], 'object', 'uint8'),
+            ([np.nan, np.nan], 'float64', 'UInt8'),
+        ]
+        for values, dtype, expected in data:
+            series = Series(values, dtype=dtype)
+            result = hft.to_compact_integer(series)
+            self.assertEqual(str(result.dtype), expected)
+            self.assertEqual(
+                result.dropna().tolist(),
+                series.dropna().astype(int).tolist()
+            )
+
+        for values in [[1.5, 2.0], ['a', 'b'], []]:
+            series = Series(values, dtype=object)
+            result = hft.to_compact_integer(series)
+            self.assertIs(result, series)
+
+        for values in [[0.0, np.inf], [-np.inf, np.nan, 1.0], [2.0 ** 70]]:
+            series = Series(values)
+            result = hft.to_compact_integer(series)
+            self.assertIs(result, series)
+
+    def test_to_wide_integer(self):
+        data = [
+            (Series([0, 255], dtype='uint8'), 'int64'),
+            (Series([0, None], dtype='UInt16'), 'Int64'),
+            (Series([0, -1], dtype='int32'), 'int64'),
+        ]
+        for series, expected in data:
+            result = hft.to_wide_integer(series)
+            self.assertEqual(str(result.dtype), expected)
+            self.assertEqual((result + 255).max(), int(series.max()) + 255)
+
+        for series in [Series([0, 1]), Series([0.5]), Series(['a'])]:
+            self.assertIs(hft.to_wide_integer(series), series)
+
+    def test_to_compact_float(self):
+        result = hft.to_compact_float(Series([1.0, np.nan]))
+        self.assertEqual(str(result.dtype), 'float32')
+
+        result = hft.to_compact_float(Series([1.0, None], dtype='Float64'))
+        self.assertEqual(str(result.dtype), 'Float32')
+
+        series = Series(['a'])
+        self.assertIs(hft.to_compact_float(series), series)
+
+    def test_get_series_checksum(self):
+        data = DataFrame()
+        data['a'] = [0, 1, 2]
+        data['b'] = Series([0, None, 2], dtype='Int64')
+        data['c'] = ['x', 'y', None]
+        for col, value in [('a', 3), ('b', None), ('c', 'z')]:
+            a = hft.get_series_checksum(data[col])
+            self.assertEqual(a, hft.get_series_checksum(data[col].copy()))
+
+            data.loc[0, col] = value
+            b = hft.get_series_checksum(data[col])
+            self.assertNotEqual(a, b)
+            self.assertEqual(b[:2], (str(data[col].dtype), 3))
+
+    def test_get_series_token(self):
+        data = DataFrame()
+        data['a'] = [0, 1, 2]
+        data['b'] = Series([0, None, 2], dtype='Int64')
+        for col in ['a', 'b']:
+            a = hft.get_series_token(data[col])
+            b = hft.get_series_token(data[col])
+            self.assertTrue(hft.is_same_token(a, b))
+
+            data[col] = data[col] + 1
+            b = hft.get_series_token(data[col])
+            self.assertFalse(hft.is_same_token(a, b))
+
+        self.assertFalse(hft.is_same_token(None, None))
+
+    def test_to_hashable_series(self):
+        index = [3, 2, 1]
+        values = [
+            Series([1, 0, None], dtype='Int64', index=index),
+            Series([1.0, -0.0, np.nan], index=index),
+            Series([True, False, None], dtype=object, index=index),
+            Series([1, 0.0, None], dtype=object, index=index),
+        ]
+        for series in values:
+            result = hft.to_hashable_series(series)
+            self.assertEqual(result.dtype, np.float64)
+            self.assertEqual(result.index.tolist(), [0, 1, 2])
+            self.assertEqual(result.fillna(-1).tolist(), [1.0, 0.0, -1])
+            self.assertFalse(np.signbit(result.values[1]))
+
+        result = hft.to_hashable_series(Series(['a', None], index=[1, 0]))
+        self.assertEqual(result.tolist(), ['a', None])
+        self.assertEqual(result.index.tolist(), [0, 1])
+
+        result = hft.to_hashable_series(Series([[1], [2]]))
+        self.assertIsNone(result)
+
+    def test_get_multiset_hash(self):
+        data = DataFrame(dict(a=[1.0, 2.0, 2.0], b=['x', 'y', 'y']))
+        result = hft.get_multiset_hash(data)
+        self.assertIsInstance(result, int)
+
+        expected = hft.get_multiset_hash(data.iloc[[2, 0, 1]])
+        self.assertEqual(result, expected)
+
+        expected = hft.get_multiset_hash(data.iloc[[2, 0, 0]])
+        self.assertNotEqual(result, expected)
+
+        self.assertEqual(hft.get_multiset_hash(DataFrame()), 0)
+
+    def test_hash_series(self):
+        a = hft.hash_series(Series([1, 2, 1]))
+        b = hft.hash_series(Series([1.0, 2.0, 1.0], index=[2, 1, 0]))
+        self.assertEqual(a.dtype, np.uint64)
+        self.assertEqual(a.tolist(), b.tolist())
+        self.assertEqual(a[0], a[2])
+        self.assertNotEqual(a[0], a[1])
+
+        a = hft.hash_series(Series([[1], [2], [1]]))
+        self.assertEqual(a[0], a[2])
+        self.assertNotEqual(a[0], a[1])
+
+    def test_get_cell_hashes(self):
+        cells = np.array([[0, 0, 0], [1, 2, 3], [1, 2, 3], [-1, 0, 5]])
+        result = hft.get_cell_hashes(cells)
+        self.assertEqual(result.dtype, np.int64)
+        self.assertEqual(result[1], result[2])
+        self.assertEqual(len(set(result.tolist())), 3)
+        self.assertEqual(len(hft.WELD_OFFSETS), 14)
+
+    def test_get_weld_clusters(self):
+        points = np.array([
+            [0, 0, 0], [0, 0, 1e-7], [5, 5, 5], [0, 0, 0], [9, 9, 9],
+        ])
+        result = hft.get_weld_clusters(points, 1e-6)
+        self.assertEqual(result.tolist(), [0, 0, 2, 0, 4])
+
+        result = hft.get_weld_clusters(points, 0)
+        self.assertEqual(result.tolist(), [0, 1, 2, 0, 4])
+
+        # clusters are transitive across cells
+        points = np.array([[x * 0.8, 0, 0] for x in [3, 2, 1, 0, 9]])
+        result = hft.get_weld_clusters(points, 1)
+        self.assertEqual(result.tolist(), [0, 0, 0, 0, 4])
+
+        result = hft.get_weld_clusters(np.zeros((0, 3)), 1)
+        self.assertEqual(result.tolist(), [])
+
+    def test_mmap_array(self):
+        arrays = [
+            np.arange(5, dtype='uint16'),
+            pd.array([1, None, 3], dtype='Int8'),
+            np.array(['a', None, [1]], dtype=object),
+        ]
+        with TemporaryDirectory() as root:
+            for i, array in enumerate(arrays):
+                target = os.path.join(root, f'v_i_{i}')
+                schema = hft.write_mmap_array(array, target)
+                self.assertEqual(schema['name'], f'v_i_{i}')
+                result = hft.read_mmap_array(schema, root)
+                self.assertIsInstance(result, type(array))
+                self.assertEqual(result.dtype, array.dtype)
+                self.assertEqual(list(result), list(array))
+
+            schema = hft.write_mmap_array(arrays[1], target)
+            self.assertEqual(schema['kind'], 'IntegerArray')
+            result = hft.read_mmap_array(schema, root)
+            self.assertIsInstance(result._data, np.memmap)
+            temp = [x for x in os.listdir(root) if x.endswith('.temp')]
+            self.assertEqual(temp, [])
+
     def test_validate_file_extension(self):
         hft.validate_file_extension('foo.bar', 'bar')
         hft.validate_file_extension('foo.foo.bar', 'bar')
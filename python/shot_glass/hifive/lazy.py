@@ -0,0 +1,266 @@
+import re
+
+from pandas import DataFrame
+# ------------------------------------------------------------------------------
+
+'''
+The lazy module contains the LazyHiFive class, a query plan of HiFive
+operations, which is optimized before it is executed.
+'''
+
+
+class LazyHiFive():
+    '''
+    A plan of operations on a HiFive instance, created by HiFive.lazy.
+
+    Operations are recorded, rather than executed, until collect is called.
+    Collect then optimizes the plan and executes it on a new HiFive instance,
+    leaving the source instance untouched. For example:
+
+    ::
+
+        hi = hi.lazy() \\
+            .map('v_x', 'f_f_x_mean', 'mean') \\
+            .map('v_x', 'f_f_x_max', 'max') \\
+            .filter('f_f_x_max', lambda x: x > 0) \\
+            .select(['i_id', 'f_id', 'e_id', 'v_id', 'f_f_x_mean']) \\
+            .collect()
+
+    Optimizations:
+
+        * Maps whose target column is never used downstream are dropped.
+        * Columns which are never used downstream are never read from the \
+            source instance. Id columns are always kept.
+        * Consecutive maps are fused into a single map_many call, unless one \
+            depends upon the target of another.
+        * Columns carried over between operations are never revalidated, so \
+            each column is validated once. String and json columns are \
+            revalidated once more on collect, see HiFive.validate.
+    '''
+    def __init__(self, hifive):
+        '''
+        Args:
+            hifive (HiFive): Source HiFive instance.
+        '''
+        self._source = hifive
+        self._operations = []
+
+    def map(self, source, target, aggregator):
+        '''
+        Records a HiFive.map operation.
+
+        Args:
+            source (str): Source column from which data should be mapped.
+            target (str): Name of new column to be created.
+            aggregator (function or str): Aggregator, see HiFive.map.
+
+        Returns:
+            LazyHiFive: self.
+        '''
+        self._operations.append(('map', (target, source, aggregator)))
+        return self
+
+    def map_many(self, mapping):
+        '''
+        Records a HiFive.map_many operation, as one map per target.
+
+        Args:
+            mapping (dict): Dict of target columns and (source, aggregator) \
+                tuples.
+
+        Returns:
+            LazyHiFive: self.
+        '''
+        for target, (source, aggregator) in mapping.items():
+            self.map(source, target, aggregator)
+        return self
+
+    def expand(self, source, target, id_, expander):
+        '''
+        Records a HiFive.expand operation.
+
+        Args:
+            source (str): Source column to be expanded.
+            target (str): Name of new column to be created.
+            id_ (str): Name of id column to be created.
+            expander (function): Function which converts a row element in to a \
+                list of elements.
+
+        Returns:
+            LazyHiFive: self.
+        '''
+        self._operations.append(('expand', (source, target, id_, expander)))
+        return self
+
+    def select(self, columns):
+        '''
+        Records a selection of columns. Id columns are not kept implicitly.
+
+        Args:
+            columns (list): Columns to be kept, in order.
+
+        Returns:
+            LazyHiFive: self.
+        '''
+        self._operations.append(('select', list(columns)))
+        return self
+
+    def filter(self, column, predicate):
+        '''
+        Records a filtering of rows.
+
+        Args:
+            column (str): Column to be tested.
+            predicate (function): Function which receives column as a Series \
+                and returns a boolean Series or array of rows to be kept.
+
+        Returns:
+            LazyHiFive: self.
+        '''
+        self._operations.append(('filter', (column, predicate)))
+        return self
+
+    def explain(self):
+        '''
+        Describes the optimized plan.
+
+        Returns:
+            list: One string per step.
+        '''
+        columns, operations = self.__optimize()
+        output = []
+        if columns is None:
+            output.append('read all columns')
+        else:
+            output.append(f'read {columns}')
+
+        for name, args in operations:
+            if name == 'map_many':
+                args = {k: v[0] for k, v in args.items()}
+            elif name == 'expand':
+                args = args[:3]
+            elif name == 'filter':
+                args = args[0]
+            output.append(f'{name} {args}')
+        return output
+
+    def collect(self):
+        '''
+        Optimizes and executes the plan.
+
+        Raises:
+            ValidationError: If any operation is invalid, see HiFive.
+            TypeError: If any column values are invalid.
+
+        Returns:
+            HiFive: New HiFive instance.
+        '''
+        columns, operations = self.__optimize()
+        source = self._source
+        if columns is None:
+            columns = source._get_columns()
+        columns = [x for x in columns if x in source._get_columns()]
+
+        output = source.__class__(
+            compact=source._compact,
+            compact_coordinates=source._compact_coordinates,
+            normalized=source._normalized,
+        )
+        data = DataFrame(
+            {x: source._get_column(x) for x in columns},
+            columns=columns,
+            copy=False,
+        )
+        self.__set_data(output, data, source)
+
+        for name, args in operations:
+            if name == 'map_many':
+                output.map_many(args)
+            elif name == 'expand':
+                output.expand(*args)
+            elif name == 'filter':
+                column, predicate = args
+                mask = predicate(output._get_column(column))
+                data = output.data[getattr(mask, 'values', mask)]
+                self.__set_data(output, data, output)
+            elif name == 'select':
+                data = DataFrame(
+                    {x: output._get_column(x) for x in args},
+                    columns=args,
+                    copy=False,
+                )
+                self.__set_data(output, data, output)
+
+        return output.validate()
+
+    def __set_data(self, hifive, data, source):
+        '''
+        Assigns data to a given HiFive instance, keeping the columns which
+        are validated in a given source instance marked as validated.
+
+        Args:
+            hifive (HiFive): HiFive instance.
+            data (DataFrame): Data, derived from the source instance.
+            source (HiFive): HiFive instance data is derived from.
+        '''
+        validated = [
+            x for x in data.columns
+            if x in source._get_columns() and source._is_column_validated(x)
+        ]
+        hifive.data = data
+        hifive._mark_columns_validated(validated)
+
+    def __optimize(self):
+        '''
+        Prunes unused maps and columns and fuses consecutive maps.
+
+        Returns:
+            tuple: Source columns to be read (None for all) and list of \
+                optimized operations.
+        '''
+        # walk operations backwards, tracking the columns needed downstream
+        needed = None
+        operations = []
+        for name, args in reversed(self._operations):
+            if name == 'map':
+                target, source, _ = args
+                if needed is not None:
+                    if target not in needed:
+                        continue
+                    needed.discard(target)
+                    needed.add(source)
+            elif name == 'expand':
+                source, target, id_, _ = args
+                if needed is not None:
+                    needed.difference_update([target, id_])
+                    needed.add(source)
+            elif name == 'filter':
+                if needed is not None:
+                    needed.add(args[0])
+            elif name == 'select':
+                needed = set(args)
+            operations.insert(0, (name, args))
+
+        columns = None
+        if needed is not None:
+            columns = [
+                x for x in self._source._get_columns()
+                if x in needed or re.search('^[ifev]_id$', x)
+            ]
+
+        # fuse consecutive maps into map_many, unless a map depends on the
+        # target of another
+        output = []
+        for name, args in operations:
+            if name != 'map':
+                output.append((name, args))
+                continue
+
+            target, source, aggregator = args
+            if len(output) > 0 and output[-1][0] == 'map_many':
+                mapping = output[-1][1]
+                if source not in mapping and target not in mapping:
+                    mapping[target] = (source, aggregator)
+                    continue
+            output.append(('map_many', {target: (source, aggregator)}))
+        return columns, output
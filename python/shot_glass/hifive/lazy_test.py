@@ -0,0 +1,108 @@
+from pandas import Series
+import numpy as np
+import pytest
+
+from shot_glass.core.tools import ValidationError
+from shot_glass.hifive.hifive import HiFive
+from shot_glass.hifive.lazy import LazyHiFive
+from shot_glass.hifive.test_base import HiFiveTestBase
+# ------------------------------------------------------------------------------
+
+
+class LazyHiFiveTests(HiFiveTestBase):
+    def get_hifive(self):
+        hi = HiFive()
+        hi.data = self.get_multi_data().reset_index(drop=True)
+        hi.data['v_s_name'] = 'foo'
+        return hi.validate()
+
+    def test_lazy(self):
+        hi = self.get_hifive()
+        result = hi.lazy()
+        self.assertIsInstance(result, LazyHiFive)
+        self.assertIs(result._source, hi)
+
+    def test_collect(self):
+        hi = self.get_hifive()
+        data = hi.data.copy()
+        result = hi.lazy() \
+            .map('v_x', 'f_f_x_mean', 'mean') \
+            .map('v_y', 'f_f_y_max', 'max') \
+            .map('f_f_x_mean', 'i_f_x_max', 'max') \
+            .collect()
+
+        expected = hi.copy() \
+            .map('v_x', 'f_f_x_mean', 'mean') \
+            .map('v_y', 'f_f_y_max', 'max') \
+            .map('f_f_x_mean', 'i_f_x_max', 'max')
+        self.assertIsNot(result, hi)
+        self.assertTrue(result.data.equals(expected.data))
+        self.assertTrue(hi.data.equals(data))
+
+    def test_explain(self):
+        hi = self.get_hifive()
+        result = hi.lazy() \
+            .map('v_x', 'f_f_x_mean', 'mean') \
+            .map('v_y', 'f_f_y_max', 'max') \
+            .map('f_f_x_mean', 'i_f_x_max', 'max') \
+            .map('v_z', 'f_f_z_max', 'max') \
+            .select(['f_id', 'f_f_y_max', 'i_f_x_max']) \
+            .explain()
+        expected = [
+            "read ['i_id', 'f_id', 'e_id', 'v_id', 'v_x', 'v_y']",
+            "map_many {'f_f_x_mean': 'v_x', 'f_f_y_max': 'v_y'}",
+            "map_many {'i_f_x_max': 'f_f_x_mean'}",
+            "select ['f_id', 'f_f_y_max', 'i_f_x_max']",
+        ]
+        self.assertEqual(result, expected)
+
+        result = hi.lazy().map('v_x', 'f_f_x_mean', 'mean').explain()
+        expected = ['read all columns', "map_many {'f_f_x_mean': 'v_x'}"]
+        self.assertEqual(result, expected)
+
+    def test_filter_select(self):
+        hi = self.get_hifive()
+        result = hi.lazy() \
+            .filter('f_id', lambda x: x > 0) \
+            .map('v_x', 'f_f_x_mean', 'mean') \
+            .filter('f_f_x_mean', lambda x: x < 1.5) \
+            .select(['f_id', 'f_f_x_mean']) \
+            .collect()
+        self.assertEqual(result.data.columns.tolist(), ['f_id', 'f_f_x_mean'])
+        self.assertEqual(result.data.f_id.unique().tolist(), [2])
+        self.assertEqual(result.data.f_f_x_mean.unique().tolist(), [1.0])
+
+    def test_expand(self):
+        hi = self.get_hifive()
+        result = hi.lazy() \
+            .expand('v_s_name', 'v_s_char', 'v_i_char_id', list) \
+            .select(['v_id', 'v_s_char', 'v_i_char_id']) \
+            .collect()
+        self.assertEqual(len(result.data), 60)
+        self.assertEqual(result.data.v_s_char.head(3).tolist(), list('foo'))
+
+    def test_validation(self):
+        hi = self.get_hifive()
+        validated = dict(hi._validated)
+
+        calls = []
+        validate_column = HiFive.validate_column
+
+        def spy(self, column):
+            calls.append(column)
+            return validate_column(self, column)
+
+        HiFive.validate_column = spy
+        try:
+            hi.lazy() \
+                .map('v_x', 'f_f_x_mean', 'mean') \
+                .filter('f_id', lambda x: Series(x > 0)) \
+                .map('f_f_x_mean', 'i_f_x_max', 'max') \
+                .collect()
+        finally:
+            HiFive.validate_column = validate_column
+        self.assertEqual(calls, ['f_f_x_mean', 'i_f_x_max', 'v_s_name'])
+        self.assertEqual(hi._validated.keys(), validated.keys())
+
+        with pytest.raises(ValidationError):
+            hi.lazy().map('v_x', 'f_q_foo', np.max).collect()
@@ -70,6 +70,83 @@ def write_json(data='required', fullpath='required'):
     return data
 
 
+# ARROW-OPERATORS---------------------------------------------------------------
+@operator(
+    fullpath=[validators.has_parquet_extension, validators.file_exists])
+def read_parquet(fullpath='required', columns=None, use_threads=True):
+    '''
+    Read HiFive data from parquet filepath.
+
+    Args:
+        fullpath (str): Filepath of parquet data.
+        columns (list, optional): Columns to be read. Default: None (all).
+        use_threads (bool, optional): Decode columns in parallel. \
+            Default: True.
+
+    Returns:
+        HiFive: HiFive instance with parquet data in it.
+    '''
+    return HiFive().read_parquet(
+        fullpath, columns=columns, use_threads=use_threads
+    )
+
+
+@operator(
+    data=[validators.is_hifive_instance],
+    fullpath=[validators.has_parquet_extension])
+def write_parquet(data='required', fullpath='required', compression='snappy'):
+    '''
+    Write HiFive data to parquet filepath.
+
+    Args:
+        data (HiFive): HiFive instance to be written.
+        fullpath (str): Target filepath.
+        compression (str, optional): Compression codec. Default: snappy.
+
+    Returns:
+        HiFive: HiFive instance.
+    '''
+    return data.write_parquet(fullpath, compression=compression)
+
+
+@operator(
+    fullpath=[validators.has_feather_extension, validators.file_exists])
+def read_feather(fullpath='required', columns=None, use_threads=True):
+    '''
+    Read HiFive data from feather (Arrow IPC) filepath.
+
+    Args:
+        fullpath (str): Filepath of feather data.
+        columns (list, optional): Columns to be read. Default: None (all).
+        use_threads (bool, optional): Decode columns in parallel. \
+            Default: True.
+
+    Returns:
+        HiFive: HiFive instance with feather data in it.
+    '''
+    return HiFive().read_feather(
+        fullpath, columns=columns, use_threads=use_threads
+    )
+
+
+@operator(
+    data=[validators.is_hifive_instance],
+    fullpath=[validators.has_feather_extension])
+def write_feather(data='required', fullpath='required', compression='lz4'):
+    '''
+    Write HiFive data to feather (Arrow IPC) filepath.
+
+    Args:
+        data (HiFive): HiFive instance to be written.
+        fullpath (str): Target filepath.
+        compression (str, optional): Compression codec. Default: lz4.
+
+    Returns:
+        HiFive: HiFive instance.
+    '''
+    return data.write_feather(fullpath, compression=compression)
+
+
 # BLENDER-OPERATORS---------------------------------------------------------
 @operator(data=[validators.is_hifive_instance])
 def to_blender_scene(data='required'):
@@ -117,34 +194,13 @@ def to_plotly_figure(data='required'):
     blt.triangulate_all_objects()
     data = from_blender_scene(scene=scene)
 
-    hi = data.copy()
-    cols = ['v_x', 'v_y', 'v_z']
-    min_ = hi.data[cols].min().min()
-    max_ = hi.data[cols].max().max()
-
-    # create mesh3d
-    hi.data.sort_values(['f_id', 'v_i_draw_order'], inplace=True)
-    hi = hi.map(
-        'v_id',
-        'f_x_vals',
-        lambda x: lbt.get_ordered_unique(x.tolist())
-    )
-    data = hi.data.copy()
-
-    data['f_i_i'] = data.f_x_vals.apply(lambda x: x[0])
-    data['f_i_j'] = data.f_x_vals.apply(lambda x: x[1])
-    data['f_i_k'] = data.f_x_vals.apply(lambda x: x[2])
-
-    cols = ['v_x', 'v_y', 'v_z', 'f_i_i', 'f_i_j', 'f_i_k']
-    verts = data.groupby('v_id').first()
-    faces = data.groupby('f_id')[cols].first()
+    vertices, _, faces, _ = data.to_arrays()
+    min_ = vertices.min()
+    max_ = vertices.max()
 
-    x = verts.v_x.tolist()
-    y = verts.v_y.tolist()
-    z = verts.v_z.tolist()
-    i = faces.f_i_i.tolist()
-    j = faces.f_i_j.tolist()
-    k = faces.f_i_k.tolist()
+    # faces are all triangles, so their vertices can be reshaped into i, j, k
+    x, y, z = vertices.T.tolist()
+    i, j, k = faces.reshape(-1, 3).T.tolist()
 
     # create figure
     fig = plot.get_mesh_plot_figure(x, y, z, i, j, k, min_, max_, 1.2)
@@ -272,7 +328,6 @@ def write_obj(data='required', fullpath='required'):
 
     cols = ['v_x', 'v_y', 'v_z']
     data = hifive.data \
-        .copy() \
         .dropna(subset=['v_id'] + cols) \
         .sort_values('v_id')
 
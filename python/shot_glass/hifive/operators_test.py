@@ -44,6 +44,27 @@ class HiFiveOperatorsTests(unittest.TestCase):
 
             self.assertEqual(result, expected)
 
+    def test_write_parquet(self):
+        source = lbt.relative_path(__file__, '../../../resources/face.json')
+        data = operators.read_json(fullpath=source)
+        with TemporaryDirectory() as root:
+            target = os.path.join(root, 'foo.parquet')
+            operators.write_parquet(data=data, fullpath=target, validate='all')
+            result = operators.read_parquet(
+                fullpath=target, columns=['f_id', 'v_id'], validate='all'
+            )
+            self.assertEqual(result.data.columns.tolist(), ['f_id', 'v_id'])
+            self.assertTrue(result.data.equals(data.data[['f_id', 'v_id']]))
+
+    def test_write_feather(self):
+        source = lbt.relative_path(__file__, '../../../resources/face.json')
+        data = operators.read_json(fullpath=source)
+        with TemporaryDirectory() as root:
+            target = os.path.join(root, 'foo.feather')
+            operators.write_feather(data=data, fullpath=target, validate='all')
+            result = operators.read_feather(fullpath=target, validate='all')
+            self.assertTrue(result.data.equals(data.data))
+
     def test_read_obj(self):
         source = lbt.relative_path(__file__, '../../../resources/face.obj')
         result = operators.read_obj(fullpath=source, validate='all')
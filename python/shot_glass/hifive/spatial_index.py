@@ -0,0 +1,305 @@
+import numpy as np
+# ------------------------------------------------------------------------------
+
+'''
+The spatial index module contains the SpatialIndex class, which HiFive uses to
+answer box, radius and nearest neighbor queries over its vertices without
+scanning all of them.
+'''
+
+
+class SpatialIndex():
+    '''
+    A uniform grid index of 3D points.
+
+    Points are bucketed into cubic cells. Cells are keyed by their linear
+    position within the grid and points are sorted by key, so the points of a
+    cell are found by a binary search of the occupied keys.
+
+    Attributes:
+
+        * ids - Id of each point, in order of keys.
+        * points - (N, 3) array of points, in order of keys.
+        * origin - Minimum corner of grid.
+        * cell_size - Edge length of cells.
+        * shape - Number of cells along each axis.
+        * keys - Sorted unique keys of occupied cells.
+        * offsets - Start of each occupied cell's points.
+    '''
+    def __init__(self, ids, points, cell_size=None):
+        '''
+        Args:
+            ids (array-like): Id of each point.
+            points (array-like): (N, 3) array of points.
+            cell_size (float, optional): Edge length of cells. \
+                Default: None, which aims for about one point per cell.
+        '''
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        ids = np.asarray(ids)
+
+        self.origin = np.zeros(3)
+        extent = np.zeros(3)
+        if len(points) > 0:
+            self.origin = points.min(axis=0)
+            extent = points.max(axis=0) - self.origin
+
+        if cell_size is None:
+            cell_size = self.__get_cell_size(extent, len(points))
+        self.cell_size = float(cell_size)
+        self.shape = np.floor(extent / self.cell_size).astype(np.int64) + 1
+
+        keys = self.__get_keys(self.__get_cells(points))
+        order = np.argsort(keys, kind='stable')
+        self.ids = ids[order]
+        self.points = points[order]
+
+        keys, counts = np.unique(keys[order], return_counts=True)
+        self.keys = keys
+        self.offsets = np.zeros(keys.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+
+    @property
+    def size(self):
+        '''
+        Returns:
+            int: Number of points.
+        '''
+        return self.ids.size
+
+    def query_box(self, minimum, maximum):
+        '''
+        Finds the points within a given axis aligned box, boundary included.
+
+        Args:
+            minimum (array-like): Minimum x, y and z of box or (N, 3) array \
+                of minima of boxes.
+            maximum (array-like): Maximum x, y and z of box or (N, 3) array \
+                of maxima of boxes.
+
+        Returns:
+            numpy.ndarray or list: Sorted ids of points or a list of them \
+                per box, if arrays of boxes are given.
+        '''
+        single = np.ndim(minimum) == 1
+        minimum = np.asarray(minimum, dtype=np.float64).reshape(-1, 3)
+        maximum = np.asarray(maximum, dtype=np.float64).reshape(-1, 3)
+
+        queries, positions = self.__query_boxes(minimum, maximum)
+        points = self.points[positions]
+        mask = (points >= minimum[queries]) & (points <= maximum[queries])
+        mask = np.all(mask, axis=1)
+        output = self.__split(queries[mask], positions[mask], len(minimum))
+        return output[0] if single else output
+
+    def query_radius(self, point, radius):
+        '''
+        Finds the points within a given distance of a given point.
+
+        Args:
+            point (array-like): x, y and z of point or (N, 3) array of \
+                points.
+            radius (float or array-like): Distance or distance per point.
+
+        Returns:
+            numpy.ndarray or list: Sorted ids of points or a list of them \
+                per point, if an array of points is given.
+        '''
+        single = np.ndim(point) == 1
+        points = np.asarray(point, dtype=np.float64).reshape(-1, 3)
+        radii = np.asarray(radius, dtype=np.float64)
+        radii = np.broadcast_to(radii, len(points))
+
+        queries, positions, distances = self.__query_radius(points, radii)
+        mask = distances <= radii[queries]
+        output = self.__split(queries[mask], positions[mask], len(points))
+        return output[0] if single else output
+
+    def query_knn(self, point, k):
+        '''
+        Finds the k nearest points of a given point, by searching boxes of
+        growing size around it. Points whose k nearest points are not yet
+        found are searched again, all at once, with twice the radius.
+
+        Args:
+            point (array-like): x, y and z of point or (N, 3) array of \
+                points.
+            k (int): Number of points. At most all points are returned.
+
+        Returns:
+            tuple: Ids of points and their distances, in order of distance. \
+                Each is a (N, k) array, if an array of points is given.
+        '''
+        single = np.ndim(point) == 1
+        points = np.asarray(point, dtype=np.float64).reshape(-1, 3)
+        k = max(min(k, self.size), 0)
+
+        outside = np.maximum(self.origin - points, 0)
+        outside = np.maximum(outside, points - self.__get_maximum())
+        radii = np.linalg.norm(outside, axis=1) + self.cell_size
+
+        queries = [np.array([], dtype=np.int64)]
+        positions = [np.array([], dtype=np.int64)]
+        distances = [np.zeros(0)]
+        pending = np.arange(len(points)) if k > 0 else np.arange(0)
+        while pending.size > 0:
+            temp = self.__query_radius(points[pending], radii[pending])
+            found = temp[2] <= radii[pending][temp[0]]
+            found = np.bincount(temp[0][found], minlength=pending.size)
+            total = np.bincount(temp[0], minlength=pending.size)
+            done = (found >= k) | (total == self.size)
+
+            mask = done[temp[0]]
+            queries.append(pending[temp[0][mask]])
+            positions.append(temp[1][mask])
+            distances.append(temp[2][mask])
+            pending = pending[~done]
+            radii[pending] *= 2
+
+        queries = np.concatenate(queries)
+        positions = np.concatenate(positions)
+        distances = np.concatenate(distances)
+
+        # every query has at least k candidates, so the first k of each are
+        # its nearest points
+        order = np.lexsort((self.ids[positions], distances, queries))
+        counts = np.bincount(queries, minlength=len(points))
+        starts = np.cumsum(counts) - counts
+        ranks = np.arange(order.size) - starts[queries[order]]
+        order = order[ranks < k]
+
+        ids = self.ids[positions[order]].reshape(len(points), k)
+        distances = distances[order].reshape(len(points), k)
+        if single:
+            return ids[0], distances[0]
+        return ids, distances
+
+    def __query_radius(self, points, radii):
+        '''
+        Finds the candidate points of radius queries.
+
+        Args:
+            points (numpy.ndarray): (N, 3) array of points.
+            radii (numpy.ndarray): Distance per point.
+
+        Returns:
+            tuple: Query and position of each point within the box around \
+                the sphere of a query and its distance to the query point.
+        '''
+        radii = radii[:, None]
+        queries, positions = self.__query_boxes(points - radii, points + radii)
+        delta = self.points[positions] - points[queries]
+        return queries, positions, np.sqrt(np.einsum('ij,ij->i', delta, delta))
+
+    def __query_boxes(self, minimum, maximum):
+        '''
+        Finds the positions of the points in cells overlapping given boxes.
+        The cells of all boxes are enumerated and looked up at once.
+
+        Args:
+            minimum (numpy.ndarray): (N, 3) array of minima of boxes.
+            maximum (numpy.ndarray): (N, 3) array of maxima of boxes.
+
+        Returns:
+            tuple: Query and position of each point.
+        '''
+        if self.size == 0:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty
+
+        lower = np.maximum(self.__get_cells(minimum), 0)
+        upper = np.minimum(self.__get_cells(maximum), self.shape - 1)
+        sizes = np.maximum(upper - lower + 1, 0)
+        cells = np.prod(sizes, axis=1)
+
+        # large boxes are cheaper to test against every point
+        large = np.flatnonzero(cells >= self.keys.size)
+        queries = [np.repeat(large, self.size)]
+        positions = [np.tile(np.arange(self.size), large.size)]
+
+        small = np.flatnonzero((cells > 0) & (cells < self.keys.size))
+        counts = cells[small]
+        query = np.repeat(small, counts)
+        starts = np.cumsum(counts) - counts
+        local = np.arange(counts.sum()) - np.repeat(starts, counts)
+        local, x = np.divmod(local, sizes[query, 0])
+        z, y = np.divmod(local, sizes[query, 1])
+        keys = self.__get_keys(lower[query] + np.stack([x, y, z], axis=1))
+
+        codes = np.searchsorted(self.keys, keys)
+        found = codes < self.keys.size
+        found[found] = self.keys[codes[found]] == keys[found]
+        query = query[found]
+        codes = codes[found]
+
+        counts = self.offsets[codes + 1] - self.offsets[codes]
+        starts = self.offsets[codes] - np.cumsum(counts) + counts
+        queries.append(np.repeat(query, counts))
+        positions.append(np.repeat(starts, counts) + np.arange(counts.sum()))
+        return np.concatenate(queries), np.concatenate(positions)
+
+    def __split(self, queries, positions, count):
+        '''
+        Splits the positions of found points into sorted ids per query.
+
+        Args:
+            queries (numpy.ndarray): Query of each found point.
+            positions (numpy.ndarray): Position of each found point.
+            count (int): Number of queries.
+
+        Returns:
+            list: Sorted ids of points, per query.
+        '''
+        ids = self.ids[positions]
+        order = np.lexsort((ids, queries))
+        starts = np.cumsum(np.bincount(queries, minlength=count))[:-1]
+        return np.split(ids[order], starts)
+
+    def __get_cells(self, points):
+        '''
+        Args:
+            points (array-like): Points.
+
+        Returns:
+            numpy.ndarray: Integer cell coordinates of points.
+        '''
+        points = np.asarray(points, dtype=np.float64)
+        cells = np.floor((points - self.origin) / self.cell_size)
+        cells = np.clip(cells, -1, self.shape)
+        return cells.astype(np.int64)
+
+    def __get_keys(self, cells):
+        '''
+        Args:
+            cells (numpy.ndarray): (N, 3) array of cell coordinates.
+
+        Returns:
+            numpy.ndarray: Linear key of each cell.
+        '''
+        x, y, z = cells.T
+        return x + self.shape[0] * (y + self.shape[1] * z)
+
+    def __get_maximum(self):
+        '''
+        Returns:
+            numpy.ndarray: Maximum corner of grid.
+        '''
+        return self.origin + self.shape * self.cell_size
+
+    def __get_cell_size(self, extent, count):
+        '''
+        Computes a cell size which yields about one point per cell, if points
+        were spread evenly within their extent.
+
+        Args:
+            extent (numpy.ndarray): Size of bounding box along each axis.
+            count (int): Number of points.
+
+        Returns:
+            float: Cell size.
+        '''
+        count = max(count, 1)
+        nonzero = extent[extent > 0]
+        if nonzero.size == 0:
+            return 1.0
+        size = (np.prod(nonzero) / count) ** (1 / nonzero.size)
+        return max(float(size), float(nonzero.max()) / count)
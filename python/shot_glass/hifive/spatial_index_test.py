@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from shot_glass.hifive.spatial_index import SpatialIndex
+# ------------------------------------------------------------------------------
+
+
+class SpatialIndexTests(unittest.TestCase):
+    def setUp(self):
+        random = np.random.default_rng(42)
+        self.points = random.uniform(-10, 10, size=(500, 3))
+        self.ids = np.arange(500) * 2
+        self.index = SpatialIndex(self.ids, self.points)
+
+    def test_init(self):
+        index = self.index
+        self.assertEqual(index.size, 500)
+        self.assertEqual(sorted(index.ids.tolist()), self.ids.tolist())
+        self.assertEqual(index.offsets[-1], 500)
+        self.assertLessEqual(np.prod(index.shape), 1000)
+
+        for i, key in enumerate(index.keys):
+            points = index.points[index.offsets[i]:index.offsets[i + 1]]
+            cells = np.floor((points - index.origin) / index.cell_size)
+            x, y, z = cells.T
+            keys = x + index.shape[0] * (y + index.shape[1] * z)
+            self.assertTrue((keys == key).all())
+
+    def test_init_degenerate(self):
+        index = SpatialIndex([0, 1, 2], [[1, 1, 1]] * 3)
+        self.assertEqual(index.cell_size, 1.0)
+        self.assertEqual(index.query_radius([1, 1, 1], 0).tolist(), [0, 1, 2])
+
+        index = SpatialIndex([], np.zeros((0, 3)))
+        self.assertEqual(index.query_box([0, 0, 0], [1, 1, 1]).tolist(), [])
+        ids, distances = index.query_knn([0, 0, 0], 3)
+        self.assertEqual(ids.tolist(), [])
+
+    def test_query_box(self):
+        lower = np.array([-3, -2, -5])
+        upper = np.array([4, 1, 0])
+        result = self.index.query_box(lower, upper)
+        mask = np.all((self.points >= lower) & (self.points <= upper), axis=1)
+        self.assertEqual(result.tolist(), self.ids[mask].tolist())
+        self.assertGreater(result.size, 0)
+
+        result = self.index.query_box([20, 20, 20], [30, 30, 30])
+        self.assertEqual(result.tolist(), [])
+
+        result = self.index.query_box([-100] * 3, [100] * 3)
+        self.assertEqual(result.tolist(), self.ids.tolist())
+
+    def test_query_radius(self):
+        for point in [[0, 0, 0], [9, -9, 9], [30, 0, 0]]:
+            for radius in [0.5, 3, 25]:
+                result = self.index.query_radius(point, radius)
+                distances = np.linalg.norm(self.points - point, axis=1)
+                expected = self.ids[distances <= radius].tolist()
+                self.assertEqual(result.tolist(), expected)
+
+    def test_query_knn(self):
+        for point in [[0, 0, 0], [9, -9, 9], [50, 50, -50]]:
+            ids, distances = self.index.query_knn(point, 5)
+            expected = np.linalg.norm(self.points - point, axis=1)
+            order = np.argsort(expected)[:5]
+            self.assertEqual(ids.tolist(), self.ids[order].tolist())
+            self.assertTrue(np.allclose(distances, expected[order]))
+
+        ids, _ = self.index.query_knn([0, 0, 0], 1000)
+        self.assertEqual(ids.size, 500)
+
+    def test_query_batch(self):
+        random = np.random.default_rng(7)
+        points = random.uniform(-15, 15, size=(50, 3))
+        radii = random.uniform(0, 6, size=50)
+        delta = self.points[None, :, :] - points[:, None, :]
+        distances = np.linalg.norm(delta, axis=2)
+
+        result = self.index.query_radius(points, radii)
+        self.assertEqual(len(result), 50)
+        for i, ids in enumerate(result):
+            expected = self.ids[distances[i] <= radii[i]].tolist()
+            self.assertEqual(ids.tolist(), expected)
+
+        result = self.index.query_box(points - radii[:, None], points)
+        for i, ids in enumerate(result):
+            lower = points[i] - radii[i]
+            mask = (self.points >= lower) & (self.points <= points[i])
+            expected = self.ids[np.all(mask, axis=1)].tolist()
+            self.assertEqual(ids.tolist(), expected)
+
+        ids, result = self.index.query_knn(points, 4)
+        self.assertEqual(ids.shape, (50, 4))
+        order = np.argsort(distances, axis=1)[:, :4]
+        self.assertEqual(ids.tolist(), self.ids[order].tolist())
+        expected = np.take_along_axis(distances, order, axis=1)
+        self.assertTrue(np.allclose(result, expected))
+
+        ids, result = self.index.query_knn(points[:3], 0)
+        self.assertEqual(ids.shape, (3, 0))
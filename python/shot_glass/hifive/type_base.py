@@ -1,6 +1,8 @@
 from enum import Enum
+from functools import lru_cache
 
 from shot_glass.core.tools import ValidationError
+import shot_glass.hifive.hifive_tools as hft
 # ------------------------------------------------------------------------------
 
 
@@ -8,19 +10,26 @@ class HiFiveTypeBase(Enum):
     '''
     Enum base class for HiFive enums.
     '''
-    def __init__(self, fullname, indicator, type_, validator, order):
+    def __init__(
+        self, fullname, indicator, type_, validator, order,
+        series_validator=None
+    ):
         '''
         Args:
             fullname (str): Fullname of enum item.
             indicator (str): Single character indicating enum item.
             validator (function): Function used to validate values  \
                 with enum. **Must return boolean**.
+            series_validator (function, optional): Function used to validate \
+                a whole Series at once. **Must return (index, value) of first \
+                invalid element or None**. Default: None.
         '''
         self.fullname = fullname
         self.indicator = indicator
         self.type_ = type_
         self.validator = validator
         self.order = order
+        self.series_validator = series_validator
 
     def is_valid_value(self, value):
         '''
@@ -32,6 +41,22 @@ class HiFiveTypeBase(Enum):
         '''
         return self.validator(value)
 
+    def get_first_invalid_value(self, series):
+        '''
+        Finds the first non-null value of a given Series that is invalid.
+        Uses series_validator if one is given, otherwise falls back to calling
+        validator on each element.
+
+        Args:
+            series (Series): Series to be tested.
+
+        Returns:
+            tuple: (index, value) of first invalid element or None.
+        '''
+        if self.series_validator is not None:
+            return self.series_validator(series)
+        return hft.get_first_invalid_element(series, self.validator)
+
     @classmethod
     def is_valid_fullname(cls, fullname):
         '''
@@ -41,7 +66,7 @@ class HiFiveTypeBase(Enum):
         Returns:
             bool: Whether given fullname is valid.
         '''
-        return fullname in cls.get_fullnames()
+        return fullname in cls._get_lut('fullname')
 
     @classmethod
     def is_valid_indicator(cls, indicator):
@@ -52,7 +77,7 @@ class HiFiveTypeBase(Enum):
         Returns:
             bool: Whether given indicator is valid.
         '''
-        return indicator in cls.get_indicators()
+        return indicator in cls._get_lut('indicator')
 
     @classmethod
     def from_fullname(cls, fullname):
@@ -63,9 +88,9 @@ class HiFiveTypeBase(Enum):
         Returns:
             HiFiveTypeBase: Enum associated with given fullname.
         '''
-        for dt in cls.__members__.values():
-            if dt.fullname == fullname:
-                return dt
+        lut = cls._get_lut('fullname')
+        if fullname in lut:
+            return lut[fullname]
         msg = f'{fullname} is not a valid fullname.'
         raise ValidationError(msg)
 
@@ -78,12 +103,26 @@ class HiFiveTypeBase(Enum):
         Returns:
             HiFiveTypeBase: Enum  with given indicator.
         '''
-        for dt in cls.__members__.values():
-            if dt.indicator == indicator:
-                return dt
+        lut = cls._get_lut('indicator')
+        if indicator in lut:
+            return lut[indicator]
         msg = f'{indicator} is not a valid indicator.'
         raise ValidationError(msg)
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _get_lut(cls, attribute):
+        '''
+        Creates a lookup table of enum items, which is cached per enum class.
+
+        Args:
+            attribute (str): Attribute of enum items, such as indicator.
+
+        Returns:
+            dict: Attribute values and enum items.
+        '''
+        return {getattr(x, attribute): x for x in cls.__members__.values()}
+
     @classmethod
     def get_fullnames(cls):
         '''
@@ -1,5 +1,7 @@
 import unittest
 
+from pandas import Series
+
 from shot_glass.hifive.type_base import HiFiveTypeBase
 from shot_glass.core.tools import ValidationError
 # ------------------------------------------------------------------------------
@@ -22,6 +24,21 @@ class HiFiveTypeBaseTest(unittest.TestCase):
         result = self.test_class.BAR.is_valid_value('foo')
         self.assertFalse(result)
 
+    def test_get_first_invalid_value(self):
+        series = Series(['foo', None, 'bar', 'foo'])
+        result = self.test_class.FOO.get_first_invalid_value(series)
+        self.assertEqual(result, (2, 'bar'))
+
+        series = Series(['foo', None])
+        result = self.test_class.FOO.get_first_invalid_value(series)
+        self.assertIsNone(result)
+
+        class TestType(HiFiveTypeBase):
+            FOO = ('foo', 'f', str, self.func_a, 0, lambda x: (0, 'taco'))
+
+        result = TestType.FOO.get_first_invalid_value(series)
+        self.assertEqual(result, (0, 'taco'))
+
     def test_is_valid_fullname(self):
         result = self.test_class.is_valid_fullname('foo')
         self.assertTrue(result)
@@ -58,6 +58,34 @@ def has_json_extension(fullpath):
         raise ValidationError(msg)
 
 
+def has_parquet_extension(fullpath):
+    '''
+    Args:
+        fullpath (str): Full path to file.
+
+    Raises:
+        ValidationError: If given filepath does not have a parquet extension.
+    '''
+    _, ext = os.path.splitext(fullpath)
+    if ext[1:] != 'parquet':
+        msg = f'{fullpath} does not have a parquet extension.'
+        raise ValidationError(msg)
+
+
+def has_feather_extension(fullpath):
+    '''
+    Args:
+        fullpath (str): Full path to file.
+
+    Raises:
+        ValidationError: If given filepath does not have a feather extension.
+    '''
+    _, ext = os.path.splitext(fullpath)
+    if ext[1:] != 'feather':
+        msg = f'{fullpath} does not have a feather extension.'
+        raise ValidationError(msg)
+
+
 def is_hifive_instance(item):
     '''
     Args:
@@ -182,7 +210,7 @@ def __has_valid_columns(data, columns, type_str, descriptor):
     Args:
         data (DataFrame): DataFrame.
         columns (list): Columns to be tested.
-        type_str (str): String indicating type ('i', 'f').
+        type_str (str): String of legal dtype kinds ('iu', 'f').
         descriptor (str): English plural of type for error message \
             ('integers','strings').
 
@@ -191,7 +219,7 @@ def __has_valid_columns(data, columns, type_str, descriptor):
             indicated by the given type_str.
     '''
     bad_cols = [(col, data[col].dtype.kind) for col in columns]
-    bad_cols = list(filter(lambda x: x[1] != type_str, bad_cols))
+    bad_cols = list(filter(lambda x: x[1] not in type_str, bad_cols))
     if len(bad_cols) != 0:
         bad_cols = sorted(bad_cols)
         types = [x[1] for x in bad_cols]
@@ -212,7 +240,7 @@ def mesh_dataframe_columns_are_valid(data):
             non-ints or non-floats in them respectively.
     '''
     cols = ['v_id', 'e_id', 'f_id', 'v_i_draw_order', 'i_id']
-    __has_valid_columns(data, cols, 'i', 'integers')
+    __has_valid_columns(data, cols, 'iu', 'integers')
 
     cols = ['v_x', 'v_y', 'v_z']
     __has_valid_columns(data, cols, 'f', 'floats')
@@ -44,6 +44,24 @@ class HiFiveValidatorsTests(HiFiveTestBase):
         expected = '/foo/bar.txt does not have a json extension.'
         self.assertEqual(result, expected)
 
+    def test_has_parquet_extension(self):
+        validators.has_parquet_extension('/foo/bar.parquet')
+
+        with pytest.raises(ValidationError) as e:
+            validators.has_parquet_extension('/foo/bar.txt')
+        result = str(e.value)
+        expected = '/foo/bar.txt does not have a parquet extension.'
+        self.assertEqual(result, expected)
+
+    def test_has_feather_extension(self):
+        validators.has_feather_extension('/foo/bar.feather')
+
+        with pytest.raises(ValidationError) as e:
+            validators.has_feather_extension('/foo/bar.txt')
+        result = str(e.value)
+        expected = '/foo/bar.txt does not have a feather extension.'
+        self.assertEqual(result, expected)
+
     def test_is_hifive_instance(self):
         hi = HiFive()
         validators.is_hifive_instance(hi)
@@ -200,6 +218,10 @@ class HiFiveValidatorsTests(HiFiveTestBase):
 
         validators.mesh_dataframe_columns_are_valid(data)
 
+        data['v_id'] = data.v_id.astype('uint8')
+        data['f_id'] = data.f_id.astype('UInt16')
+        validators.mesh_dataframe_columns_are_valid(data)
+
         data['v_z'] = [1, 2, 3]
         with pytest.raises(ValidationError) as e:
             validators.mesh_dataframe_columns_are_valid(data)